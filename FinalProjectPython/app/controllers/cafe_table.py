@@ -1,9 +1,12 @@
-from fastapi import APIRouter
-from typing import List
+from fastapi import APIRouter, Query
+from typing import List, Optional
 from pydantic import PositiveInt
 
-from app.core.cafe_table import CafeTableCoreDep  # залежність сервісу столів
-from app.schemas.cafe_table import CafeTableCreate, CafeTableUpdate, CafeTableResponse
+from app.core.cafe_table import CafeTableCoreDep, AsyncCafeTableCoreDep  # залежність сервісу столів
+from app.core.http_cache import conditional, async_conditional
+from app.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.schemas.cafe_table import CafeTableCreate, CafeTableUpdate, CafeTableResponse, TableFloorStatus
+from app.schemas.page import Page
 
 router = APIRouter(
     prefix="/tables",
@@ -11,9 +14,19 @@ router = APIRouter(
 )
 
 
-@router.get("/", response_model=List[CafeTableResponse])
-def get_all(service: CafeTableCoreDep):
-    return service.get_all()
+@router.get("/", response_model=Page[CafeTableResponse], dependencies=[conditional("tables")])
+def get_all(
+    service: CafeTableCoreDep,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    location: Optional[str] = None,
+):
+    return service.get_all(limit, cursor, location=location)
+
+
+@router.get("/floor/", response_model=List[TableFloorStatus])
+def get_floor(service: CafeTableCoreDep):
+    return service.get_floor()
 
 
 @router.get("/{table_id}", response_model=CafeTableResponse)
@@ -46,3 +59,56 @@ def update(table_id: PositiveInt, data: CafeTableUpdate, service: CafeTableCoreD
 @router.delete("/{table_id}")
 def delete(table_id: PositiveInt, service: CafeTableCoreDep):
     return service.delete(table_id)
+
+
+async_router = APIRouter(
+    prefix="/tables",
+    tags=["Cafe Tables"]
+)
+
+
+@async_router.get("/", response_model=Page[CafeTableResponse], dependencies=[async_conditional("tables")])
+async def get_all(
+    service: AsyncCafeTableCoreDep,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    location: Optional[str] = None,
+):
+    return await service.get_all(limit, cursor, location=location)
+
+
+@async_router.get("/floor/", response_model=List[TableFloorStatus])
+async def get_floor(service: AsyncCafeTableCoreDep):
+    return await service.get_floor()
+
+
+@async_router.get("/{table_id}", response_model=CafeTableResponse)
+async def get_by_id(table_id: PositiveInt, service: AsyncCafeTableCoreDep):
+    return await service.get_by_id(table_id)
+
+
+@async_router.get("/number/{number}", response_model=CafeTableResponse)
+async def get_by_number(number: PositiveInt, service: AsyncCafeTableCoreDep):
+    return await service.get_by_number(number)
+
+@async_router.get("/occupacy/{occuppied}", response_model=List[CafeTableResponse])
+async def get_tables_by_occupacy(occuppied: bool, service: AsyncCafeTableCoreDep):
+    return await service.get_tables_by_occupacy(occuppied)
+
+@async_router.get("/is_occupied/{table_id}", response_model=bool)
+async def is_occupied(table_id: PositiveInt, service: AsyncCafeTableCoreDep):
+    return await service.is_table_occupied(table_id)
+
+@async_router.post("/", response_model=CafeTableResponse)
+async def create(data: CafeTableCreate, service: AsyncCafeTableCoreDep):
+    return await service.create(data)
+
+
+@async_router.put("/{table_id}", response_model=CafeTableResponse)
+async def update(table_id: PositiveInt, data: CafeTableUpdate, service: AsyncCafeTableCoreDep):
+    return await service.update(table_id, data)
+
+
+@async_router.delete("/{table_id}")
+async def delete(table_id: PositiveInt, service: AsyncCafeTableCoreDep):
+    return await service.delete(table_id)
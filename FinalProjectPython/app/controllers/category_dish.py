@@ -2,7 +2,7 @@ from fastapi import APIRouter
 from typing import List
 from pydantic import PositiveInt
 
-from app.core.category_dish import CategoryCoreDep  # твоя залежність сервісу категорій
+from app.core.category_dish import CategoryCoreDep, AsyncCategoryCoreDep  # твоя залежність сервісу категорій
 from app.schemas.category_dish import CategoryCreate, CategoryUpdate, CategoryResponse
 
 router = APIRouter(
@@ -37,3 +37,37 @@ def update(category_id: PositiveInt, data: CategoryUpdate, service: CategoryCore
 @router.delete("/{category_id}")
 def delete(category_id: PositiveInt, service: CategoryCoreDep):
     return service.delete(category_id)
+
+
+async_router = APIRouter(
+    prefix="/categories",
+    tags=["Categories"]
+)
+
+
+@async_router.get("/", response_model=List[CategoryResponse])
+async def get_all(service: AsyncCategoryCoreDep):
+    return await service.get_all()
+
+
+@async_router.get("/{category_id}", response_model=CategoryResponse)
+async def get_by_id(category_id: PositiveInt, service: AsyncCategoryCoreDep):
+    return await service.get_by_id(category_id)
+
+@async_router.get("/name/{category_name}", response_model=CategoryResponse)
+async def get_by_name(category_name: str, service: AsyncCategoryCoreDep):
+    return await service.get_by_name(category_name)
+
+@async_router.post("/", response_model=CategoryResponse)
+async def create(data: CategoryCreate, service: AsyncCategoryCoreDep):
+    return await service.create(data)
+
+
+@async_router.put("/{category_id}", response_model=CategoryResponse)
+async def update(category_id: PositiveInt, data: CategoryUpdate, service: AsyncCategoryCoreDep):
+    return await service.update(category_id, data)
+
+
+@async_router.delete("/{category_id}")
+async def delete(category_id: PositiveInt, service: AsyncCategoryCoreDep):
+    return await service.delete(category_id)
@@ -1,9 +1,12 @@
-from fastapi import APIRouter
-from typing import List
+from fastapi import APIRouter, Query
+from typing import List, Optional
 from pydantic import PositiveInt
 
-from app.core.dish import DishCoreDep  # залежність сервісу страв
+from app.core.dish import DishCoreDep, AsyncDishCoreDep  # залежність сервісу страв
+from app.core.http_cache import conditional, async_conditional
+from app.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 from app.schemas.dish import DishCreate, DishUpdate, DishResponse
+from app.schemas.page import Page
 
 router = APIRouter(
     prefix="/dishes",
@@ -11,9 +14,14 @@ router = APIRouter(
 )
 
 
-@router.get("/", response_model=List[DishResponse])
-def get_all(service: DishCoreDep):
-    return service.get_all()
+@router.get("/", response_model=Page[DishResponse], dependencies=[conditional("dishes")])
+def get_all(
+    service: DishCoreDep,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    category_id: Optional[PositiveInt] = None,
+):
+    return service.get_all(limit, cursor, category_id=category_id)
 
 
 @router.get("/{dish_id}", response_model=DishResponse)
@@ -24,7 +32,11 @@ def get_by_id(dish_id: PositiveInt, service: DishCoreDep):
 def get_by_name(dish_name: str, service: DishCoreDep):
     return service.get_by_name(dish_name)
 
-@router.get("/category/{category_id}", response_model=List[DishResponse])
+@router.get(
+    "/category/{category_id}",
+    response_model=List[DishResponse],
+    dependencies=[conditional("dishes", "categories")],
+)
 def get_by_category_id(category_id: PositiveInt, service: DishCoreDep):
     return service.get_dishes_by_category_id(category_id)
 
@@ -52,3 +64,61 @@ def update(dish_id: PositiveInt, data: DishUpdate, service: DishCoreDep):
 @router.delete("/{dish_id}")
 def delete(dish_id: PositiveInt, service: DishCoreDep):
     return service.delete(dish_id)
+
+
+async_router = APIRouter(
+    prefix="/dishes",
+    tags=["Dishes"]
+)
+
+
+@async_router.get("/", response_model=Page[DishResponse], dependencies=[async_conditional("dishes")])
+async def get_all(
+    service: AsyncDishCoreDep,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    category_id: Optional[PositiveInt] = None,
+):
+    return await service.get_all(limit, cursor, category_id=category_id)
+
+
+@async_router.get("/{dish_id}", response_model=DishResponse)
+async def get_by_id(dish_id: PositiveInt, service: AsyncDishCoreDep):
+    return await service.get_by_id(dish_id)
+
+@async_router.get("/name/{dish_name}", response_model=DishResponse)
+async def get_by_name(dish_name: str, service: AsyncDishCoreDep):
+    return await service.get_by_name(dish_name)
+
+@async_router.get(
+    "/category/{category_id}",
+    response_model=List[DishResponse],
+    dependencies=[async_conditional("dishes", "categories")],
+)
+async def get_by_category_id(category_id: PositiveInt, service: AsyncDishCoreDep):
+    return await service.get_dishes_by_category_id(category_id)
+
+@async_router.get("/on_promotion/", response_model=List[DishResponse])
+async def get_dishes_on_promotion(service: AsyncDishCoreDep):
+    return await service.get_dishes_on_promotion()
+
+@async_router.get("/most_popular/", response_model=DishResponse)
+async def get_most_popular_dish(service: AsyncDishCoreDep):
+    return await service.get_most_popular_dish()
+
+@async_router.get("/sort/{ascending}", response_model=List[DishResponse])
+async def sort_dishes_by_price(ascending: bool, service: AsyncDishCoreDep):
+    return await service.sort_dishes_by_price(ascending)
+@async_router.post("/", response_model=DishResponse)
+async def create(data: DishCreate, service: AsyncDishCoreDep):
+    return await service.create(data)
+
+
+@async_router.put("/{dish_id}", response_model=DishResponse)
+async def update(dish_id: PositiveInt, data: DishUpdate, service: AsyncDishCoreDep):
+    return await service.update(dish_id, data)
+
+
+@async_router.delete("/{dish_id}")
+async def delete(dish_id: PositiveInt, service: AsyncDishCoreDep):
+    return await service.delete(dish_id)
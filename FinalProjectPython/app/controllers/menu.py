@@ -0,0 +1,26 @@
+from fastapi import APIRouter, Response
+
+from app.core.menu import MenuCoreDep, AsyncMenuCoreDep
+from app.schemas.menu import MenuResponse
+
+router = APIRouter(
+    prefix="/menu",
+    tags=["Menu"]
+)
+
+
+# документ уже серіалізовано один раз на версію меню: Response віддає байти без валідації через response_model
+@router.get("/", response_model=MenuResponse)
+def get_menu(service: MenuCoreDep):
+    return Response(service.get_menu(), media_type="application/json")
+
+
+async_router = APIRouter(
+    prefix="/menu",
+    tags=["Menu"]
+)
+
+
+@async_router.get("/", response_model=MenuResponse)
+async def get_menu(service: AsyncMenuCoreDep):
+    return Response(await service.get_menu(), media_type="application/json")
@@ -1,11 +1,20 @@
-from datetime import date
+from datetime import date, datetime
 
-from fastapi import APIRouter, Query
-from typing import List
+from fastapi import APIRouter, Header, Query
+from fastapi.responses import StreamingResponse
+from typing import List, Optional
 from pydantic import PositiveInt
+from starlette.concurrency import run_in_threadpool
 
-from app.core.order import OrderCoreDep
-from app.schemas.order import OrderCreate, OrderUpdate, OrderResponse
+from app.core.idempotency import IdempotencyDep, AsyncIdempotencyDep
+from app.core.order import OrderCoreDep, AsyncOrderCoreDep, ExportFormat, SummaryBucket
+from app.core.order_events import order_event_hub, SSE_HEADERS
+from app.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.schemas.order import (
+    OrderCreate, OrderUpdate, OrderResponse, OrderPeriodSummary, OrderTotal, OrderTotalsCheck, PrepBoardDish,
+    OrderBulkCreate, OrderBulkResponse,
+)
+from app.schemas.page import Page
 
 router = APIRouter(
     prefix="/orders",
@@ -24,9 +33,58 @@ def get_orders_by_period(
         example="2025-06-08"
     )):
     return service.get_orders_by_period(start_date, end_date)
-@router.get("/", response_model=List[OrderResponse])
-def get_all(service: OrderCoreDep):
-    return service.get_all()
+
+@router.get("/by-period/summary", response_model=OrderPeriodSummary)
+def get_orders_summary_by_period(
+    service: OrderCoreDep,
+    start_date: date = Query(
+        description="Start date YYYY-MM-DD",
+        example="2025-06-01"
+    ),
+    end_date: date = Query(
+        description="End date YYYY-MM-DD",
+        example="2025-06-08"
+    ),
+    bucket: Optional[SummaryBucket] = Query(None, description="Group totals by day or hour")):
+    return service.get_orders_summary_by_period(start_date, end_date, bucket)
+
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+@router.get("/by-period/export", response_class=StreamingResponse)
+def export_orders_by_period(
+    service: OrderCoreDep,
+    start_date: date = Query(
+        description="Start date YYYY-MM-DD",
+        example="2025-06-01"
+    ),
+    end_date: date = Query(
+        description="End date YYYY-MM-DD",
+        example="2025-06-08"
+    ),
+    export_format: ExportFormat = Query("ndjson", alias="format")):
+    return StreamingResponse(
+        service.export_orders_by_period(start_date, end_date, export_format),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="orders_{start_date}_{end_date}.{export_format}"'},
+    )
+@router.get("/", response_model=Page[OrderResponse])
+def get_all(
+    service: OrderCoreDep,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    table_id: Optional[PositiveInt] = None,
+    is_completed: Optional[bool] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+):
+    return service.get_all(
+        limit,
+        cursor,
+        table_id=table_id,
+        is_completed=is_completed,
+        created_from=created_from,
+        created_to=created_to,
+    )
 
 
 @router.get("/{order_id}", response_model=OrderResponse)
@@ -37,10 +95,45 @@ def get_by_id(order_id: PositiveInt, service: OrderCoreDep):
 def get_active_orders(service: OrderCoreDep):
     return service.get_active_orders()
 
+@router.get("/prep-board/", response_model=List[PrepBoardDish])
+def get_prep_board(service: OrderCoreDep):
+    return service.get_prep_board()
+
+# SSE: спершу snapshot (активні замовлення), далі події; EventSource сам надсилає Last-Event-ID при перепідключенні
+@router.get("/events/", response_class=StreamingResponse)
+async def order_events(
+    service: OrderCoreDep,
+    cursor: Optional[str] = Query(None, description="id of the last received event"),
+    last_event_id: Optional[str] = Header(None)):
+    # async def: підписка живе в event loop; синхронний знімок читається в threadpool
+    stream = await order_event_hub.open_stream(
+        last_event_id or cursor,
+        lambda: run_in_threadpool(service.get_active_snapshot),
+    )
+    return StreamingResponse(stream, media_type="text/event-stream", headers=SSE_HEADERS)
+
+
+@router.get("/totals/", response_model=List[OrderTotal])
+def get_totals(
+    service: OrderCoreDep,
+    order_ids: Optional[List[PositiveInt]] = Query(None, description="Orders to price; all active orders if omitted")):
+    return service.get_totals(order_ids)
+
+
+@router.post("/totals/check", response_model=OrderTotalsCheck)
+def check_totals(service: OrderCoreDep, repair: bool = False):
+    return service.check_totals(repair)
+
 
 @router.post("/", response_model=OrderResponse)
-def create(data: OrderCreate, service: OrderCoreDep):
-    return service.create(data)
+def create(data: OrderCreate, service: OrderCoreDep, idempotency: IdempotencyDep):
+    return idempotency.run(data, OrderResponse, lambda: service.create(data))
+
+
+# пачка офлайн-замовлень однією транзакцією; статус кожного - у results, за індексом у запиті
+@router.post("/bulk", response_model=OrderBulkResponse)
+def create_bulk(data: OrderBulkCreate, service: OrderCoreDep, idempotency: IdempotencyDep):
+    return idempotency.run(data, OrderBulkResponse, lambda: service.create_bulk(data))
 
 
 @router.put("/{order_id}", response_model=OrderResponse)
@@ -59,3 +152,115 @@ def delete(order_id: PositiveInt, service: OrderCoreDep):
 @router.get("/{order_id}/total")
 def calculate_total(order_id: PositiveInt, service: OrderCoreDep):
     return {"total": service.calculate_total(order_id)}
+
+
+async_router = APIRouter(
+    prefix="/orders",
+    tags=["Orders"]
+)
+
+@async_router.get("/by-period", response_model=List[OrderResponse])
+async def get_orders_by_period(
+    service: AsyncOrderCoreDep,
+    start_date: date = Query(
+        description="Start date YYYY-MM-DD",
+        example="2025-06-01"
+    ),
+    end_date: date = Query(
+        description="End date YYYY-MM-DD",
+        example="2025-06-08"
+    )):
+    return await service.get_orders_by_period(start_date, end_date)
+
+@async_router.get("/by-period/summary", response_model=OrderPeriodSummary)
+async def get_orders_summary_by_period(
+    service: AsyncOrderCoreDep,
+    start_date: date = Query(
+        description="Start date YYYY-MM-DD",
+        example="2025-06-01"
+    ),
+    end_date: date = Query(
+        description="End date YYYY-MM-DD",
+        example="2025-06-08"
+    ),
+    bucket: Optional[SummaryBucket] = Query(None, description="Group totals by day or hour")):
+    return await service.get_orders_summary_by_period(start_date, end_date, bucket)
+@async_router.get("/", response_model=Page[OrderResponse])
+async def get_all(
+    service: AsyncOrderCoreDep,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    table_id: Optional[PositiveInt] = None,
+    is_completed: Optional[bool] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+):
+    return await service.get_all(
+        limit,
+        cursor,
+        table_id=table_id,
+        is_completed=is_completed,
+        created_from=created_from,
+        created_to=created_to,
+    )
+
+
+@async_router.get("/{order_id}", response_model=OrderResponse)
+async def get_by_id(order_id: PositiveInt, service: AsyncOrderCoreDep):
+    return await service.get_by_id(order_id)
+
+@async_router.get("/active/", response_model=List[OrderResponse])
+async def get_active_orders(service: AsyncOrderCoreDep):
+    return await service.get_active_orders()
+
+@async_router.get("/prep-board/", response_model=List[PrepBoardDish])
+async def get_prep_board(service: AsyncOrderCoreDep):
+    return await service.get_prep_board()
+
+@async_router.get("/events/", response_class=StreamingResponse)
+async def order_events(
+    service: AsyncOrderCoreDep,
+    cursor: Optional[str] = Query(None, description="id of the last received event"),
+    last_event_id: Optional[str] = Header(None)):
+    stream = await order_event_hub.open_stream(last_event_id or cursor, service.get_active_snapshot)
+    return StreamingResponse(stream, media_type="text/event-stream", headers=SSE_HEADERS)
+
+
+@async_router.get("/totals/", response_model=List[OrderTotal])
+async def get_totals(
+    service: AsyncOrderCoreDep,
+    order_ids: Optional[List[PositiveInt]] = Query(None, description="Orders to price; all active orders if omitted")):
+    return await service.get_totals(order_ids)
+
+
+@async_router.post("/totals/check", response_model=OrderTotalsCheck)
+async def check_totals(service: AsyncOrderCoreDep, repair: bool = False):
+    return await service.check_totals(repair)
+
+
+@async_router.post("/", response_model=OrderResponse)
+async def create(data: OrderCreate, service: AsyncOrderCoreDep, idempotency: AsyncIdempotencyDep):
+    return await idempotency.run(data, OrderResponse, lambda: service.create(data))
+
+
+@async_router.post("/bulk", response_model=OrderBulkResponse)
+async def create_bulk(data: OrderBulkCreate, service: AsyncOrderCoreDep, idempotency: AsyncIdempotencyDep):
+    return await idempotency.run(data, OrderBulkResponse, lambda: service.create_bulk(data))
+
+
+@async_router.put("/{order_id}", response_model=OrderResponse)
+async def update(order_id: PositiveInt, data: OrderUpdate, service: AsyncOrderCoreDep):
+    return await service.update(order_id, data)
+
+@async_router.put("/{order_id}/complete", response_model=OrderResponse)
+async def complete(order_id: PositiveInt, service: AsyncOrderCoreDep):
+    return await service.complete_order(order_id)
+
+@async_router.delete("/{order_id}")
+async def delete(order_id: PositiveInt, service: AsyncOrderCoreDep):
+    return await service.delete(order_id)
+
+
+@async_router.get("/{order_id}/total")
+async def calculate_total(order_id: PositiveInt, service: AsyncOrderCoreDep):
+    return {"total": await service.calculate_total(order_id)}
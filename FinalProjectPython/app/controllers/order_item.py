@@ -1,9 +1,12 @@
-from fastapi import APIRouter
-from typing import List
+from fastapi import APIRouter, Query
+from typing import List, Optional
 from pydantic import PositiveInt
 
-from app.core.order_item import OrderItemCoreDep
+from app.core.idempotency import IdempotencyDep, AsyncIdempotencyDep
+from app.core.order_item import OrderItemCoreDep, AsyncOrderItemCoreDep
+from app.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 from app.schemas.order_item import OrderItemCreate, OrderItemUpdate, OrderItemResponse
+from app.schemas.page import Page
 
 router = APIRouter(
     prefix="/order-items",
@@ -11,9 +14,15 @@ router = APIRouter(
 )
 
 
-@router.get("/", response_model=List[OrderItemResponse])
-def get_all(service: OrderItemCoreDep):
-    return service.get_all()
+@router.get("/", response_model=Page[OrderItemResponse])
+def get_all(
+    service: OrderItemCoreDep,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    order_id: Optional[PositiveInt] = None,
+    dish_id: Optional[PositiveInt] = None,
+):
+    return service.get_all(limit, cursor, order_id=order_id, dish_id=dish_id)
 
 
 @router.get("/{order_item_id}", response_model=OrderItemResponse)
@@ -25,8 +34,8 @@ def get_by_order_id(order_id: PositiveInt, service: OrderItemCoreDep):
     return service.get_by_order_id(order_id)
 
 @router.post("/", response_model=OrderItemResponse)
-def create(data: OrderItemCreate, service: OrderItemCoreDep):
-    return service.create(data)
+def create(data: OrderItemCreate, service: OrderItemCoreDep, idempotency: IdempotencyDep):
+    return idempotency.run(data, OrderItemResponse, lambda: service.create(data))
 
 
 @router.put("/{order_item_id}", response_model=OrderItemResponse)
@@ -37,3 +46,43 @@ def update(order_item_id: PositiveInt, data: OrderItemUpdate, service: OrderItem
 @router.delete("/{order_item_id}")
 def delete(order_item_id: PositiveInt, service: OrderItemCoreDep):
     return service.delete(order_item_id)
+
+
+async_router = APIRouter(
+    prefix="/order-items",
+    tags=["Order Items"]
+)
+
+
+@async_router.get("/", response_model=Page[OrderItemResponse])
+async def get_all(
+    service: AsyncOrderItemCoreDep,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    order_id: Optional[PositiveInt] = None,
+    dish_id: Optional[PositiveInt] = None,
+):
+    return await service.get_all(limit, cursor, order_id=order_id, dish_id=dish_id)
+
+
+@async_router.get("/{order_item_id}", response_model=OrderItemResponse)
+async def get_by_id(order_item_id: PositiveInt, service: AsyncOrderItemCoreDep):
+    return await service.get_by_id(order_item_id)
+
+@async_router.get("/get_by_order_id/{order_id}", response_model=List[OrderItemResponse])
+async def get_by_order_id(order_id: PositiveInt, service: AsyncOrderItemCoreDep):
+    return await service.get_by_order_id(order_id)
+
+@async_router.post("/", response_model=OrderItemResponse)
+async def create(data: OrderItemCreate, service: AsyncOrderItemCoreDep, idempotency: AsyncIdempotencyDep):
+    return await idempotency.run(data, OrderItemResponse, lambda: service.create(data))
+
+
+@async_router.put("/{order_item_id}", response_model=OrderItemResponse)
+async def update(order_item_id: PositiveInt, data: OrderItemUpdate, service: AsyncOrderItemCoreDep):
+    return await service.update(order_item_id, data)
+
+
+@async_router.delete("/{order_item_id}")
+async def delete(order_item_id: PositiveInt, service: AsyncOrderItemCoreDep):
+    return await service.delete(order_item_id)
@@ -1,9 +1,12 @@
-from fastapi import APIRouter
-from typing import List
+from fastapi import APIRouter, Query
+from typing import List, Optional
 from pydantic import PositiveInt
 
-from app.core.promotion import PromotionCoreDep
+from app.core.promotion import PromotionCoreDep, AsyncPromotionCoreDep, active_promotions_tag, async_active_promotions_tag
+from app.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.core.http_cache import conditional, async_conditional
 from app.schemas.promotion import PromotionCreate, PromotionUpdate, PromotionResponse
+from app.schemas.page import Page
 
 router = APIRouter(
     prefix="/promotions",
@@ -11,11 +14,20 @@ router = APIRouter(
 )
 
 
-@router.get("/", response_model=List[PromotionResponse])
-def get_all(service: PromotionCoreDep):
-    return service.get_all()
+@router.get("/", response_model=Page[PromotionResponse])
+def get_all(
+    service: PromotionCoreDep,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+):
+    return service.get_all(limit, cursor)
 
-@router.get("/active/", response_model=List[PromotionResponse])
+# PromotionResponse містить страви акції, тож тег залежить і від версії "dishes"
+@router.get(
+    "/active/",
+    response_model=List[PromotionResponse],
+    dependencies=[conditional("promotions", "dishes", tag=active_promotions_tag)],
+)
 def get_active_promotion(service: PromotionCoreDep):
     return service.get_active_promotion()
 @router.get("/{promotion_id}", response_model=PromotionResponse)
@@ -35,3 +47,43 @@ def update(promotion_id: PositiveInt, data: PromotionUpdate, service: PromotionC
 @router.delete("/{promotion_id}")
 def delete(promotion_id: PositiveInt, service: PromotionCoreDep):
     return service.delete(promotion_id)
+
+
+async_router = APIRouter(
+    prefix="/promotions",
+    tags=["Promotions"]
+)
+
+
+@async_router.get("/", response_model=Page[PromotionResponse])
+async def get_all(
+    service: AsyncPromotionCoreDep,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+):
+    return await service.get_all(limit, cursor)
+
+@async_router.get(
+    "/active/",
+    response_model=List[PromotionResponse],
+    dependencies=[async_conditional("promotions", "dishes", tag=async_active_promotions_tag)],
+)
+async def get_active_promotion(service: AsyncPromotionCoreDep):
+    return await service.get_active_promotion()
+@async_router.get("/{promotion_id}", response_model=PromotionResponse)
+async def get_by_id(promotion_id: PositiveInt, service: AsyncPromotionCoreDep):
+    return await service.get_by_id(promotion_id)
+
+@async_router.post("/", response_model=PromotionResponse)
+async def create(data: PromotionCreate, service: AsyncPromotionCoreDep):
+    return await service.create(data)
+
+
+@async_router.put("/{promotion_id}", response_model=PromotionResponse)
+async def update(promotion_id: PositiveInt, data: PromotionUpdate, service: AsyncPromotionCoreDep):
+    return await service.update(promotion_id, data)
+
+
+@async_router.delete("/{promotion_id}")
+async def delete(promotion_id: PositiveInt, service: AsyncPromotionCoreDep):
+    return await service.delete(promotion_id)
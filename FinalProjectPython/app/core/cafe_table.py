@@ -3,17 +3,24 @@ from typing import List, Annotated, Optional
 from fastapi.params import Depends
 from fastapi import HTTPException, status
 
-from app.crud.cafe_table import CafeTableRepoDep
-from app.schemas.cafe_table import CafeTableCreate, CafeTableUpdate, CafeTableResponse
+from app.crud.cafe_table import CafeTableRepoDep, AsyncCafeTableRepoDep
+from app.schemas.cafe_table import CafeTableCreate, CafeTableUpdate, CafeTableResponse, TableFloorStatus
+from app.core.pagination import build_page, decode_cursor
+from app.schemas.page import Page
 
 
 class CafeTableService:
     def __init__(self, repo: CafeTableRepoDep):
         self.repo = repo
 
-    def get_all(self) -> List[CafeTableResponse]:
-        tables = self.repo.get_all()
-        return [CafeTableResponse.model_validate(t) for t in tables]
+    def get_all(
+        self,
+        limit: int,
+        cursor: Optional[str] = None,
+        location: Optional[str] = None,
+    ) -> Page[CafeTableResponse]:
+        tables = self.repo.get_all(limit + 1, decode_cursor(cursor), location=location)
+        return build_page(tables, limit, CafeTableResponse)
 
     def get_by_id(self, table_id: int) -> CafeTableResponse:
         table = self.repo.get_by_id(table_id)
@@ -33,6 +40,11 @@ class CafeTableService:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Tables not found")
         return [CafeTableResponse.model_validate(t) for t in tables]
 
+    def get_floor(self) -> List[TableFloorStatus]:
+        # план залу одним запитом замість /tables/ + is_occupied і суми для кожного столу
+        rows = self.repo.get_floor()
+        return [TableFloorStatus(**row._mapping) for row in rows]
+
     def is_table_occupied(self, table_id: int) -> bool:
         table = self.repo.get_by_id(table_id)
         if not table:
@@ -69,3 +81,76 @@ class CafeTableService:
 
 
 CafeTableCoreDep = Annotated[CafeTableService, Depends(CafeTableService)]
+
+
+class AsyncCafeTableService:
+    def __init__(self, repo: AsyncCafeTableRepoDep):
+        self.repo = repo
+
+    async def get_all(
+        self,
+        limit: int,
+        cursor: Optional[str] = None,
+        location: Optional[str] = None,
+    ) -> Page[CafeTableResponse]:
+        tables = await self.repo.get_all(limit + 1, decode_cursor(cursor), location=location)
+        return build_page(tables, limit, CafeTableResponse)
+
+    async def get_by_id(self, table_id: int) -> CafeTableResponse:
+        table = await self.repo.get_by_id(table_id)
+        if not table:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Table not found")
+        return CafeTableResponse.model_validate(table)
+
+    async def get_by_number(self, number: int) -> CafeTableResponse:
+        table = await self.repo.get_by_number(number)
+        if not table:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Table not found")
+        return CafeTableResponse.model_validate(table)
+
+    async def get_tables_by_occupacy(self, occupied: bool) -> List[CafeTableResponse]:
+        tables = await self.repo.get_tables_by_occupacy(occupied)
+        if not tables:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Tables not found")
+        return [CafeTableResponse.model_validate(t) for t in tables]
+
+    async def get_floor(self) -> List[TableFloorStatus]:
+        # план залу одним запитом замість /tables/ + is_occupied і суми для кожного столу
+        rows = await self.repo.get_floor()
+        return [TableFloorStatus(**row._mapping) for row in rows]
+
+    async def is_table_occupied(self, table_id: int) -> bool:
+        table = await self.repo.get_by_id(table_id)
+        if not table:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Table not found")
+        return await self.repo.is_table_occupied(table.id)
+
+    async def create(self, table_create: CafeTableCreate) -> CafeTableResponse:
+        existing = await self.repo.get_by_number(table_create.number)
+        if existing:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Table number already exists")
+        table = await self.repo.create(table_create)
+        return CafeTableResponse.model_validate(table)
+
+    async def update(self, table_id: int, table_update: CafeTableUpdate) -> CafeTableResponse:
+        table = await self.repo.get_by_id(table_id)
+        if not table:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Table not found")
+        if table_update.number is not None and table_update.number != table.number:
+            if await self.repo.get_by_number(table_update.number):
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Table number already exists")
+        updated_table = await self.repo.update(table_id, table_update)
+        return CafeTableResponse.model_validate(updated_table)
+
+    async def delete(self, table_id: int) -> bool:
+        table = await self.repo.get_by_id(table_id)
+        if not table:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Table not found")
+        if await self.repo.is_table_occupied(table.id):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Table occupied already")
+
+        await self.repo.delete(table_id)
+        return True
+
+
+AsyncCafeTableCoreDep = Annotated[AsyncCafeTableService, Depends(AsyncCafeTableService)]
@@ -2,7 +2,8 @@ from typing import List, Annotated
 
 from fastapi.params import Depends
 
-from app.crud.category_dish import CategoryRepoDep
+from app.crud.category_dish import CategoryRepoDep, AsyncCategoryRepoDep
+from app.core.menu_cache import cached_menu, cached_menu_async
 from app.schemas.category_dish import CategoryCreate, CategoryUpdate, CategoryResponse
 from fastapi import HTTPException, status
 
@@ -11,8 +12,10 @@ class CategoryService:
         self.repo = repo
 
     def get_all(self) -> List[CategoryResponse]:
-        categories = self.repo.get_all()
-        return [CategoryResponse.model_validate(c) for c in categories]
+        def load() -> List[CategoryResponse]:
+            return [CategoryResponse.model_validate(c) for c in self.repo.get_all()]
+
+        return cached_menu(("categories",), load)
 
     def get_by_id(self, category_id: int) -> CategoryResponse:
         category = self.repo.get_by_id(category_id)
@@ -56,4 +59,59 @@ class CategoryService:
         self.repo.delete(category_id)
         return True
 
-CategoryCoreDep = Annotated[CategoryService, Depends(CategoryService)]
\ No newline at end of file
+CategoryCoreDep = Annotated[CategoryService, Depends(CategoryService)]
+
+
+class AsyncCategoryService:
+    def __init__(self, repo: AsyncCategoryRepoDep):
+        self.repo = repo
+
+    async def get_all(self) -> List[CategoryResponse]:
+        async def load() -> List[CategoryResponse]:
+            return [CategoryResponse.model_validate(c) for c in await self.repo.get_all()]
+
+        return await cached_menu_async(("categories",), load)
+
+    async def get_by_id(self, category_id: int) -> CategoryResponse:
+        category = await self.repo.get_by_id(category_id)
+        if not category:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Category not found")
+        return CategoryResponse.model_validate(category)
+
+    async def get_by_name(self, name: str) -> CategoryResponse:
+        category = await self.repo.get_by_name(name)
+        if not category:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Category not found")
+        return CategoryResponse.model_validate(category)
+
+    async def create(self, category_create: CategoryCreate) -> CategoryResponse:
+        existing = await self.repo.get_by_name(category_create.name)
+        if existing:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Category name already exists")
+        category = await self.repo.create(category_create)
+        return CategoryResponse.model_validate(category)
+
+    async def update(self, category_id: int, category_update: CategoryUpdate) -> CategoryResponse:
+        category = await self.repo.get_by_id(category_id)
+        if not category:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Category not found")
+        if category_update.name and category_update.name != category.name:
+            if await self.repo.get_by_name(category_update.name):
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Category name already exists")
+        updated_category = await self.repo.update(category_id, category_update)
+        return CategoryResponse.model_validate(updated_category)
+
+    async def delete(self, category_id: int) -> bool:
+        category = await self.repo.get_with_dishes(category_id)
+        if not category:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Category not found")
+        for dish in category.dishes:
+            if dish.id and await self.repo.has_order_items(dish.id):
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Cannot delete category: dish '{dish.name}' is used in orders."
+                )
+        await self.repo.delete(category_id)
+        return True
+
+AsyncCategoryCoreDep = Annotated[AsyncCategoryService, Depends(AsyncCategoryService)]
\ No newline at end of file
@@ -1,23 +1,34 @@
-from typing import List
+from typing import List, Optional
 from fastapi import HTTPException, status
 from fastapi.params import Depends
 from typing import Annotated
 
 from unicodedata import category
 
-from app.crud.dish import DishRepoDep
-from app.crud.category_dish import CategoryRepoDep
+from app.crud.dish import DishRepoDep, AsyncDishRepoDep
+from app.crud.category_dish import CategoryRepoDep, AsyncCategoryRepoDep
 from app.models import Dish
 from app.schemas.dish import DishCreate, DishUpdate, DishResponse
+from app.core.pagination import build_page, decode_cursor
+from app.core.menu_cache import cached_menu, cached_menu_async
+from app.schemas.page import Page
 
 class DishService:
     def __init__(self, dish_repo: DishRepoDep, category_repo: CategoryRepoDep):
         self.dish_repo = dish_repo
         self.category_repo = category_repo
 
-    def get_all(self) -> List[DishResponse]:
-        dishes = self.dish_repo.get_all()
-        return [DishResponse.model_validate(d) for d in dishes]
+    def get_all(
+        self,
+        limit: int,
+        cursor: Optional[str] = None,
+        category_id: Optional[int] = None,
+    ) -> Page[DishResponse]:
+        def load() -> Page[DishResponse]:
+            dishes = self.dish_repo.get_all(limit + 1, decode_cursor(cursor), category_id=category_id)
+            return build_page(dishes, limit, DishResponse)
+
+        return cached_menu(("dishes", limit, cursor, category_id), load)
 
     def get_by_id(self, dish_id: int) -> DishResponse:
         dish = self.dish_repo.get_by_id(dish_id)
@@ -41,10 +52,13 @@ class DishService:
         return [DishResponse.model_validate(d) for d in dishes]
 
     def get_dishes_on_promotion(self) -> List[DishResponse]:
-        dishes = self.dish_repo.get_dishes_on_promotion()
+        def load() -> List[DishResponse]:
+            return [DishResponse.model_validate(d) for d in self.dish_repo.get_dishes_on_promotion()]
+
+        dishes = cached_menu(("dishes_on_promotion",), load)
         if not dishes:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Dish not found")
-        return [DishResponse.model_validate(d) for d in dishes]
+        return dishes
 
     def get_most_popular_dish(self) -> DishResponse:
         dish = self.dish_repo.get_most_popular_dish()
@@ -53,10 +67,13 @@ class DishService:
         return DishResponse.model_validate(dish)
 
     def sort_dishes_by_price(self, ascending: bool = True) -> List[DishResponse]:
-        dishes = self.dish_repo.sort_dishes_by_price(ascending)
+        def load() -> List[DishResponse]:
+            return [DishResponse.model_validate(d) for d in self.dish_repo.sort_dishes_by_price(ascending)]
+
+        dishes = cached_menu(("dishes_by_price", ascending), load)
         if not dishes:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Dish not found")
-        return [DishResponse.model_validate(d) for d in dishes]
+        return dishes
 
 
 
@@ -104,4 +121,113 @@ class DishService:
         self.dish_repo.delete(dish_id)
         return True
 
-DishCoreDep = Annotated[DishService, Depends(DishService)]
\ No newline at end of file
+DishCoreDep = Annotated[DishService, Depends(DishService)]
+
+
+class AsyncDishService:
+    def __init__(self, dish_repo: AsyncDishRepoDep, category_repo: AsyncCategoryRepoDep):
+        self.dish_repo = dish_repo
+        self.category_repo = category_repo
+
+    async def get_all(
+        self,
+        limit: int,
+        cursor: Optional[str] = None,
+        category_id: Optional[int] = None,
+    ) -> Page[DishResponse]:
+        async def load() -> Page[DishResponse]:
+            dishes = await self.dish_repo.get_all(limit + 1, decode_cursor(cursor), category_id=category_id)
+            return build_page(dishes, limit, DishResponse)
+
+        return await cached_menu_async(("dishes", limit, cursor, category_id), load)
+
+    async def get_by_id(self, dish_id: int) -> DishResponse:
+        dish = await self.dish_repo.get_by_id(dish_id)
+        if not dish:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Dish not found")
+        return DishResponse.model_validate(dish)
+
+    async def get_by_name(self, name: str) -> DishResponse:
+        dish = await self.dish_repo.get_by_name(name)
+        if not dish:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Dish not found")
+        return DishResponse.model_validate(dish)
+
+    async def get_dishes_by_category_id(self, category_id: int) -> List[DishResponse]:
+        category = await self.category_repo.get_by_id(category_id)
+        if not category:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Category not found")
+        dishes = await self.dish_repo.get_dishes_by_category(category_id)
+        if not dishes:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Dishes not found")
+        return [DishResponse.model_validate(d) for d in dishes]
+
+    async def get_dishes_on_promotion(self) -> List[DishResponse]:
+        async def load() -> List[DishResponse]:
+            return [DishResponse.model_validate(d) for d in await self.dish_repo.get_dishes_on_promotion()]
+
+        dishes = await cached_menu_async(("dishes_on_promotion",), load)
+        if not dishes:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Dish not found")
+        return dishes
+
+    async def get_most_popular_dish(self) -> DishResponse:
+        dish = await self.dish_repo.get_most_popular_dish()
+        if not dish:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Dish not found")
+        return DishResponse.model_validate(dish)
+
+    async def sort_dishes_by_price(self, ascending: bool = True) -> List[DishResponse]:
+        async def load() -> List[DishResponse]:
+            return [DishResponse.model_validate(d) for d in await self.dish_repo.sort_dishes_by_price(ascending)]
+
+        dishes = await cached_menu_async(("dishes_by_price", ascending), load)
+        if not dishes:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Dish not found")
+        return dishes
+
+    async def create(self, dish_create: DishCreate) -> DishResponse:
+        category = await self.category_repo.get_by_id(dish_create.category_id)
+        if not category:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Category does not exist")
+
+        if dish_create.price <= 0:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Price must be greater than 0")
+
+        existing = await self.dish_repo.get_by_name(dish_create.name)
+        if existing:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Dish name already exists")
+
+        dish = await self.dish_repo.create(dish_create)
+        return DishResponse.model_validate(dish)
+
+    async def update(self, dish_id: int, dish_update: DishUpdate) -> DishResponse:
+        dish = await self.dish_repo.get_by_id(dish_id)
+        if not dish:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Dish not found")
+
+        if dish_update.category_id:
+            category = await self.category_repo.get_by_id(dish_update.category_id)
+            if not category:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Category does not exist")
+
+        if dish_update.name and dish_update.name != dish.name:
+            if await self.dish_repo.get_by_name(dish_update.name):
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Dish name already exists")
+
+        if dish_update.price <= 0:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Price must be greater than 0")
+
+        updated_dish = await self.dish_repo.update(dish_id, dish_update)
+        return DishResponse.model_validate(updated_dish)
+
+    async def delete(self, dish_id: int) -> bool:
+        dish = await self.dish_repo.get_by_id(dish_id)
+        if not dish:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Dish not found")
+        if await self.dish_repo.has_order_items(dish_id):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Dish is in order")
+        await self.dish_repo.delete(dish_id)
+        return True
+
+AsyncDishCoreDep = Annotated[AsyncDishService, Depends(AsyncDishService)]
\ No newline at end of file
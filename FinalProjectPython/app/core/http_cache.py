@@ -0,0 +1,74 @@
+from typing import Callable
+
+from fastapi import HTTPException, Request, Response, status
+from fastapi.params import Depends
+
+from app.core.menu_cache import cached_menu, cached_menu_async
+from app.crud.resource_version import ResourceVersionRepoDep, AsyncResourceVersionRepoDep
+
+# клієнт може тримати копію, але перед використанням щоразу перевіряє її через If-None-Match
+CACHE_CONTROL = "no-cache"
+
+# версії цих ресурсів змінюються лише разом зі скиданням menu_cache, тож їх можна тримати в ньому
+MENU_RESOURCES = frozenset({"dishes", "categories", "promotions"})
+
+
+def _no_tag() -> str:
+    return ""
+
+
+def _etag(versions: dict[str, int], tag: str) -> str:
+    parts = [f"{resource}.{version}" for resource, version in versions.items()]
+    if tag:
+        parts.append(tag)
+    return f'W/"{"-".join(parts)}"'
+
+
+def _matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    # порівняння слабке: W/ у запиті й у нашому тегу ігнорується
+    tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in tags or etag.removeprefix("W/") in tags
+
+
+def _check(request: Request, response: Response, etag: str) -> None:
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if _matches(request.headers.get("If-None-Match"), etag):
+        # 304 без тіла: обробник HTTPException не додає {"detail": ...} для цього статусу
+        raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+
+
+def conditional(*resources: str, tag: Callable[..., str] = _no_tag) -> Depends:
+    # залежність маршруту: ETag з версій resources (і tag - для відповідей, що залежать ще й від часу);
+    # на збіг з If-None-Match відповідає 304, не читаючи самих сутностей
+    def check(
+        request: Request,
+        response: Response,
+        versions: ResourceVersionRepoDep,
+        extra: str = Depends(tag),
+    ) -> None:
+        if MENU_RESOURCES.issuperset(resources):
+            current = cached_menu(("versions", resources), lambda: versions.get_versions(resources))
+        else:
+            current = versions.get_versions(resources)
+        _check(request, response, _etag(current, extra))
+
+    return Depends(check)
+
+
+def async_conditional(*resources: str, tag: Callable[..., str] = _no_tag) -> Depends:
+    async def check(
+        request: Request,
+        response: Response,
+        versions: AsyncResourceVersionRepoDep,
+        extra: str = Depends(tag),
+    ) -> None:
+        if MENU_RESOURCES.issuperset(resources):
+            current = await cached_menu_async(("versions", resources), lambda: versions.get_versions(resources))
+        else:
+            current = await versions.get_versions(resources)
+        _check(request, response, _etag(current, extra))
+
+    return Depends(check)
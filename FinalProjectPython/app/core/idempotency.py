@@ -0,0 +1,97 @@
+import hashlib
+import itertools
+from datetime import datetime, timedelta
+from typing import Annotated, Awaitable, Callable, Optional, TypeVar
+
+from fastapi import Header, HTTPException, Request, Response, status
+from fastapi.params import Depends
+from pydantic import BaseModel
+
+from app.config import settings
+from app.crud.idempotency import IdempotencyRepoDep, AsyncIdempotencyRepoDep
+
+REPLAYED_HEADER = "Idempotent-Replayed"
+PURGE_EVERY = 100  # кожен стільки-то збережений ключ у воркері заодно видаляє порцію прострочених
+
+ResponseT = TypeVar("ResponseT", bound=BaseModel)
+
+_saved_keys = itertools.count(1)
+
+IdempotencyKeyHeader = Annotated[Optional[str], Header(alias="Idempotency-Key", min_length=1, max_length=255)]
+
+
+def _fingerprint(payload: BaseModel) -> bytes:
+    # хеш розібраного тіла, а не сирих байтів: той самий запит з іншим форматуванням JSON - не інший запит
+    return hashlib.blake2b(payload.model_dump_json().encode(), digest_size=16).digest()
+
+
+def _cutoff() -> datetime:
+    return datetime.utcnow() - timedelta(seconds=settings.idempotency_key_ttl)
+
+
+def _replay(response: Response, stored: str, stored_fingerprint: bytes, fingerprint: bytes, response_type: type[ResponseT]) -> ResponseT:
+    if stored_fingerprint != fingerprint:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Idempotency-Key has already been used with a different request",
+        )
+    response.headers[REPLAYED_HEADER] = "true"
+    return response_type.model_validate_json(stored)
+
+
+class Idempotency:
+    # Idempotency-Key для POST, що створюють дані: відповідь зберігається в транзакції запиту, і повтор з тим самим
+    # ключем протягом idempotency_key_ttl отримує її, не виконуючи роботу вдруге. Повтор, що прийшов, поки перший
+    # запит ще виконується, чекає на його коміт. Помилки не зберігаються: транзакція відкочується разом із ключем
+    def __init__(self, request: Request, response: Response, repo: IdempotencyRepoDep, key: IdempotencyKeyHeader = None):
+        self.endpoint = request.scope["route"].path
+        self.response = response
+        self.repo = repo
+        self.key = key
+
+    def run(self, payload: BaseModel, response_type: type[ResponseT], create: Callable[[], ResponseT]) -> ResponseT:
+        if self.key is None:
+            return create()
+        cutoff = _cutoff()
+        fingerprint = _fingerprint(payload)
+        stored_fingerprint, stored = self.repo.claim(self.endpoint, self.key, fingerprint, cutoff)
+        if stored is not None:
+            return _replay(self.response, stored, stored_fingerprint, fingerprint, response_type)
+
+        result = create()
+        self.repo.save(self.endpoint, self.key, result.model_dump_json())
+        if next(_saved_keys) % PURGE_EVERY == 0:
+            self.repo.purge_expired(cutoff)
+        return result
+
+IdempotencyDep = Annotated[Idempotency, Depends(Idempotency)]
+
+
+class AsyncIdempotency:
+    def __init__(self, request: Request, response: Response, repo: AsyncIdempotencyRepoDep, key: IdempotencyKeyHeader = None):
+        self.endpoint = request.scope["route"].path
+        self.response = response
+        self.repo = repo
+        self.key = key
+
+    async def run(
+        self,
+        payload: BaseModel,
+        response_type: type[ResponseT],
+        create: Callable[[], Awaitable[ResponseT]],
+    ) -> ResponseT:
+        if self.key is None:
+            return await create()
+        cutoff = _cutoff()
+        fingerprint = _fingerprint(payload)
+        stored_fingerprint, stored = await self.repo.claim(self.endpoint, self.key, fingerprint, cutoff)
+        if stored is not None:
+            return _replay(self.response, stored, stored_fingerprint, fingerprint, response_type)
+
+        result = await create()
+        await self.repo.save(self.endpoint, self.key, result.model_dump_json())
+        if next(_saved_keys) % PURGE_EVERY == 0:
+            await self.repo.purge_expired(cutoff)
+        return result
+
+AsyncIdempotencyDep = Annotated[AsyncIdempotency, Depends(AsyncIdempotency)]
@@ -0,0 +1,79 @@
+from datetime import datetime
+from typing import Annotated
+
+from fastapi.params import Depends
+
+from app.crud.category_dish import CategoryRepoDep, AsyncCategoryRepoDep
+from app.crud.promotion import PromotionRepoDep, AsyncPromotionRepoDep
+from app.core.menu_cache import cached_menu, cached_menu_async
+from app.core.pricing import PromotionIndex, active_promotion_ids, discount_percent, promotion_index, promotion_index_async
+from app.models.models import Dish, DishCategory
+from app.schemas.menu import MenuDish, MenuCategory, MenuResponse
+
+
+def _menu_key(index: PromotionIndex, now: datetime) -> tuple:
+    # ціни в документі залежать від того, які акції активні саме зараз, тож документ рендериться
+    # один раз на версію меню (скидання menu_cache) і набір активних акцій
+    return "menu", active_promotion_ids(index, now)
+
+
+def _menu_dish(dish: Dish, percent: int) -> MenuDish:
+    return MenuDish(
+        id=dish.id,
+        name=dish.name,
+        description=dish.description,
+        price=dish.price,
+        discount_percent=percent,
+        effective_price=round(dish.price * max(100 - percent, 0) / 100, 2),
+    )
+
+
+def _render_menu(categories: list[DishCategory], index: PromotionIndex, now: datetime) -> bytes:
+    menu = MenuResponse(
+        generated_at=now,
+        categories=[
+            MenuCategory(
+                id=category.id,
+                name=category.name,
+                description=category.description,
+                dishes=[
+                    _menu_dish(dish, discount_percent(index, dish.id, now))
+                    for dish in sorted(category.dishes, key=lambda d: d.id)
+                ],
+            )
+            for category in categories
+        ],
+    )
+    return menu.model_dump_json().encode()
+
+
+class MenuService:
+    def __init__(self, category_repo: CategoryRepoDep, promotion_repo: PromotionRepoDep):
+        self.category_repo = category_repo
+        self.promotion_repo = promotion_repo
+
+    def get_menu(self) -> bytes:
+        index = promotion_index(self.promotion_repo)
+        now = datetime.utcnow()
+        return cached_menu(_menu_key(index, now), lambda: _render_menu(self.category_repo.get_menu(), index, now))
+
+
+MenuCoreDep = Annotated[MenuService, Depends(MenuService)]
+
+
+class AsyncMenuService:
+    def __init__(self, category_repo: AsyncCategoryRepoDep, promotion_repo: AsyncPromotionRepoDep):
+        self.category_repo = category_repo
+        self.promotion_repo = promotion_repo
+
+    async def get_menu(self) -> bytes:
+        index = await promotion_index_async(self.promotion_repo)
+        now = datetime.utcnow()
+
+        async def load() -> bytes:
+            return _render_menu(await self.category_repo.get_menu(), index, now)
+
+        return await cached_menu_async(_menu_key(index, now), load)
+
+
+AsyncMenuCoreDep = Annotated[AsyncMenuService, Depends(AsyncMenuService)]
@@ -0,0 +1,100 @@
+import threading
+import time as clock
+from typing import Any, Awaitable, Callable, Hashable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.core.pricing import pricing_engine, promotion_schedule
+from app.db import after_commit
+from app.db.notify import notify_on_commit
+
+MENU_CHANNEL = "cafe_menu"
+MENU_CACHE_MAX_ENTRIES = 1024  # ключі з limit/cursor можуть множитися, найстаріші витісняються
+
+
+class MenuCache:
+    # готові відповіді меню (страви, категорії) в пам'яті воркера. Кешує лише поки активний слухач
+    # MENU_CHANNEL: без нього зміни з інших воркерів пройшли б непоміченими. ttl страхує від змін
+    # в обхід API (міграції, ручний SQL) і від відставання репліки, з якої прочитано значення
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: dict[Hashable, tuple[float, Any]] = {}
+        self._version = 0
+        self._active = False
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def get(self, key: Hashable) -> Any | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or clock.monotonic() - entry[0] > self.ttl:
+                return None
+            return entry[1]
+
+    def put(self, key: Hashable, value: Any, version: int) -> None:
+        # version - значення self.version до читання value; якщо меню змінилося, поки ми читали, не кешуємо
+        with self._lock:
+            if not self._active or version != self._version:
+                return
+            self._entries.pop(key, None)
+            if len(self._entries) >= self.max_entries:
+                del self._entries[next(iter(self._entries))]
+            self._entries[key] = (clock.monotonic(), value)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._version += 1
+            self._entries.clear()
+
+    def activate(self) -> None:
+        # слухач щойно (пере)підключився: усе, що закешовано раніше, могло пропустити сповіщення
+        with self._lock:
+            self._version += 1
+            self._entries.clear()
+            self._active = True
+
+    def deactivate(self) -> None:
+        with self._lock:
+            self._version += 1
+            self._entries.clear()
+            self._active = False
+
+
+menu_cache = MenuCache(ttl=settings.menu_cache_ttl, max_entries=MENU_CACHE_MAX_ENTRIES)
+
+
+def cached_menu(key: Hashable, load: Callable[[], Any]) -> Any:
+    value = menu_cache.get(key)
+    if value is None:
+        version = menu_cache.version
+        value = load()
+        menu_cache.put(key, value, version)
+    return value
+
+
+async def cached_menu_async(key: Hashable, load: Callable[[], Awaitable[Any]]) -> Any:
+    value = menu_cache.get(key)
+    if value is None:
+        version = menu_cache.version
+        value = await load()
+        menu_cache.put(key, value, version)
+    return value
+
+
+def invalidate_menu() -> None:
+    # індекс і розклад акцій теж будуються з меню, тож скидаються разом із кешем
+    menu_cache.invalidate()
+    pricing_engine.invalidate()
+    promotion_schedule.invalidate()
+
+
+def publish_menu_change(db: Session | AsyncSession) -> None:
+    # інші воркери дізнаються про зміну через NOTIFY після коміту, цей воркер - одразу після коміту
+    notify_on_commit(db, MENU_CHANNEL)
+    after_commit(db, invalidate_menu)
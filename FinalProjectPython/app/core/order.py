@@ -1,17 +1,189 @@
-from typing import List
+import csv
+import io
+from typing import Iterator, List, Literal, Optional
 from fastapi import HTTPException, status
 from datetime import datetime, date, time
 
 from fastapi.params import Depends
 from typing import Annotated
+from sqlalchemy.exc import IntegrityError
 
-from app.crud.order import OrderRepoDep
-from app.crud.order_item import OrderItemRepoDep
-from app.crud.dish import DishRepoDep
-from app.crud.promotion import PromotionRepoDep
-from app.schemas.order import OrderCreate, OrderUpdate, OrderResponse
+from app.db import LocalSession, violated_constraint
+
+from app.crud.order import OrderRepo, OrderRepoDep, AsyncOrderRepoDep
+from app.crud.order_item import OrderItemRepoDep, AsyncOrderItemRepoDep
+from app.crud.dish import DishRepoDep, AsyncDishRepoDep
+from app.crud.promotion import PromotionRepoDep, AsyncPromotionRepoDep
+from app.schemas.order import (
+    OrderCreate, OrderUpdate, OrderResponse, OrderPeriodSummary, OrderSummaryBucket, OrderTotal,
+    OrderTotalsCheck, OrderTotalsMismatch, PrepBoardDish, OrderBulkItem, OrderBulkCreate, OrderBulkResult,
+    OrderBulkResponse,
+)
 from app.schemas.order_item import OrderItemResponse
-from app.crud.cafe_table import CafeTableRepoDep
+from app.core.menu_cache import cached_menu, cached_menu_async
+from app.core.pagination import build_page, decode_cursor, MAX_PAGE_SIZE
+from app.core.prep_board import PrepDish, prep_board
+from app.core.pricing import discount_rate, promotion_index, promotion_index_async
+from app.schemas.page import Page
+from app.models.models import Order
+
+ACTIVE_ORDER_PER_TABLE = "uq_orders_table_id_active"
+ORDER_TABLE_FK = "orders_table_id_fkey"
+
+ExportFormat = Literal["ndjson", "csv"]
+SummaryBucket = Literal["day", "hour"]
+MAX_BULK_ORDERS = 1000
+EXPORT_BATCH_SIZE = 1000
+EXPORT_CHUNK_SIZE = 64 * 1024
+EXPORT_CSV_HEADER = (
+    "order_id", "table_id", "created_at", "is_completed", "item_id", "dish_id", "quantity", "price_at_order"
+)
+
+
+def raise_table_error(error: IntegrityError, table_id: int):
+    constraint = violated_constraint(error)
+    if constraint == ACTIVE_ORDER_PER_TABLE:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Table {table_id} already has an active order."
+        ) from error
+    if constraint == ORDER_TABLE_FK:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Table id {table_id} not found"
+        ) from error
+    raise error
+
+
+def _check_bulk_size(orders: List[OrderBulkItem]) -> None:
+    if not orders or len(orders) > MAX_BULK_ORDERS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Send between 1 and {MAX_BULK_ORDERS} orders per request"
+        )
+
+
+def _bulk_rejection(order: OrderBulkItem, dishes: dict, tables: dict[int, bool], claimed: set[int]) -> str | None:
+    # ті самі перевірки, що й у create, але проти вже вибраних наборів страв і столів; claimed - столи,
+    # які зайняли активні замовлення раніше в цій же пачці
+    for item in order.items:
+        if item.dish_id not in dishes:
+            return f"Dish id {item.dish_id} not found"
+        if item.quantity <= 0:
+            return "Quantity must be positive"
+    if order.table_id not in tables:
+        return f"Table id {order.table_id} not found"
+    if not order.is_completed and (tables[order.table_id] or order.table_id in claimed):
+        return f"Table {order.table_id} already has an active order."
+    return None
+
+
+def _bulk_response(results: List[OrderBulkResult]) -> OrderBulkResponse:
+    created = sum(result.status == "created" for result in results)
+    return OrderBulkResponse(created=created, rejected=len(results) - created, results=results)
+
+
+def _period_bounds(start_date: date, end_date: date) -> tuple[datetime, datetime]:
+    start_datetime = datetime.combine(start_date, time.min)
+    end_datetime = datetime.combine(end_date, time.max)
+    if start_datetime > end_datetime:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Start date must be before end date")
+    return start_datetime, end_datetime
+
+
+def _average_ticket(revenue: float, order_count: int) -> float:
+    return round(revenue / order_count, 2) if order_count else 0.0
+
+
+def _build_period_summary(rows, start: datetime, end: datetime, bucket: Optional[SummaryBucket]) -> OrderPeriodSummary:
+    if bucket is None:
+        # агрегат без GROUP BY завжди повертає рівно один рядок
+        order_count, item_count, revenue = rows[0]
+        buckets = []
+    else:
+        buckets = [
+            OrderSummaryBucket(
+                period_start=row.period_start,
+                order_count=row.order_count,
+                item_count=row.item_count,
+                revenue=round(row.revenue, 2),
+                average_ticket=_average_ticket(row.revenue, row.order_count),
+            )
+            for row in rows
+        ]
+        order_count = sum(row.order_count for row in rows)
+        item_count = sum(row.item_count for row in rows)
+        revenue = sum(row.revenue for row in rows)
+    return OrderPeriodSummary(
+        start=start,
+        end=end,
+        order_count=order_count,
+        item_count=item_count,
+        revenue=round(revenue, 2),
+        average_ticket=_average_ticket(revenue, order_count),
+        buckets=buckets,
+    )
+
+
+def _order_totals(rows) -> List[OrderTotal]:
+    return [
+        OrderTotal(order_id=row.order_id, subtotal=round(row.subtotal, 2), discount=round(row.discount, 2), total=row.total)
+        for row in rows
+    ]
+
+
+def _totals_check(rows, repaired: bool) -> OrderTotalsCheck:
+    return OrderTotalsCheck(
+        repaired=repaired,
+        mismatches=[OrderTotalsMismatch.model_validate(row, from_attributes=True) for row in rows],
+    )
+
+
+def _check_total_ids(order_ids: Optional[List[int]]) -> None:
+    if order_ids is not None and len(order_ids) > MAX_PAGE_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {MAX_PAGE_SIZE} order ids per request"
+        )
+
+
+def _csv_rows(order: Order) -> Iterator[tuple]:
+    # один рядок на позицію замовлення; замовлення без позицій - один рядок з порожніми полями позиції
+    head = (order.id, order.table_id, order.created_at.isoformat(), order.is_completed)
+    if not order.items:
+        yield head + (None, None, None, None)
+    for item in order.items:
+        yield head + (item.id, item.dish_id, item.quantity, item.price_at_order)
+
+
+def _export_orders(start: datetime, end: datetime, export_format: ExportFormat) -> Iterator[str]:
+    # StreamingResponse читає генератор уже після того, як FastAPI закрив сесію запиту,
+    # тому експорт відкриває власну сесію на весь час передачі
+    with LocalSession() as db:
+        orders = OrderRepo(db).stream_orders_by_period(start, end, EXPORT_BATCH_SIZE)
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if export_format == "csv":
+            writer.writerow(EXPORT_CSV_HEADER)
+        for order in orders:
+            if export_format == "csv":
+                writer.writerows(_csv_rows(order))
+            else:
+                buffer.write(OrderResponse.model_validate(order).model_dump_json())
+                buffer.write("\n")
+            if buffer.tell() >= EXPORT_CHUNK_SIZE:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        yield buffer.getvalue()
+
+
+def _prep_board(board: list[PrepDish], names: dict[int, str]) -> List[PrepBoardDish]:
+    return [PrepBoardDish(name=names.get(dish.dish_id), **dish._asdict()) for dish in board]
+
+
+def _snapshot_json(orders: list[Order]) -> str:
+    return "[" + ",".join(OrderResponse.model_validate(order).model_dump_json() for order in orders) + "]"
 
 
 class OrderService:
@@ -21,17 +193,30 @@ class OrderService:
         order_item_repo: OrderItemRepoDep,
         dish_repo: DishRepoDep,
         promotion_repo: PromotionRepoDep,
-        table_repo: CafeTableRepoDep,
     ):
         self.order_repo = order_repo
         self.order_item_repo = order_item_repo
         self.dish_repo = dish_repo
         self.promotion_repo = promotion_repo
-        self.table_repo = table_repo
 
-    def get_all(self) -> List[OrderResponse]:
-        orders = self.order_repo.get_all()
-        return [OrderResponse.model_validate(o) for o in orders]
+    def get_all(
+        self,
+        limit: int,
+        cursor: Optional[str] = None,
+        table_id: Optional[int] = None,
+        is_completed: Optional[bool] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+    ) -> Page[OrderResponse]:
+        orders = self.order_repo.get_all(
+            limit + 1,
+            decode_cursor(cursor),
+            table_id=table_id,
+            is_completed=is_completed,
+            created_from=created_from,
+            created_to=created_to,
+        )
+        return build_page(orders, limit, OrderResponse)
 
     def get_by_id(self, order_id: int) -> OrderResponse:
         order = self.order_repo.get_by_id(order_id)
@@ -45,11 +230,27 @@ class OrderService:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No active orders")
         return [OrderResponse.model_validate(o) for o in orders]
 
+    def get_prep_board(self) -> List[PrepBoardDish]:
+        if not prep_board.active:
+            # без слухача події могли загубитися - рахує база, одним GROUP BY
+            board = [PrepDish(*row) for row in self.order_repo.get_prep_board()]
+        else:
+            board = prep_board.get()
+            if board is None:
+                # перше читання після старту чи перепідключення: позиції відкритих замовлень одним запитом,
+                # далі дошка живе подіями замовлень
+                token = prep_board.begin_load()
+                board = prep_board.finish_load(token, self.order_repo.get_open_items())
+        names = cached_menu(("dish_names",), self.dish_repo.get_names)
+        return _prep_board(board, names)
+
+    def get_active_snapshot(self) -> str:
+        # JSON-масив активних замовлень для події snapshot; порожній масив - теж стан, а не 404
+        orders = self.order_repo.get_active_orders_snapshot()
+        return _snapshot_json(orders)
+
     def get_orders_by_period(self, start_date: date, end_date: date) -> List[OrderResponse]:
-        start_datetime = datetime.combine(start_date, time.min)
-        end_datetime = datetime.combine(end_date, time.max)
-        if start_datetime > end_datetime:
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Start date must be before end date")
+        start_datetime, end_datetime = _period_bounds(start_date, end_date)
 
         orders = self.order_repo.get_orders_by_period(
             start=start_datetime,
@@ -59,44 +260,80 @@ class OrderService:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Orders not found")
         return [OrderResponse.model_validate(o) for o in orders]
 
+    def get_orders_summary_by_period(
+        self, start_date: date, end_date: date, bucket: Optional[SummaryBucket] = None
+    ) -> OrderPeriodSummary:
+        start_datetime, end_datetime = _period_bounds(start_date, end_date)
+        rows = self.order_repo.get_period_summary(start_datetime, end_datetime, bucket)
+        return _build_period_summary(rows, start_datetime, end_datetime, bucket)
+
+    def export_orders_by_period(self, start_date: date, end_date: date, export_format: ExportFormat) -> Iterator[str]:
+        start_datetime, end_datetime = _period_bounds(start_date, end_date)
+        return _export_orders(start_datetime, end_datetime, export_format)
+
     def create(self, order_create: OrderCreate) -> OrderResponse:
-        table = self.table_repo.get_by_id(order_create.table_id)
-        if not table:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Table id {order_create.table_id} not found"
-            )
-        if self.table_repo.is_table_occupied(table.id):
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Table {table.id} already has an active order."
-            )
+        dishes = self.dish_repo.get_many(item.dish_id for item in order_create.items)
         for item in order_create.items:
-            dish = self.dish_repo.get_by_id(item.dish_id)
-            if not dish:
+            if item.dish_id not in dishes:
                 raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Dish id {item.dish_id} not found")
             if item.quantity <= 0:
                 raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Quantity must be positive")
 
-        order = self.order_repo.create(order_create)
+        index = promotion_index(self.promotion_repo)
+        now = datetime.utcnow()
+        discount_rates = {dish_id: discount_rate(index, dish_id, now) for dish_id in dishes}
+        prices = {dish_id: dish.price for dish_id, dish in dishes.items()}
+
+        # стіл і його зайнятість перевіряє база (FK і uq_orders_table_id_active) під час вставки
+        try:
+            order = self.order_repo.create(order_create, prices, discount_rates)
+        except IntegrityError as e:
+            raise_table_error(e, order_create.table_id)
 
         return OrderResponse.model_validate(order)
 
+    def create_bulk(self, bulk: OrderBulkCreate) -> OrderBulkResponse:
+        _check_bulk_size(bulk.orders)
+        # страви і столи всієї пачки - двома запитами на множини id
+        dishes = self.dish_repo.get_many({item.dish_id for order in bulk.orders for item in order.items})
+        tables = self.order_repo.get_table_occupancy({order.table_id for order in bulk.orders})
+
+        results: List[OrderBulkResult | None] = [None] * len(bulk.orders)
+        accepted: List[int] = []
+        claimed: set[int] = set()
+        for index, order in enumerate(bulk.orders):
+            rejection = _bulk_rejection(order, dishes, tables, claimed)
+            if rejection:
+                results[index] = OrderBulkResult(index=index, status="rejected", detail=rejection)
+                continue
+            accepted.append(index)
+            if not order.is_completed:
+                claimed.add(order.table_id)
+
+        index = promotion_index(self.promotion_repo)
+        now = datetime.utcnow()
+        discount_rates = {dish_id: discount_rate(index, dish_id, now) for dish_id in dishes}
+        prices = {dish_id: dish.price for dish_id, dish in dishes.items()}
+        # вставляються лише ті, що пройшли перевірку; решта пачки від них не залежить
+        created = self.order_repo.create_many([bulk.orders[i] for i in accepted], prices, discount_rates)
+        for i, order in zip(accepted, created):
+            if order is None:
+                detail = f"Table {bulk.orders[i].table_id} already has an active order."
+                results[i] = OrderBulkResult(index=i, status="rejected", detail=detail)
+            else:
+                results[i] = OrderBulkResult(index=i, status="created", order_id=order.id)
+        return _bulk_response(results)
+
     def update(self, order_id: int, order_update: OrderUpdate) -> OrderResponse:
-        order = self.order_repo.update(order_id, order_update)
+        order = self.order_repo.get_by_id(order_id)
         if not order:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Order not found")
-        table = self.table_repo.get_by_id(order_update.table_id)
-        if not table:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Table id {order_update.table_id} not found"
-            )
-        if self.table_repo.is_table_occupied(table.id):
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Table {table.id} already has an active order."
-            )
+        # стіл, за яким замовлення буде після зміни: при повторному відкритті table_id у запиті не передають
+        table_id = order_update.table_id or order.table_id
+        try:
+            order = self.order_repo.update(order_id, order_update)
+        except IntegrityError as e:
+            raise_table_error(e, table_id)
         return OrderResponse.model_validate(order)
 
     def complete_order(self, order_id: int) -> OrderResponse:
@@ -117,34 +354,204 @@ class OrderService:
         self.order_repo.delete(order_id)
         return True
 
+    def get_totals(self, order_ids: Optional[List[int]] = None) -> List[OrderTotal]:
+        # збережені суми; без order_ids - усі активні замовлення
+        _check_total_ids(order_ids)
+        rows = self.order_repo.get_totals(order_ids)
+        return _order_totals(rows)
+
+    def check_totals(self, repair: bool = False) -> OrderTotalsCheck:
+        # перераховує збережені суми з order_items одним запитом; repair - одразу записує правильні
+        if repair:
+            return _totals_check(self.order_repo.repair_totals(), repaired=True)
+        return _totals_check(self.order_repo.get_inconsistent_totals(), repaired=False)
+
     def calculate_total(self, order_id: int) -> float:
-        order = self.order_repo.get_by_id(order_id)
+        total = self.order_repo.get_total(order_id)
+        if total is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Order not found")
+        return total
+
+
+OrderCoreDep = Annotated[OrderService, Depends(OrderService)]
+
+
+class AsyncOrderService:
+    def __init__(
+        self,
+        order_repo: AsyncOrderRepoDep,
+        order_item_repo: AsyncOrderItemRepoDep,
+        dish_repo: AsyncDishRepoDep,
+        promotion_repo: AsyncPromotionRepoDep,
+    ):
+        self.order_repo = order_repo
+        self.order_item_repo = order_item_repo
+        self.dish_repo = dish_repo
+        self.promotion_repo = promotion_repo
+
+    async def get_all(
+        self,
+        limit: int,
+        cursor: Optional[str] = None,
+        table_id: Optional[int] = None,
+        is_completed: Optional[bool] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+    ) -> Page[OrderResponse]:
+        orders = await self.order_repo.get_all(
+            limit + 1,
+            decode_cursor(cursor),
+            table_id=table_id,
+            is_completed=is_completed,
+            created_from=created_from,
+            created_to=created_to,
+        )
+        return build_page(orders, limit, OrderResponse)
+
+    async def get_by_id(self, order_id: int) -> OrderResponse:
+        order = await self.order_repo.get_by_id(order_id)
         if not order:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Order not found")
+        return OrderResponse.model_validate(order)
+
+    async def get_active_orders(self) -> List[OrderResponse]:
+        orders = await self.order_repo.get_active_orders()
+        if not orders:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No active orders")
+        return [OrderResponse.model_validate(o) for o in orders]
+
+    async def get_prep_board(self) -> List[PrepBoardDish]:
+        if not prep_board.active:
+            board = [PrepDish(*row) for row in await self.order_repo.get_prep_board()]
+        else:
+            board = prep_board.get()
+            if board is None:
+                token = prep_board.begin_load()
+                board = prep_board.finish_load(token, await self.order_repo.get_open_items())
+        names = await cached_menu_async(("dish_names",), self.dish_repo.get_names)
+        return _prep_board(board, names)
+
+    async def get_active_snapshot(self) -> str:
+        # JSON-масив активних замовлень для події snapshot; порожній масив - теж стан, а не 404
+        orders = await self.order_repo.get_active_orders_snapshot()
+        return _snapshot_json(orders)
+
+    async def get_orders_by_period(self, start_date: date, end_date: date) -> List[OrderResponse]:
+        start_datetime, end_datetime = _period_bounds(start_date, end_date)
+
+        orders = await self.order_repo.get_orders_by_period(
+            start=start_datetime,
+            end=end_datetime
+        )
+        if not orders:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Orders not found")
+        return [OrderResponse.model_validate(o) for o in orders]
 
-        now = datetime.utcnow().date()
+    async def get_orders_summary_by_period(
+        self, start_date: date, end_date: date, bucket: Optional[SummaryBucket] = None
+    ) -> OrderPeriodSummary:
+        start_datetime, end_datetime = _period_bounds(start_date, end_date)
+        rows = await self.order_repo.get_period_summary(start_datetime, end_datetime, bucket)
+        return _build_period_summary(rows, start_datetime, end_datetime, bucket)
 
-        order_items = self.order_item_repo.get_by_order_id(order_id)
-        if not order_items:
-            return 0.0
+    async def create(self, order_create: OrderCreate) -> OrderResponse:
+        dishes = await self.dish_repo.get_many(item.dish_id for item in order_create.items)
+        for item in order_create.items:
+            if item.dish_id not in dishes:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Dish id {item.dish_id} not found")
+            if item.quantity <= 0:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Quantity must be positive")
 
-        dish_totals = {item.dish_id: (item.price_at_order, item.quantity) for item in order_items}
+        index = await promotion_index_async(self.promotion_repo)
+        now = datetime.utcnow()
+        discount_rates = {dish_id: discount_rate(index, dish_id, now) for dish_id in dishes}
+        prices = {dish_id: dish.price for dish_id, dish in dishes.items()}
 
-        active_promotions = self.promotion_repo.get_active_promotion()
+        # стіл і його зайнятість перевіряє база (FK і uq_orders_table_id_active) під час вставки
+        try:
+            order = await self.order_repo.create(order_create, prices, discount_rates)
+        except IntegrityError as e:
+            raise_table_error(e, order_create.table_id)
 
-        total_without_discount = sum(price * quantity for price, quantity in dish_totals.values())
+        return OrderResponse.model_validate(order)
 
-        total_discount = 0.0
-        for promo in active_promotions:
-            for dish in promo.dishes:
-                dish_id = dish.id
-                if dish_id in dish_totals:
-                    price, quantity = dish_totals[dish_id]
-                    discount_amount = price * quantity * (promo.discount_percent / 100)
-                    total_discount += discount_amount
+    async def create_bulk(self, bulk: OrderBulkCreate) -> OrderBulkResponse:
+        _check_bulk_size(bulk.orders)
+        dishes = await self.dish_repo.get_many({item.dish_id for order in bulk.orders for item in order.items})
+        tables = await self.order_repo.get_table_occupancy({order.table_id for order in bulk.orders})
 
-        total = total_without_discount - total_discount
-        return max(total, 0.0)
+        results: List[OrderBulkResult | None] = [None] * len(bulk.orders)
+        accepted: List[int] = []
+        claimed: set[int] = set()
+        for index, order in enumerate(bulk.orders):
+            rejection = _bulk_rejection(order, dishes, tables, claimed)
+            if rejection:
+                results[index] = OrderBulkResult(index=index, status="rejected", detail=rejection)
+                continue
+            accepted.append(index)
+            if not order.is_completed:
+                claimed.add(order.table_id)
 
+        index = await promotion_index_async(self.promotion_repo)
+        now = datetime.utcnow()
+        discount_rates = {dish_id: discount_rate(index, dish_id, now) for dish_id in dishes}
+        prices = {dish_id: dish.price for dish_id, dish in dishes.items()}
+        created = await self.order_repo.create_many([bulk.orders[i] for i in accepted], prices, discount_rates)
+        for i, order in zip(accepted, created):
+            if order is None:
+                detail = f"Table {bulk.orders[i].table_id} already has an active order."
+                results[i] = OrderBulkResult(index=i, status="rejected", detail=detail)
+            else:
+                results[i] = OrderBulkResult(index=i, status="created", order_id=order.id)
+        return _bulk_response(results)
 
-OrderCoreDep = Annotated[OrderService, Depends(OrderService)]
+    async def update(self, order_id: int, order_update: OrderUpdate) -> OrderResponse:
+        order = await self.order_repo.get_by_id(order_id)
+        if not order:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Order not found")
+        # стіл, за яким замовлення буде після зміни: при повторному відкритті table_id у запиті не передають
+        table_id = order_update.table_id or order.table_id
+        try:
+            order = await self.order_repo.update(order_id, order_update)
+        except IntegrityError as e:
+            raise_table_error(e, table_id)
+        return OrderResponse.model_validate(order)
+
+    async def complete_order(self, order_id: int) -> OrderResponse:
+        order = await self.order_repo.get_by_id(order_id)
+        if not order:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Order not found")
+        if order.is_completed:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Order already completed")
+        competed_order = await self.order_repo.complete_order(order_id)
+        return OrderResponse.model_validate(competed_order)
+
+    async def delete(self, order_id: int) -> bool:
+        order = await self.order_repo.get_by_id(order_id)
+        if not order:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Order not found")
+        if not order.is_completed:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Order is not completed")
+        await self.order_repo.delete(order_id)
+        return True
+
+    async def get_totals(self, order_ids: Optional[List[int]] = None) -> List[OrderTotal]:
+        # збережені суми; без order_ids - усі активні замовлення
+        _check_total_ids(order_ids)
+        rows = await self.order_repo.get_totals(order_ids)
+        return _order_totals(rows)
+
+    async def check_totals(self, repair: bool = False) -> OrderTotalsCheck:
+        # перераховує збережені суми з order_items одним запитом; repair - одразу записує правильні
+        if repair:
+            return _totals_check(await self.order_repo.repair_totals(), repaired=True)
+        return _totals_check(await self.order_repo.get_inconsistent_totals(), repaired=False)
+
+    async def calculate_total(self, order_id: int) -> float:
+        total = await self.order_repo.get_total(order_id)
+        if total is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Order not found")
+        return total
+
+
+AsyncOrderCoreDep = Annotated[AsyncOrderService, Depends(AsyncOrderService)]
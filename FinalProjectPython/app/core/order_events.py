@@ -0,0 +1,170 @@
+import asyncio
+import json
+import threading
+import uuid
+from collections import deque
+from typing import AsyncIterator, Awaitable, Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.db.notify import notify_on_commit
+from app.models.models import Order, OrderItem
+
+ORDER_EVENTS_CHANNEL = "cafe_order_events"
+ORDER_EVENTS_BUFFER = 1000  # подій, з яких можна відновитися без нового знімка
+SUBSCRIBER_QUEUE_SIZE = 1000  # клієнт, що відстав на стільки подій, відключається і перепідключається зі знімком
+KEEPALIVE_INTERVAL = 15.0  # секунд між коментарями, що не дають проксі закрити тихе з'єднання
+RECONNECT_RETRY_MS = 2000
+
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+def order_data(order: Order) -> dict:
+    return {
+        "id": order.id,
+        "table_id": order.table_id,
+        "created_at": order.created_at.isoformat(),
+        "is_completed": order.is_completed,
+        "subtotal": order.subtotal,
+        "discount": order.discount,
+        "total": order.total,
+    }
+
+
+def item_data(item: OrderItem) -> dict:
+    # стан позиції повністю, а не різниця: клієнт просто замінює позицію з цим id
+    return {
+        "id": item.id,
+        "order_id": item.order_id,
+        "dish_id": item.dish_id,
+        "quantity": item.quantity,
+        "price_at_order": item.price_at_order,
+        "discount": item.discount,
+        "created_at": item.created_at.isoformat(),
+    }
+
+
+def publish_order_event(db: Session | AsyncSession, event_type: str, data: dict) -> None:
+    # подія йде NOTIFY в транзакції запису: її побачать лише після коміту, а при rollback її не буде
+    notify_on_commit(db, ORDER_EVENTS_CHANNEL, f"{event_type} {json.dumps(data)}")
+
+
+def _sse(event_id: str, event_type: str, data: str) -> str:
+    return f"id: {event_id}\nevent: {event_type}\ndata: {data}\n\n"
+
+
+class Subscription:
+    # черга одного клієнта в його event loop; None у черзі - потік треба закрити
+    def __init__(self, loop: asyncio.AbstractEventLoop, max_pending: int):
+        self._loop = loop
+        self._max_pending = max_pending
+        self._closed = False
+        self.queue: asyncio.Queue[str | None] = asyncio.Queue()
+
+    def push(self, chunk: str | None) -> None:
+        # викликається з потоку слухача
+        self._loop.call_soon_threadsafe(self._put, chunk)
+
+    def _put(self, chunk: str | None) -> None:
+        if self._closed:
+            return
+        if chunk is None or self.queue.qsize() >= self._max_pending:
+            self._closed = True
+            chunk = None
+        self.queue.put_nowait(chunk)
+
+
+class OrderEventHub:
+    # події замовлень для SSE-клієнтів цього воркера. Номер події - порядок, у якому NOTIFY прийшли від
+    # primary, тобто порядок комітів; курсор "epoch:seq" дійсний лише в цьому воркері, доки слухач
+    # не перепідключався (epoch), і лише поки подія ще в буфері - інакше клієнт отримує новий знімок
+    def __init__(self, buffer_size: int, queue_size: int):
+        self.queue_size = queue_size
+        self._lock = threading.Lock()
+        self._buffer: deque[tuple[int, str]] = deque(maxlen=buffer_size)
+        self._subscribers: set[Subscription] = set()
+        self._epoch = uuid.uuid4().hex[:12]
+        self._seq = 0
+        self._snapshot: tuple[str, str] | None = None
+
+    def dispatch(self, payload: str) -> None:
+        event_type, _, data = payload.partition(" ")
+        with self._lock:
+            self._seq += 1
+            chunk = _sse(f"{self._epoch}:{self._seq}", event_type, data)
+            self._buffer.append((self._seq, chunk))
+            subscribers = list(self._subscribers)
+        # серіалізовано один раз, кожному клієнту - той самий рядок
+        for subscription in subscribers:
+            subscription.push(chunk)
+
+    def reset(self) -> None:
+        # слухач (пере)підключився або втратив з'єднання: сповіщення могли загубитися, тож старі курсори
+        # недійсні, а відкриті потоки закриваються - клієнти перепідключаться і візьмуть новий знімок
+        with self._lock:
+            self._epoch = uuid.uuid4().hex[:12]
+            self._seq = 0
+            self._buffer.clear()
+            self._snapshot = None
+            subscribers = list(self._subscribers)
+            self._subscribers.clear()
+        for subscription in subscribers:
+            subscription.push(None)
+
+    def _backlog(self, cursor: str | None) -> list[str] | None:
+        epoch, _, seq = (cursor or "").partition(":")
+        if epoch != self._epoch or not seq.isdigit() or int(seq) > self._seq:
+            return None
+        oldest = self._buffer[0][0] if self._buffer else self._seq + 1
+        if int(seq) < oldest - 1:
+            return None
+        return [chunk for event_seq, chunk in self._buffer if event_seq > int(seq)]
+
+    async def open_stream(self, cursor: str | None, load_snapshot: Callable[[], Awaitable[str]]) -> AsyncIterator[str]:
+        # підписка - до читання знімка: події, що прийдуть під час читання, не загубляться,
+        # а ті, що вже є у знімку, клієнт застосує ще раз без наслідків (позиції й замовлення замінюються цілком)
+        subscription = Subscription(asyncio.get_running_loop(), self.queue_size)
+        with self._lock:
+            self._subscribers.add(subscription)
+            backlog = self._backlog(cursor)
+            position = f"{self._epoch}:{self._seq}"
+            snapshot = self._snapshot
+        try:
+            if backlog is None:
+                # знімок, прочитаний на тій самій позиції, підходить усім клієнтам, що підключаються після нього:
+                # хвиля перепідключень після reset() читає базу один раз
+                if snapshot is None or snapshot[0] != position:
+                    snapshot = (position, await load_snapshot())
+                    with self._lock:
+                        if position.startswith(self._epoch + ":"):
+                            self._snapshot = snapshot
+                backlog = [_sse(position, "snapshot", snapshot[1])]
+        except BaseException:
+            self._unsubscribe(subscription)
+            raise
+        return self._stream(subscription, backlog)
+
+    def _unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    async def _stream(self, subscription: Subscription, backlog: list[str]) -> AsyncIterator[str]:
+        try:
+            yield f"retry: {RECONNECT_RETRY_MS}\n\n"
+            for chunk in backlog:
+                yield chunk
+            while True:
+                try:
+                    chunk = await asyncio.wait_for(subscription.queue.get(), KEEPALIVE_INTERVAL)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                if chunk is None:
+                    return
+                yield chunk
+        finally:
+            self._unsubscribe(subscription)
+
+
+order_event_hub = OrderEventHub(buffer_size=ORDER_EVENTS_BUFFER, queue_size=SUBSCRIBER_QUEUE_SIZE)
@@ -1,23 +1,44 @@
-from typing import List
+from datetime import datetime
+from typing import List, Optional
 from fastapi import HTTPException, status
 from fastapi.params import Depends
 from typing import Annotated
 
-from app.crud.order_item import OrderItemRepoDep
-from app.crud.dish import DishRepoDep
-from app.crud.order import OrderRepoDep
+from app.crud.order_item import OrderItemRepoDep, AsyncOrderItemRepoDep
+from app.crud.dish import DishRepoDep, AsyncDishRepoDep
+from app.crud.order import OrderRepoDep, AsyncOrderRepoDep
+from app.crud.promotion import PromotionRepoDep, AsyncPromotionRepoDep
+from app.core.pricing import discount_rate, promotion_index, promotion_index_async
 from app.schemas.order_item import OrderItemCreate, OrderItemUpdate, OrderItemResponse
+from app.core.pagination import build_page, decode_cursor
+from app.schemas.page import Page
 
 
 class OrderItemService:
-    def __init__(self, order_item_repo: OrderItemRepoDep, dish_repo: DishRepoDep, order_repo: OrderRepoDep):
+    def __init__(
+        self,
+        order_item_repo: OrderItemRepoDep,
+        dish_repo: DishRepoDep,
+        order_repo: OrderRepoDep,
+        promotion_repo: PromotionRepoDep,
+    ):
         self.order_item_repo = order_item_repo
         self.dish_repo = dish_repo
         self.order_repo = order_repo
+        self.promotion_repo = promotion_repo
 
-    def get_all(self) -> List[OrderItemResponse]:
-        items = self.order_item_repo.get_all()
-        return [OrderItemResponse.model_validate(i) for i in items]
+    def _discount_rate(self, dish_id: int) -> float:
+        return discount_rate(promotion_index(self.promotion_repo), dish_id, datetime.utcnow())
+
+    def get_all(
+        self,
+        limit: int,
+        cursor: Optional[str] = None,
+        order_id: Optional[int] = None,
+        dish_id: Optional[int] = None,
+    ) -> Page[OrderItemResponse]:
+        items = self.order_item_repo.get_all(limit + 1, decode_cursor(cursor), order_id=order_id, dish_id=dish_id)
+        return build_page(items, limit, OrderItemResponse)
 
     def get_by_id(self, order_item_id: int) -> OrderItemResponse:
         item = self.order_item_repo.get_by_id(order_item_id)
@@ -45,7 +66,8 @@ class OrderItemService:
                 detail="Dish not found"
             )
 
-        order = self.order_repo.get_by_id(order_item_create.order_id)
+        # під блокуванням рядка: закриття замовлення не проскочить між цією перевіркою і записом позиції
+        order = self.order_repo.get_for_update(order_item_create.order_id)
         if not order:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -57,19 +79,8 @@ class OrderItemService:
                 detail="Cannot add items to completed order"
             )
 
-        existing_items = self.order_item_repo.get_by_order_id(order_item_create.order_id)
-        for item in existing_items:
-            if item.dish_id == order_item_create.dish_id:
-                updated_quantity = item.quantity + order_item_create.quantity
-                updated_item = self.order_item_repo.update(
-                    item.id,
-                    OrderItemUpdate(quantity=updated_quantity))
-                return OrderItemResponse.model_validate(updated_item)
-
-        order_item_data = order_item_create.model_dump()
-        order_item_data["price_at_order"] = dish.price
-        created_item = self.order_item_repo.create(OrderItemCreate(**order_item_data))
-        return OrderItemResponse.model_validate(created_item)
+        item = self.order_item_repo.add(order_item_create, dish.price, self._discount_rate(dish.id))
+        return OrderItemResponse.model_validate(item)
 
     def update(self, order_item_id: int, order_item_update: OrderItemUpdate) -> OrderItemResponse:
         order_item = self.order_item_repo.get_by_id(order_item_id)
@@ -79,24 +90,130 @@ class OrderItemService:
         if order_item_update.quantity is not None and order_item_update.quantity < 1:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Quantity must be at least 1")
 
-        order = self.order_repo.get_by_id(order_item.order_id)
+        order = self.order_repo.get_for_update(order_item.order_id)
         if order.is_completed:
             raise HTTPException(status_code=400, detail="Not allowed to update order items for completed order")
 
         update_data = order_item_update.model_dump(exclude_unset=True)
 
-        updated_item = self.order_item_repo.update(order_item_id, order_item_update.__class__(**update_data))
+        updated_item = self.order_item_repo.update(
+            order_item_id,
+            order_item_update.__class__(**update_data),
+            self._discount_rate(order_item.dish_id),
+        )
         return OrderItemResponse.model_validate(updated_item)
 
     def delete(self, order_item_id: int) -> bool:
         order_item = self.order_item_repo.get_by_id(order_item_id)
         if not order_item:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="OrderItem not found")
-        order = self.order_repo.get_by_id(order_item.order_id)
+        order = self.order_repo.get_for_update(order_item.order_id)
         if order.is_completed:
             raise HTTPException(status_code=400, detail="Not allowed to delete order items for completed order")
 
         return self.order_item_repo.delete(order_item_id)
 
 
-OrderItemCoreDep = Annotated[OrderItemService, Depends(OrderItemService)]
\ No newline at end of file
+OrderItemCoreDep = Annotated[OrderItemService, Depends(OrderItemService)]
+
+
+class AsyncOrderItemService:
+    def __init__(
+        self,
+        order_item_repo: AsyncOrderItemRepoDep,
+        dish_repo: AsyncDishRepoDep,
+        order_repo: AsyncOrderRepoDep,
+        promotion_repo: AsyncPromotionRepoDep,
+    ):
+        self.order_item_repo = order_item_repo
+        self.dish_repo = dish_repo
+        self.order_repo = order_repo
+        self.promotion_repo = promotion_repo
+
+    async def _discount_rate(self, dish_id: int) -> float:
+        return discount_rate(await promotion_index_async(self.promotion_repo), dish_id, datetime.utcnow())
+
+    async def get_all(
+        self,
+        limit: int,
+        cursor: Optional[str] = None,
+        order_id: Optional[int] = None,
+        dish_id: Optional[int] = None,
+    ) -> Page[OrderItemResponse]:
+        items = await self.order_item_repo.get_all(limit + 1, decode_cursor(cursor), order_id=order_id, dish_id=dish_id)
+        return build_page(items, limit, OrderItemResponse)
+
+    async def get_by_id(self, order_item_id: int) -> OrderItemResponse:
+        item = await self.order_item_repo.get_by_id(order_item_id)
+        if not item:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="OrderItem not found")
+        return OrderItemResponse.model_validate(item)
+
+    async def get_by_order_id(self, order_id: int) -> List[OrderItemResponse]:
+        items = await self.order_item_repo.get_by_order_id(order_id)
+        if not items:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Order items not found")
+        return [OrderItemResponse.model_validate(i) for i in items]
+
+    async def create(self, order_item_create: OrderItemCreate) -> OrderItemResponse:
+        if order_item_create.quantity < 1:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Quantity must be at least 1"
+            )
+
+        dish = await self.dish_repo.get_by_id(order_item_create.dish_id)
+        if not dish:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Dish not found"
+            )
+
+        order = await self.order_repo.get_for_update(order_item_create.order_id)
+        if not order:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Order not found"
+            )
+        if order.is_completed:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Cannot add items to completed order"
+            )
+
+        item = await self.order_item_repo.add(order_item_create, dish.price, await self._discount_rate(dish.id))
+        return OrderItemResponse.model_validate(item)
+
+    async def update(self, order_item_id: int, order_item_update: OrderItemUpdate) -> OrderItemResponse:
+        order_item = await self.order_item_repo.get_by_id(order_item_id)
+        if not order_item:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="OrderItem not found")
+
+        if order_item_update.quantity is not None and order_item_update.quantity < 1:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Quantity must be at least 1")
+
+        order = await self.order_repo.get_for_update(order_item.order_id)
+        if order.is_completed:
+            raise HTTPException(status_code=400, detail="Not allowed to update order items for completed order")
+
+        update_data = order_item_update.model_dump(exclude_unset=True)
+
+        updated_item = await self.order_item_repo.update(
+            order_item_id,
+            order_item_update.__class__(**update_data),
+            await self._discount_rate(order_item.dish_id),
+        )
+        return OrderItemResponse.model_validate(updated_item)
+
+    async def delete(self, order_item_id: int) -> bool:
+        order_item = await self.order_item_repo.get_by_id(order_item_id)
+        if not order_item:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="OrderItem not found")
+        order = await self.order_repo.get_for_update(order_item.order_id)
+        if order.is_completed:
+            raise HTTPException(status_code=400, detail="Not allowed to delete order items for completed order")
+
+        return await self.order_item_repo.delete(order_item_id)
+
+
+AsyncOrderItemCoreDep = Annotated[AsyncOrderItemService, Depends(AsyncOrderItemService)]
\ No newline at end of file
@@ -0,0 +1,33 @@
+import base64
+from typing import Optional, Sequence
+
+from fastapi import HTTPException, status
+from pydantic import BaseModel
+
+from app.schemas.page import Page
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+def encode_cursor(last_id: int) -> str:
+    return base64.urlsafe_b64encode(str(last_id).encode()).decode()
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[int]:
+    if cursor is None:
+        return None
+    try:
+        return int(base64.urlsafe_b64decode(cursor.encode()).decode())
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def build_page(rows: Sequence, limit: int, schema: type[BaseModel]) -> Page:
+    # репозиторій повертає limit + 1 рядків: зайвий рядок означає, що є наступна сторінка
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    return Page[schema](
+        items=[schema.model_validate(row) for row in rows],
+        next_cursor=encode_cursor(rows[-1].id) if has_more else None,
+    )
@@ -0,0 +1,168 @@
+import json
+import threading
+from datetime import datetime
+from typing import Iterable, NamedTuple
+
+from sqlalchemy import Row
+
+
+class PrepItem(NamedTuple):
+    order_id: int
+    dish_id: int
+    quantity: int
+    created_at: datetime
+
+
+class PrepDish(NamedTuple):
+    dish_id: int
+    quantity: int
+    order_count: int
+    oldest_item_at: datetime
+
+
+class _PrepState:
+    # позиції відкритих замовлень і суми по стравах. Події несуть повний стан позиції, тож повторне
+    # застосування події, вже врахованої у завантажених рядках, нічого не змінює
+    def __init__(self, rows: Iterable[Row]):
+        self.orders: dict[int, set[int]] = {}
+        self.items: dict[int, PrepItem] = {}
+        self.dishes: dict[int, dict[int, PrepItem]] = {}
+        self.quantities: dict[int, int] = {}
+        self.oldest: dict[int, datetime] = {}
+        self.stale = False
+        for row in rows:
+            self.orders.setdefault(row.order_id, set())
+            if row.item_id is not None:
+                self.set_item(row.item_id, PrepItem(row.order_id, row.dish_id, row.quantity, row.created_at))
+
+    def set_item(self, item_id: int, item: PrepItem) -> None:
+        if item.order_id not in self.orders:
+            return
+        self.remove_item(item_id)
+        self.items[item_id] = item
+        self.orders[item.order_id].add(item_id)
+        self.dishes.setdefault(item.dish_id, {})[item_id] = item
+        self.quantities[item.dish_id] = self.quantities.get(item.dish_id, 0) + item.quantity
+        if item.dish_id not in self.oldest or item.created_at < self.oldest[item.dish_id]:
+            self.oldest[item.dish_id] = item.created_at
+
+    def remove_item(self, item_id: int) -> None:
+        item = self.items.pop(item_id, None)
+        if item is None:
+            return
+        self.orders[item.order_id].discard(item_id)
+        dish_items = self.dishes[item.dish_id]
+        del dish_items[item_id]
+        if not dish_items:
+            del self.dishes[item.dish_id], self.quantities[item.dish_id], self.oldest[item.dish_id]
+            return
+        self.quantities[item.dish_id] -= item.quantity
+        if item.created_at == self.oldest[item.dish_id]:
+            # перераховуємо лише для однієї страви і лише коли пішла її найстаріша позиція
+            self.oldest[item.dish_id] = min(i.created_at for i in dish_items.values())
+
+    def remove_order(self, order_id: int) -> None:
+        for item_id in list(self.orders.get(order_id, ())):
+            self.remove_item(item_id)
+        self.orders.pop(order_id, None)
+
+    def apply(self, event_type: str, data: dict) -> None:
+        if event_type == "order_created" and not data["is_completed"]:
+            self.orders.setdefault(data["id"], set())
+        elif event_type in ("order_completed", "order_deleted"):
+            self.remove_order(data["id"])
+        elif event_type == "order_updated":
+            if data["is_completed"]:
+                self.remove_order(data["id"])
+            elif data["id"] not in self.orders:
+                # замовлення знову відкрили: його позицій у пам'яті немає, стан треба перечитати
+                self.stale = True
+        elif event_type in ("item_added", "item_updated"):
+            item = PrepItem(data["order_id"], data["dish_id"], data["quantity"], datetime.fromisoformat(data["created_at"]))
+            self.set_item(data["id"], item)
+        elif event_type == "item_removed":
+            self.remove_item(data["id"])
+
+    def view(self) -> list[PrepDish]:
+        # O(страв), а не O(позицій): суми й найстаріші позиції вже пораховані
+        board = [
+            PrepDish(dish_id, self.quantities[dish_id], len(self.dishes[dish_id]), self.oldest[dish_id])
+            for dish_id in self.dishes
+        ]
+        board.sort(key=lambda dish: (dish.oldest_item_at, dish.dish_id))
+        return board
+
+
+class PrepBoard:
+    # дошка кухні: скільки кожної страви ще в роботі у відкритих замовленнях. Стан воркера оновлюється
+    # подіями замовлень (ORDER_EVENTS_CHANNEL) від усіх воркерів; доки слухача немає, дошку
+    # щоразу рахує база, бо події могли загубитися
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._active = False
+        self._generation = 0
+        self._state: _PrepState | None = None
+        self._view: list[PrepDish] | None = None
+        self._recordings: list[list[tuple[str, dict]]] = []
+
+    @property
+    def active(self) -> bool:
+        return self._active
+
+    def get(self) -> list[PrepDish] | None:
+        with self._lock:
+            if self._state is None:
+                return None
+            if self._view is None:
+                self._view = self._state.view()
+            return self._view
+
+    def begin_load(self) -> tuple[int, list[tuple[str, dict]]]:
+        # події, що прийдуть, поки читаються рядки, запишуться і застосуються поверх них у finish_load
+        with self._lock:
+            recording: list[tuple[str, dict]] = []
+            self._recordings.append(recording)
+            return self._generation, recording
+
+    def finish_load(self, token: tuple[int, list[tuple[str, dict]]], rows: Iterable[Row]) -> list[PrepDish]:
+        generation, recording = token
+        state = _PrepState(rows)
+        with self._lock:
+            self._recordings.remove(recording)
+            for event_type, data in recording:
+                state.apply(event_type, data)
+            view = state.view()
+            if self._active and generation == self._generation and not state.stale:
+                self._state, self._view = state, view
+            return view
+
+    def apply(self, payload: str) -> None:
+        # викликається з потоку слухача для кожної події замовлень
+        with self._lock:
+            if self._state is None and not self._recordings:
+                return
+            event_type, _, data = payload.partition(" ")
+            event = (event_type, json.loads(data))
+            for recording in self._recordings:
+                recording.append(event)
+            if self._state is not None:
+                self._state.apply(*event)
+                self._view = None
+                if self._state.stale:
+                    self._state = None
+
+    def _reset(self, active: bool) -> None:
+        with self._lock:
+            self._active = active
+            self._generation += 1
+            self._state = None
+            self._view = None
+
+    def activate(self) -> None:
+        self._reset(active=True)
+
+    def deactivate(self) -> None:
+        self._reset(active=False)
+
+
+prep_board = PrepBoard()
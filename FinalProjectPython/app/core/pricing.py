@@ -0,0 +1,197 @@
+import threading
+import time as clock
+from datetime import date, datetime, time, timedelta
+from typing import Iterable, Iterator, NamedTuple, Optional
+
+from app.config import settings
+
+# end_time входить у вікно акції, тож вона перестає діяти через найменший крок часу після нього
+END_TIME_RESOLUTION = timedelta(microseconds=1)
+
+
+def _window_active(window, now: datetime) -> bool:
+    # акція діє в дати valid_from..valid_to включно і щодня в години start_time..end_time включно
+    today, current_time = now.date(), now.time()
+    return (
+        window.valid_from <= today <= window.valid_to
+        and (window.start_time is None or window.start_time <= current_time)
+        and (window.end_time is None or window.end_time >= current_time)
+    )
+
+
+class PromotionRule(NamedTuple):
+    promotion_id: int
+    discount_percent: int
+    valid_from: date
+    valid_to: date
+    start_time: Optional[time]
+    end_time: Optional[time]
+
+    def is_active(self, now: datetime) -> bool:
+        return _window_active(self, now)
+
+
+class PromotionWindow(NamedTuple):
+    promotion_id: int
+    valid_from: date
+    valid_to: date
+    start_time: Optional[time]
+    end_time: Optional[time]
+
+    def is_active(self, now: datetime) -> bool:
+        return _window_active(self, now)
+
+    def boundaries(self, now: datetime) -> Iterator[datetime]:
+        # моменти, у які стан акції може змінитися: початок дня, start_time і момент одразу після end_time
+        # сьогодні й завтра, а також перший день дії й день після останнього; найближча справжня зміна - серед них
+        today = now.date()
+        for day in (today, today + timedelta(days=1), self.valid_from, self.valid_to + timedelta(days=1)):
+            yield datetime.combine(day, time.min)
+            if self.start_time is not None:
+                yield datetime.combine(day, self.start_time)
+            if self.end_time is not None:
+                yield datetime.combine(day, self.end_time) + END_TIME_RESOLUTION
+
+
+PromotionIndex = dict[int, tuple[PromotionRule, ...]]
+
+
+class PricingEngine:
+    # індекс dish_id -> акції на страву; будується одним запитом і живе в пам'яті воркера,
+    # тож знижка нової позиції замовлення рахується без запитів за акціями
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._index: PromotionIndex | None = None
+        self._loaded_at = 0.0
+        self._version = 0
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def current(self) -> PromotionIndex | None:
+        # None - індекс треба перебудувати; ttl страхує від змін, зроблених іншими воркерами
+        with self._lock:
+            if self._index is None or clock.monotonic() - self._loaded_at > self.ttl:
+                return None
+            return self._index
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._version += 1
+            self._index = None
+
+    def load(self, rows: Iterable, version: int) -> PromotionIndex:
+        # rows - (dish_id, promotion_id, discount_percent, valid_from, valid_to, start_time, end_time);
+        # version - значення self.version до читання rows
+        grouped: dict[int, list[PromotionRule]] = {}
+        for dish_id, *rule in rows:
+            grouped.setdefault(dish_id, []).append(PromotionRule(*rule))
+        index = {dish_id: tuple(rules) for dish_id, rules in grouped.items()}
+        with self._lock:
+            # якщо акції змінилися, поки ми читали, індекс годиться лише для цього запиту
+            if version == self._version:
+                self._index = index
+                self._loaded_at = clock.monotonic()
+        return index
+
+
+class PromotionSchedule:
+    # вікна дії всіх акцій, що ще можуть діяти: набір активних акцій і момент його наступної зміни
+    # рахуються в пам'яті, тож до цього моменту (або до зміни акцій) база не потрібна
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._windows: tuple[PromotionWindow, ...] | None = None
+        self._loaded_at = 0.0
+        self._version = 0
+        self._active: frozenset[int] = frozenset()
+        self._until = datetime.min
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def active_ids(self, now: datetime) -> frozenset[int] | None:
+        # None - розклад треба перечитати; ttl страхує від змін в обхід API
+        with self._lock:
+            if self._windows is None or clock.monotonic() - self._loaded_at > self.ttl:
+                return None
+            if now >= self._until:
+                self._active, self._until = _active_until(self._windows, now)
+            return self._active
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._version += 1
+            self._windows = None
+
+    def load(self, rows: Iterable, version: int, now: datetime) -> frozenset[int]:
+        # rows - (promotion_id, valid_from, valid_to, start_time, end_time); version - self.version до читання rows
+        windows = tuple(PromotionWindow(*row) for row in rows)
+        active, until = _active_until(windows, now)
+        with self._lock:
+            if version == self._version:
+                self._windows = windows
+                self._loaded_at = clock.monotonic()
+                self._active, self._until = active, until
+        return active
+
+
+def _active_until(windows: tuple[PromotionWindow, ...], now: datetime) -> tuple[frozenset[int], datetime]:
+    active = frozenset(window.promotion_id for window in windows if window.is_active(now))
+    until = min(
+        (boundary for window in windows for boundary in window.boundaries(now) if boundary > now),
+        default=datetime.max,
+    )
+    return active, until
+
+
+def discount_percent(index: PromotionIndex, dish_id: int, now: datetime) -> int:
+    # відсоток, який знімають усі активні зараз акції на страву (знижки акцій додаються)
+    return sum(rule.discount_percent for rule in index.get(dish_id, ()) if rule.is_active(now))
+
+
+def discount_rate(index: PromotionIndex, dish_id: int, now: datetime) -> float:
+    return discount_percent(index, dish_id, now) / 100
+
+
+def active_promotion_ids(index: PromotionIndex, now: datetime) -> frozenset[int]:
+    return frozenset(rule.promotion_id for rules in index.values() for rule in rules if rule.is_active(now))
+
+
+pricing_engine = PricingEngine(ttl=settings.pricing_index_ttl)
+promotion_schedule = PromotionSchedule(ttl=settings.pricing_index_ttl)
+
+
+def promotion_index(promotion_repo) -> PromotionIndex:
+    index = pricing_engine.current()
+    if index is None:
+        version = pricing_engine.version
+        index = pricing_engine.load(promotion_repo.get_pricing_rules(), version)
+    return index
+
+
+async def promotion_index_async(promotion_repo) -> PromotionIndex:
+    index = pricing_engine.current()
+    if index is None:
+        version = pricing_engine.version
+        index = pricing_engine.load(await promotion_repo.get_pricing_rules(), version)
+    return index
+
+
+def current_promotion_ids(promotion_repo, now: datetime) -> frozenset[int]:
+    active = promotion_schedule.active_ids(now)
+    if active is None:
+        version = promotion_schedule.version
+        active = promotion_schedule.load(promotion_repo.get_schedule(now.date()), version, now)
+    return active
+
+
+async def current_promotion_ids_async(promotion_repo, now: datetime) -> frozenset[int]:
+    active = promotion_schedule.active_ids(now)
+    if active is None:
+        version = promotion_schedule.version
+        active = promotion_schedule.load(await promotion_repo.get_schedule(now.date()), version, now)
+    return active
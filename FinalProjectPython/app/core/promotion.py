@@ -1,11 +1,43 @@
-from typing import List
+import hashlib
+from datetime import datetime
+from typing import List, Optional
 from fastapi import HTTPException, status
 from fastapi.params import Depends
 from typing import Annotated
 
-from app.crud.promotion import PromotionRepoDep
-from app.crud.dish import DishRepoDep
+from app.crud.promotion import PromotionRepoDep, AsyncPromotionRepoDep
+from app.crud.dish import DishRepoDep, AsyncDishRepoDep
+from app.models.models import Dish
 from app.schemas.promotion import PromotionCreate, PromotionUpdate, PromotionResponse
+from app.core.pagination import build_page, decode_cursor
+from app.core.menu_cache import cached_menu, cached_menu_async
+from app.core.pricing import current_promotion_ids, current_promotion_ids_async
+from app.schemas.page import Page
+
+
+def _promotion_dishes(dish_ids: List[int], dishes: dict[int, Dish]) -> List[Dish]:
+    # dishes - результат dish_repo.get_many(dish_ids): усі страви одним запитом, повтори id не дублюються
+    for dish_id in dish_ids:
+        if dish_id not in dishes:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Dish id {dish_id} does not exist"
+            )
+    return [dishes[dish_id] for dish_id in dict.fromkeys(dish_ids)]
+
+
+def _active_promotions_tag(promotion_ids: frozenset[int]) -> str:
+    # список активних акцій змінюється і з часом, не лише з версією "promotions"
+    ids = ",".join(map(str, sorted(promotion_ids)))
+    return "active." + hashlib.blake2b(ids.encode(), digest_size=8).hexdigest()
+
+
+def active_promotions_tag(promotion_repo: PromotionRepoDep) -> str:
+    return _active_promotions_tag(current_promotion_ids(promotion_repo, datetime.utcnow()))
+
+
+async def async_active_promotions_tag(promotion_repo: AsyncPromotionRepoDep) -> str:
+    return _active_promotions_tag(await current_promotion_ids_async(promotion_repo, datetime.utcnow()))
 
 
 class PromotionService:
@@ -13,9 +45,9 @@ class PromotionService:
         self.promotion_repo = promotion_repo
         self.dish_repo = dish_repo
 
-    def get_all(self) -> List[PromotionResponse]:
-        promotions = self.promotion_repo.get_all()
-        return [PromotionResponse.model_validate(p) for p in promotions]
+    def get_all(self, limit: int, cursor: Optional[str] = None) -> Page[PromotionResponse]:
+        promotions = self.promotion_repo.get_all(limit + 1, decode_cursor(cursor))
+        return build_page(promotions, limit, PromotionResponse)
 
     def get_by_id(self, promotion_id: int) -> PromotionResponse:
         promotion = self.promotion_repo.get_by_id(promotion_id)
@@ -24,10 +56,15 @@ class PromotionService:
         return PromotionResponse.model_validate(promotion)
 
     def get_active_promotion(self) -> List[PromotionResponse]:
-        promotions = self.promotion_repo.get_active_promotion()
-        if not promotions:
+        # набір активних акцій - з розкладу в пам'яті, самі акції - з кешу меню
+        promotion_ids = current_promotion_ids(self.promotion_repo, datetime.utcnow())
+        if not promotion_ids:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Promotion not found")
-        return [PromotionResponse.model_validate(p) for p in promotions]
+
+        def load() -> List[PromotionResponse]:
+            return [PromotionResponse.model_validate(p) for p in self.promotion_repo.get_by_ids(promotion_ids)]
+
+        return cached_menu(("active_promotions", promotion_ids), load)
 
     def create(self, promotion_create: PromotionCreate) -> PromotionResponse:
         if promotion_create.valid_from > promotion_create.valid_to:
@@ -43,14 +80,8 @@ class PromotionService:
                     detail="start_time cannot be after end_time"
                 )
 
-        for dish_id in promotion_create.dish_ids:
-            if not self.dish_repo.get_by_id(dish_id):
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"Dish id {dish_id} does not exist"
-                )
-
-        created = self.promotion_repo.create(promotion_create)
+        dishes = _promotion_dishes(promotion_create.dish_ids, self.dish_repo.get_many(promotion_create.dish_ids))
+        created = self.promotion_repo.create(promotion_create, dishes)
         return PromotionResponse.model_validate(created)
 
     def update(self, promotion_id: int, promotion_update: PromotionUpdate) -> PromotionResponse:
@@ -78,15 +109,13 @@ class PromotionService:
                 )
 
         # Перевірка dish_ids, якщо оновлюються
+        dishes = None
         if promotion_update.dish_ids is not None:
-            for dish_id in promotion_update.dish_ids:
-                if not self.dish_repo.get_by_id(dish_id):
-                    raise HTTPException(
-                        status_code=status.HTTP_400_BAD_REQUEST,
-                        detail=f"Dish id {dish_id} does not exist"
-                    )
-
-        updated = self.promotion_repo.update(promotion_id, promotion_update)
+            dishes = _promotion_dishes(
+                promotion_update.dish_ids, self.dish_repo.get_many(promotion_update.dish_ids)
+            )
+
+        updated = self.promotion_repo.update(promotion_id, promotion_update, dishes)
         if not updated:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -104,3 +133,96 @@ class PromotionService:
 
 
 PromotionCoreDep = Annotated[PromotionService, Depends(PromotionService)]
+
+
+
+class AsyncPromotionService:
+    def __init__(self, promotion_repo: AsyncPromotionRepoDep, dish_repo: AsyncDishRepoDep):
+        self.promotion_repo = promotion_repo
+        self.dish_repo = dish_repo
+
+    async def get_all(self, limit: int, cursor: Optional[str] = None) -> Page[PromotionResponse]:
+        promotions = await self.promotion_repo.get_all(limit + 1, decode_cursor(cursor))
+        return build_page(promotions, limit, PromotionResponse)
+
+    async def get_by_id(self, promotion_id: int) -> PromotionResponse:
+        promotion = await self.promotion_repo.get_by_id(promotion_id)
+        if not promotion:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Promotion not found")
+        return PromotionResponse.model_validate(promotion)
+
+    async def get_active_promotion(self) -> List[PromotionResponse]:
+        # набір активних акцій - з розкладу в пам'яті, самі акції - з кешу меню
+        promotion_ids = await current_promotion_ids_async(self.promotion_repo, datetime.utcnow())
+        if not promotion_ids:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Promotion not found")
+
+        async def load() -> List[PromotionResponse]:
+            return [PromotionResponse.model_validate(p) for p in await self.promotion_repo.get_by_ids(promotion_ids)]
+
+        return await cached_menu_async(("active_promotions", promotion_ids), load)
+
+    async def create(self, promotion_create: PromotionCreate) -> PromotionResponse:
+        if promotion_create.valid_from > promotion_create.valid_to:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="valid_from cannot be after valid_to"
+            )
+
+        if promotion_create.start_time and promotion_create.end_time:
+            if promotion_create.start_time > promotion_create.end_time:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="start_time cannot be after end_time"
+                )
+
+        dishes = _promotion_dishes(promotion_create.dish_ids, await self.dish_repo.get_many(promotion_create.dish_ids))
+        created = await self.promotion_repo.create(promotion_create, dishes)
+        return PromotionResponse.model_validate(created)
+
+    async def update(self, promotion_id: int, promotion_update: PromotionUpdate) -> PromotionResponse:
+        promotion = await self.promotion_repo.get_by_id(promotion_id)
+        if not promotion:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Promotion not found"
+            )
+
+        if promotion_update.valid_from and promotion_update.valid_to:
+            if promotion_update.valid_from > promotion_update.valid_to:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="valid_from cannot be after valid_to"
+                )
+
+        if promotion_update.start_time and promotion_update.end_time:
+            if promotion_update.start_time > promotion_update.end_time:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="start_time cannot be after end_time"
+                )
+
+        dishes = None
+        if promotion_update.dish_ids is not None:
+            dishes = _promotion_dishes(
+                promotion_update.dish_ids, await self.dish_repo.get_many(promotion_update.dish_ids)
+            )
+
+        updated = await self.promotion_repo.update(promotion_id, promotion_update, dishes)
+        if not updated:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Promotion not found after update"
+            )
+
+        return PromotionResponse.model_validate(updated)
+
+    async def delete(self, promotion_id: int) -> bool:
+        promotion = await self.promotion_repo.get_by_id(promotion_id)
+        if not promotion:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Promotion not found")
+        await self.promotion_repo.delete(promotion_id)
+        return True
+
+
+AsyncPromotionCoreDep = Annotated[AsyncPromotionService, Depends(AsyncPromotionService)]
\ No newline at end of file
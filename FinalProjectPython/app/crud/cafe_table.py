@@ -1,31 +1,70 @@
 from fastapi.params import Depends
-from sqlalchemy import select, exists
+from sqlalchemy import select, exists, func, true, Row
 from typing import Annotated
 
-from app.db import SessionContext
-from app.models.models import CafeTable, Order
+from app.db import SessionContext, AsyncSessionContext
+from app.db.routing import reads, writes
+from app.crud.resource_version import touch_resources
+from app.models.models import CafeTable, Order, OrderItem
 from app.schemas.cafe_table import CafeTableCreate, CafeTableUpdate
 
 
+def _floor_stmt():
+    # активне замовлення на стіл щонайбільше одне (uq_orders_table_id_active), тож звичайний LEFT JOIN;
+    # кількість позицій - LATERAL по індексу order_items для знайденого замовлення, сума - збережений total
+    items = (
+        select(func.coalesce(func.sum(OrderItem.quantity), 0).label("item_count"))
+        .where(OrderItem.order_id == Order.id)
+        .lateral()
+    )
+    return (
+        select(
+            CafeTable.id,
+            CafeTable.number,
+            CafeTable.location,
+            Order.id.label("order_id"),
+            Order.created_at.label("opened_at"),
+            items.c.item_count,
+            Order.total,
+        )
+        .outerjoin(Order, (Order.table_id == CafeTable.id) & (Order.is_completed == False))
+        .outerjoin(items, true())
+        .order_by(CafeTable.number)
+    )
+
+
+# будується один раз: на кожен запит лишається тільки виконання
+FLOOR_STMT = _floor_stmt()
+
+
 class CafeTableRepo:
     def __init__(self, db: SessionContext):
         self.db = db
 
-    def get_all(self) -> list[CafeTable]:
+    @reads
+    def get_all(self, limit: int, cursor_id: int | None = None, location: str | None = None) -> list[CafeTable]:
         stmt = select(CafeTable)
+        if cursor_id is not None:
+            stmt = stmt.where(CafeTable.id > cursor_id)
+        if location is not None:
+            stmt = stmt.where(CafeTable.location == location)
+        stmt = stmt.order_by(CafeTable.id).limit(limit)
         result = self.db.execute(stmt)
         return result.scalars().all()
 
+    @reads
     def get_by_id(self, table_id: int) -> CafeTable | None:
         stmt = select(CafeTable).where(CafeTable.id == table_id)
         result = self.db.execute(stmt)
         return result.scalar_one_or_none()
 
+    @reads
     def get_by_number(self, number: int) -> CafeTable | None:
         stmt = select(CafeTable).where(CafeTable.number == number)
         result = self.db.execute(stmt)
         return result.scalar_one_or_none()
 
+    @reads
     def get_tables_by_occupacy(self, occupied: bool) -> list[CafeTable]:
         subquery = select(Order.id).where(
             Order.table_id == CafeTable.id,
@@ -40,6 +79,12 @@ class CafeTableRepo:
         result = self.db.execute(stmt)
         return result.scalars().all()
 
+    @reads
+    def get_floor(self) -> list[Row]:
+        result = self.db.execute(FLOOR_STMT)
+        return result.all()
+
+    @reads
     def is_table_occupied(self, table_id: int) -> bool:
         stmt = select(Order).where(
             Order.table_id == table_id,
@@ -48,30 +93,123 @@ class CafeTableRepo:
         result = self.db.execute(stmt)
         return result.first() is not None  # Повертає True, якщо існує активне замовлення
 
+    @writes
     def create(self, data: CafeTableCreate) -> CafeTable:
         table = CafeTable(**data.model_dump())
         self.db.add(table)
-        self.db.commit()
-        self.db.refresh(table)
+        self.db.flush()
+        touch_resources(self.db, "tables")
         return table
 
+    @writes
     def update(self, table_id: int, data: CafeTableUpdate) -> CafeTable | None:
         table = self.get_by_id(table_id)
         if not table:
             return None
         for key, value in data.model_dump(exclude_unset=True).items():
             setattr(table, key, value)
-        self.db.commit()
-        self.db.refresh(table)
+        self.db.flush()
+        touch_resources(self.db, "tables")
         return table
 
+    @writes
     def delete(self, table_id: int) -> bool:
         table = self.get_by_id(table_id)
         if not table:
             return False
         self.db.delete(table)
-        self.db.commit()
+        self.db.flush()
+        touch_resources(self.db, "tables")
         return True
 
 
 CafeTableRepoDep = Annotated[CafeTableRepo, Depends(CafeTableRepo)]
+
+
+class AsyncCafeTableRepo:
+    def __init__(self, db: AsyncSessionContext):
+        self.db = db
+
+    @reads
+    async def get_all(self, limit: int, cursor_id: int | None = None, location: str | None = None) -> list[CafeTable]:
+        stmt = select(CafeTable)
+        if cursor_id is not None:
+            stmt = stmt.where(CafeTable.id > cursor_id)
+        if location is not None:
+            stmt = stmt.where(CafeTable.location == location)
+        stmt = stmt.order_by(CafeTable.id).limit(limit)
+        result = await self.db.execute(stmt)
+        return result.scalars().all()
+
+    @reads
+    async def get_by_id(self, table_id: int) -> CafeTable | None:
+        stmt = select(CafeTable).where(CafeTable.id == table_id)
+        result = await self.db.execute(stmt)
+        return result.scalar_one_or_none()
+
+    @reads
+    async def get_by_number(self, number: int) -> CafeTable | None:
+        stmt = select(CafeTable).where(CafeTable.number == number)
+        result = await self.db.execute(stmt)
+        return result.scalar_one_or_none()
+
+    @reads
+    async def get_tables_by_occupacy(self, occupied: bool) -> list[CafeTable]:
+        subquery = select(Order.id).where(
+            Order.table_id == CafeTable.id,
+            Order.is_completed == False
+        )
+
+        if occupied:
+            stmt = select(CafeTable).where(exists(subquery))
+        else:
+            stmt = select(CafeTable).where(~exists(subquery))
+
+        result = await self.db.execute(stmt)
+        return result.scalars().all()
+
+    @reads
+    async def get_floor(self) -> list[Row]:
+        result = await self.db.execute(FLOOR_STMT)
+        return result.all()
+
+    @reads
+    async def is_table_occupied(self, table_id: int) -> bool:
+        stmt = select(Order.id).where(
+            Order.table_id == table_id,
+            Order.is_completed == False
+        )
+        result = await self.db.execute(stmt)
+        return result.first() is not None
+
+    @writes
+    async def create(self, data: CafeTableCreate) -> CafeTable:
+        table = CafeTable(**data.model_dump())
+        self.db.add(table)
+        await self.db.flush()
+        touch_resources(self.db, "tables")
+        return table
+
+    @writes
+    async def update(self, table_id: int, data: CafeTableUpdate) -> CafeTable | None:
+        table = await self.get_by_id(table_id)
+        if not table:
+            return None
+        for key, value in data.model_dump(exclude_unset=True).items():
+            setattr(table, key, value)
+        await self.db.flush()
+        touch_resources(self.db, "tables")
+        return table
+
+    @writes
+    async def delete(self, table_id: int) -> bool:
+        table = await self.get_by_id(table_id)
+        if not table:
+            return False
+        await self.db.delete(table)
+        await self.db.flush()
+        touch_resources(self.db, "tables")
+        return True
+
+
+AsyncCafeTableRepoDep = Annotated[AsyncCafeTableRepo, Depends(AsyncCafeTableRepo)]
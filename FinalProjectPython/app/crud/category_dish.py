@@ -1,7 +1,13 @@
 from fastapi.params import Depends
 from sqlalchemy import select, func
 from typing import Annotated
-from app.db import SessionContext
+
+from sqlalchemy.orm import selectinload
+
+from app.db import SessionContext, AsyncSessionContext
+from app.db.routing import reads, writes
+from app.crud.resource_version import touch_resources
+from app.core.menu_cache import publish_menu_change
 from app.models.models import DishCategory, OrderItem
 from app.schemas.category_dish import CategoryCreate, CategoryUpdate
 
@@ -10,49 +16,153 @@ class CategoryRepo:
     def __init__(self, db: SessionContext):
         self.db = db
 
+    @reads
     def get_all(self) -> list[DishCategory]:
         stmt = select(DishCategory)
         result = self.db.execute(stmt)
         return result.scalars().all()
 
+    @reads
+    def get_menu(self) -> list[DishCategory]:
+        stmt = (
+            select(DishCategory)
+            .options(selectinload(DishCategory.dishes))
+            .order_by(DishCategory.id)
+        )
+        result = self.db.execute(stmt)
+        return result.scalars().all()
+
+    @reads
     def get_by_id(self, category_id: int) -> DishCategory | None:
         stmt = select(DishCategory).where(DishCategory.id == category_id)
         result = self.db.execute(stmt)
         return result.scalar_one_or_none()
 
+    @reads
     def get_by_name(self, category_name: str) -> DishCategory | None:
         stmt = select(DishCategory).where(func.lower(DishCategory.name).contains(category_name.lower()))
         result = self.db.execute(stmt)
         return result.scalar_one_or_none()
 
+    @writes
     def create(self, data: CategoryCreate) -> DishCategory:
         category = DishCategory(**data.model_dump())
         self.db.add(category)
-        self.db.commit()
-        self.db.refresh(category)
+        self.db.flush()
+        touch_resources(self.db, "categories")
+        publish_menu_change(self.db)
         return category
 
+    @writes
     def update(self, category_id: int, data: CategoryUpdate) -> DishCategory | None:
         category = self.get_by_id(category_id)
         if not category:
             return None
         for key, value in data.model_dump(exclude_unset=True).items():
             setattr(category, key, value)
-        self.db.commit()
-        self.db.refresh(category)
+        self.db.flush()
+        touch_resources(self.db, "categories")
+        publish_menu_change(self.db)
         return category
 
+    @writes
     def delete(self, category_id: int) -> bool:
         category = self.get_by_id(category_id)
         if not category:
             return False
         self.db.delete(category)
-        self.db.commit()
+        self.db.flush()
+        touch_resources(self.db, "categories", "dishes")
+        publish_menu_change(self.db)
         return True
 
+    @reads
     def has_order_items(self, dish_id: int) -> bool:
-        stmt = select(OrderItem).where(OrderItem.dish_id == dish_id)
+        stmt = select(OrderItem.id).where(OrderItem.dish_id == dish_id).limit(1)
         result = self.db.execute(stmt)
-        return result.scalar_one_or_none() is not None
+        return result.first() is not None
+
+CategoryRepoDep = Annotated[CategoryRepo, Depends(CategoryRepo)]
+
+
+class AsyncCategoryRepo:
+    def __init__(self, db: AsyncSessionContext):
+        self.db = db
+
+    @reads
+    async def get_all(self) -> list[DishCategory]:
+        stmt = select(DishCategory)
+        result = await self.db.execute(stmt)
+        return result.scalars().all()
+
+    @reads
+    async def get_menu(self) -> list[DishCategory]:
+        stmt = (
+            select(DishCategory)
+            .options(selectinload(DishCategory.dishes))
+            .order_by(DishCategory.id)
+        )
+        result = await self.db.execute(stmt)
+        return result.scalars().all()
+
+    @reads
+    async def get_by_id(self, category_id: int) -> DishCategory | None:
+        stmt = select(DishCategory).where(DishCategory.id == category_id)
+        result = await self.db.execute(stmt)
+        return result.scalar_one_or_none()
+
+    @reads
+    async def get_with_dishes(self, category_id: int) -> DishCategory | None:
+        stmt = (
+            select(DishCategory)
+            .where(DishCategory.id == category_id)
+            .options(selectinload(DishCategory.dishes))
+        )
+        result = await self.db.execute(stmt)
+        return result.scalar_one_or_none()
+
+    @reads
+    async def get_by_name(self, category_name: str) -> DishCategory | None:
+        stmt = select(DishCategory).where(func.lower(DishCategory.name).contains(category_name.lower()))
+        result = await self.db.execute(stmt)
+        return result.scalar_one_or_none()
+
+    @writes
+    async def create(self, data: CategoryCreate) -> DishCategory:
+        category = DishCategory(**data.model_dump())
+        self.db.add(category)
+        await self.db.flush()
+        touch_resources(self.db, "categories")
+        publish_menu_change(self.db)
+        return category
+
+    @writes
+    async def update(self, category_id: int, data: CategoryUpdate) -> DishCategory | None:
+        category = await self.get_by_id(category_id)
+        if not category:
+            return None
+        for key, value in data.model_dump(exclude_unset=True).items():
+            setattr(category, key, value)
+        await self.db.flush()
+        touch_resources(self.db, "categories")
+        publish_menu_change(self.db)
+        return category
+
+    @writes
+    async def delete(self, category_id: int) -> bool:
+        category = await self.get_by_id(category_id)
+        if not category:
+            return False
+        await self.db.delete(category)
+        await self.db.flush()
+        touch_resources(self.db, "categories", "dishes")
+        publish_menu_change(self.db)
+        return True
+
+    @reads
+    async def has_order_items(self, dish_id: int) -> bool:
+        stmt = select(OrderItem.id).where(OrderItem.dish_id == dish_id).limit(1)
+        result = await self.db.execute(stmt)
+        return result.first() is not None
 
-CategoryRepoDep = Annotated[CategoryRepo, Depends(CategoryRepo)]
\ No newline at end of file
+AsyncCategoryRepoDep = Annotated[AsyncCategoryRepo, Depends(AsyncCategoryRepo)]
\ No newline at end of file
@@ -1,10 +1,14 @@
 from fastapi.params import Depends
 from sqlalchemy import select, func
-from typing import Annotated
+from typing import Annotated, Iterable
 
 from sqlalchemy.orm import joinedload
 
-from app.db import SessionContext
+from app.db import SessionContext, AsyncSessionContext
+from app.db.loader import IdentityLoader
+from app.db.routing import reads, writes
+from app.crud.resource_version import touch_resources
+from app.core.menu_cache import publish_menu_change
 from app.models.models import Dish, PromotionDishAssociation, OrderItem
 from app.schemas.dish import DishCreate, DishUpdate
 
@@ -13,26 +17,50 @@ class DishRepo:
     def __init__(self, db: SessionContext):
         self.db = db
 
-    def get_all(self) -> list[Dish]:
+    @reads
+    def get_all(self, limit: int, cursor_id: int | None = None, category_id: int | None = None) -> list[Dish]:
         stmt = select(Dish)
+        if cursor_id is not None:
+            stmt = stmt.where(Dish.id > cursor_id)
+        if category_id is not None:
+            stmt = stmt.where(Dish.category_id == category_id)
+        stmt = stmt.order_by(Dish.id).limit(limit)
         result = self.db.execute(stmt)
         return result.scalars().all()
 
     def get_by_id(self, dish_id: int) -> Dish | None:
-        stmt = select(Dish).where(Dish.id == dish_id)
-        result = self.db.execute(stmt)
-        return result.scalar_one_or_none()
-
+        return self.get_many((dish_id,)).get(dish_id)
+
+    @reads
+    def get_many(self, dish_ids: Iterable[int]) -> dict[int, Dish]:
+        # страви, вже завантажені в цьому запиті, не перечитуються; відсутні id просто не потрапляють у результат
+        dish_ids = list(dish_ids)
+        loader = IdentityLoader(self.db, Dish)
+        missing = loader.missing(dish_ids)
+        if missing:
+            stmt = select(Dish).where(Dish.id.in_(missing))
+            result = self.db.execute(stmt)
+            loader.remember(missing, result.scalars().all())
+        return loader.get_many(dish_ids)
+
+    @reads
+    def get_names(self) -> dict[int, str]:
+        result = self.db.execute(select(Dish.id, Dish.name))
+        return dict(result.all())
+
+    @reads
     def get_by_name(self, dish_name: str) -> Dish | None:
         stmt = select(Dish).where(func.lower(Dish.name).contains(dish_name.lower()))
         result = self.db.execute(stmt)
         return result.scalar_one_or_none()
 
+    @reads
     def get_dishes_by_category(self, category_id: int) -> list[Dish]:
         stmt = select(Dish).where(Dish.category_id == category_id)
         result = self.db.execute(stmt)
         return result.scalars().all()
 
+    @reads
     def get_dishes_on_promotion(self) -> list[Dish]:
         stmt = (
             select(Dish)
@@ -43,6 +71,7 @@ class DishRepo:
         result = self.db.execute(stmt)
         return result.scalars().all()
 
+    @reads
     def get_most_popular_dish(self) -> Dish | None:
         stmt = (
             select(Dish)
@@ -54,38 +83,167 @@ class DishRepo:
         result = self.db.execute(stmt)
         return result.scalar_one_or_none()
 
+    @reads
     def sort_dishes_by_price(self, ascending: bool = True) -> list[Dish]:
         stmt = select(Dish).order_by(Dish.price.asc() if ascending else Dish.price.desc())
         result = self.db.execute(stmt)
         return result.scalars().all()
 
+    @writes
     def create(self, data: DishCreate) -> Dish:
         dish = Dish(**data.model_dump())
         self.db.add(dish)
-        self.db.commit()
-        self.db.refresh(dish)
+        self.db.flush()
+        touch_resources(self.db, "dishes")
+        publish_menu_change(self.db)
+        IdentityLoader(self.db, Dish).remember((dish.id,), (dish,))
         return dish
 
+    @writes
     def update(self, dish_id: int, data: DishUpdate) -> Dish | None:
         dish = self.get_by_id(dish_id)
         if not dish:
             return None
         for key, value in data.model_dump(exclude_unset=True).items():
             setattr(dish, key, value)
-        self.db.commit()
-        self.db.refresh(dish)
+        self.db.flush()
+        touch_resources(self.db, "dishes")
+        publish_menu_change(self.db)
         return dish
 
+    @writes
     def delete(self, dish_id: int) -> bool:
         dish = self.get_by_id(dish_id)
         if not dish:
             return False
         self.db.delete(dish)
-        self.db.commit()
+        self.db.flush()
+        touch_resources(self.db, "dishes")
+        publish_menu_change(self.db)
+        IdentityLoader(self.db, Dish).forget(dish_id)
         return True
 
+    @reads
     def has_order_items(self, dish_id: int) -> bool:
         return self.db.query(OrderItem).filter(OrderItem.dish_id == dish_id).first() is not None
 
-    def delet
 DishRepoDep = Annotated[DishRepo, Depends(DishRepo)]
+
+
+class AsyncDishRepo:
+    def __init__(self, db: AsyncSessionContext):
+        self.db = db
+
+    @reads
+    async def get_all(self, limit: int, cursor_id: int | None = None, category_id: int | None = None) -> list[Dish]:
+        stmt = select(Dish)
+        if cursor_id is not None:
+            stmt = stmt.where(Dish.id > cursor_id)
+        if category_id is not None:
+            stmt = stmt.where(Dish.category_id == category_id)
+        stmt = stmt.order_by(Dish.id).limit(limit)
+        result = await self.db.execute(stmt)
+        return result.scalars().all()
+
+    async def get_by_id(self, dish_id: int) -> Dish | None:
+        return (await self.get_many((dish_id,))).get(dish_id)
+
+    @reads
+    async def get_many(self, dish_ids: Iterable[int]) -> dict[int, Dish]:
+        # страви, вже завантажені в цьому запиті, не перечитуються; відсутні id просто не потрапляють у результат
+        dish_ids = list(dish_ids)
+        loader = IdentityLoader(self.db, Dish)
+        missing = loader.missing(dish_ids)
+        if missing:
+            stmt = select(Dish).where(Dish.id.in_(missing))
+            result = await self.db.execute(stmt)
+            loader.remember(missing, result.scalars().all())
+        return loader.get_many(dish_ids)
+
+    @reads
+    async def get_names(self) -> dict[int, str]:
+        result = await self.db.execute(select(Dish.id, Dish.name))
+        return dict(result.all())
+
+    @reads
+    async def get_by_name(self, dish_name: str) -> Dish | None:
+        stmt = select(Dish).where(func.lower(Dish.name).contains(dish_name.lower()))
+        result = await self.db.execute(stmt)
+        return result.scalar_one_or_none()
+
+    @reads
+    async def get_dishes_by_category(self, category_id: int) -> list[Dish]:
+        stmt = select(Dish).where(Dish.category_id == category_id)
+        result = await self.db.execute(stmt)
+        return result.scalars().all()
+
+    @reads
+    async def get_dishes_on_promotion(self) -> list[Dish]:
+        stmt = (
+            select(Dish)
+            .join(PromotionDishAssociation, Dish.id == PromotionDishAssociation.dish_id)
+            .options(joinedload(Dish.category))
+            .distinct()
+        )
+        result = await self.db.execute(stmt)
+        return result.scalars().all()
+
+    @reads
+    async def get_most_popular_dish(self) -> Dish | None:
+        stmt = (
+            select(Dish)
+            .join(OrderItem, Dish.id == OrderItem.dish_id)
+            .group_by(Dish.id)
+            .order_by(func.sum(OrderItem.quantity).desc())
+            .limit(1)
+        )
+        result = await self.db.execute(stmt)
+        return result.scalar_one_or_none()
+
+    @reads
+    async def sort_dishes_by_price(self, ascending: bool = True) -> list[Dish]:
+        stmt = select(Dish).order_by(Dish.price.asc() if ascending else Dish.price.desc())
+        result = await self.db.execute(stmt)
+        return result.scalars().all()
+
+    @writes
+    async def create(self, data: DishCreate) -> Dish:
+        dish = Dish(**data.model_dump())
+        self.db.add(dish)
+        await self.db.flush()
+        touch_resources(self.db, "dishes")
+        publish_menu_change(self.db)
+        IdentityLoader(self.db, Dish).remember((dish.id,), (dish,))
+        return dish
+
+    @writes
+    async def update(self, dish_id: int, data: DishUpdate) -> Dish | None:
+        dish = await self.get_by_id(dish_id)
+        if not dish:
+            return None
+        for key, value in data.model_dump(exclude_unset=True).items():
+            setattr(dish, key, value)
+        await self.db.flush()
+        touch_resources(self.db, "dishes")
+        publish_menu_change(self.db)
+        return dish
+
+    @writes
+    async def delete(self, dish_id: int) -> bool:
+        dish = await self.get_by_id(dish_id)
+        if not dish:
+            return False
+        await self.db.delete(dish)
+        await self.db.flush()
+        touch_resources(self.db, "dishes")
+        publish_menu_change(self.db)
+        IdentityLoader(self.db, Dish).forget(dish_id)
+        return True
+
+    @reads
+    async def has_order_items(self, dish_id: int) -> bool:
+        stmt = select(OrderItem.id).where(OrderItem.dish_id == dish_id).limit(1)
+        result = await self.db.execute(stmt)
+        return result.first() is not None
+
+AsyncDishRepoDep = Annotated[AsyncDishRepo, Depends(AsyncDishRepo)]
@@ -0,0 +1,87 @@
+from datetime import datetime
+
+from fastapi.params import Depends
+from sqlalchemy import case, delete, null, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
+from typing import Annotated
+
+from app.db import SessionContext, AsyncSessionContext
+from app.db.routing import writes
+from app.models.models import IdempotencyKey
+
+PURGE_BATCH_SIZE = 1000
+
+
+def _claim_stmt(endpoint: str, key: str, fingerprint: bytes, cutoff: datetime):
+    # один запит і для першого виклику, і для повтору. ON CONFLICT DO UPDATE чекає на транзакцію, що вже
+    # вставила цей ключ, і повертає її закомічений рядок; прострочений ключ займається заново.
+    # response IS NULL у результаті - ключ наш, роботу треба виконати
+    stmt = insert(IdempotencyKey).values(
+        endpoint=endpoint, key=key, fingerprint=fingerprint, created_at=datetime.utcnow()
+    )
+    expired = IdempotencyKey.created_at < cutoff
+    return stmt.on_conflict_do_update(
+        index_elements=[IdempotencyKey.endpoint, IdempotencyKey.key],
+        set_={
+            "fingerprint": case((expired, stmt.excluded.fingerprint), else_=IdempotencyKey.fingerprint),
+            "response": case((expired, null()), else_=IdempotencyKey.response),
+            "created_at": case((expired, stmt.excluded.created_at), else_=IdempotencyKey.created_at),
+        },
+    ).returning(IdempotencyKey.fingerprint, IdempotencyKey.response)
+
+
+def _save_stmt(endpoint: str, key: str, response: str):
+    return (
+        update(IdempotencyKey)
+        .where(IdempotencyKey.endpoint == endpoint, IdempotencyKey.key == key)
+        .values(response=response)
+    )
+
+
+def _purge_stmt(cutoff: datetime):
+    # порціями і без очікування на рядки, які зараз хтось займає
+    expired = (
+        select(IdempotencyKey.endpoint, IdempotencyKey.key)
+        .where(IdempotencyKey.created_at < cutoff)
+        .limit(PURGE_BATCH_SIZE)
+        .with_for_update(skip_locked=True)
+    )
+    return delete(IdempotencyKey).where(tuple_(IdempotencyKey.endpoint, IdempotencyKey.key).in_(expired))
+
+
+class IdempotencyRepo:
+    def __init__(self, db: SessionContext):
+        self.db = db
+
+    @writes
+    def claim(self, endpoint: str, key: str, fingerprint: bytes, cutoff: datetime) -> tuple[bytes, str | None]:
+        return self.db.execute(_claim_stmt(endpoint, key, fingerprint, cutoff)).one()
+
+    @writes
+    def save(self, endpoint: str, key: str, response: str) -> None:
+        self.db.execute(_save_stmt(endpoint, key, response))
+
+    @writes
+    def purge_expired(self, cutoff: datetime) -> None:
+        self.db.execute(_purge_stmt(cutoff))
+
+IdempotencyRepoDep = Annotated[IdempotencyRepo, Depends(IdempotencyRepo)]
+
+
+class AsyncIdempotencyRepo:
+    def __init__(self, db: AsyncSessionContext):
+        self.db = db
+
+    @writes
+    async def claim(self, endpoint: str, key: str, fingerprint: bytes, cutoff: datetime) -> tuple[bytes, str | None]:
+        return (await self.db.execute(_claim_stmt(endpoint, key, fingerprint, cutoff))).one()
+
+    @writes
+    async def save(self, endpoint: str, key: str, response: str) -> None:
+        await self.db.execute(_save_stmt(endpoint, key, response))
+
+    @writes
+    async def purge_expired(self, cutoff: datetime) -> None:
+        await self.db.execute(_purge_stmt(cutoff))
+
+AsyncIdempotencyRepoDep = Annotated[AsyncIdempotencyRepo, Depends(AsyncIdempotencyRepo)]
@@ -1,35 +1,290 @@
 from datetime import datetime
 
 from fastapi import Depends
-from sqlalchemy import select, and_
-from typing import Annotated
+from sqlalchemy import select, and_, or_, update, func, exists, Row
+from sqlalchemy.dialects.postgresql import insert
+from typing import Annotated, Iterable, Iterator
 
 from sqlalchemy.orm import selectinload, joinedload
+from sqlalchemy.orm.attributes import set_committed_value
 
-from app.db import SessionContext
-from app.models.models import Order, OrderItem, Dish
-from app.schemas.order import OrderCreate, OrderUpdate
+from app.core.order_events import publish_order_event, order_data, item_data
+from app.db import SessionContext, AsyncSessionContext
+from app.db.routing import reads, writes, pin_to_primary
+from app.models.models import Order, OrderItem, CafeTable
+from app.schemas.order import OrderCreate, OrderUpdate, OrderBulkItem
+
+
+# усе, що серіалізує OrderResponse: позиції і стіл
+ORDER_RESPONSE_OPTIONS = (selectinload(Order.items), joinedload(Order.table))
+
+# розбіжність накопичених float-сум, яку ще не вважаємо помилкою
+TOTALS_TOLERANCE = 1e-6
+
+
+def _orders_page_stmt(
+    limit: int,
+    cursor_id: int | None,
+    table_id: int | None,
+    is_completed: bool | None,
+    created_from: datetime | None,
+    created_to: datetime | None,
+):
+    # нові замовлення першими; курсор - id останнього замовлення попередньої сторінки
+    stmt = select(Order).options(*ORDER_RESPONSE_OPTIONS)
+    if cursor_id is not None:
+        stmt = stmt.where(Order.id < cursor_id)
+    if table_id is not None:
+        stmt = stmt.where(Order.table_id == table_id)
+    if is_completed is not None:
+        stmt = stmt.where(Order.is_completed == is_completed)
+    if created_from is not None:
+        stmt = stmt.where(Order.created_at >= created_from)
+    if created_to is not None:
+        stmt = stmt.where(Order.created_at <= created_to)
+    return stmt.order_by(Order.id.desc()).limit(limit)
+
+
+def _period_summary_stmt(start: datetime, end: datetime, bucket: str | None):
+    # одна агрегація по orders LEFT JOIN order_items; з bucket - ще й GROUP BY date_trunc
+    columns = [
+        func.count(Order.id.distinct()).label("order_count"),
+        func.coalesce(func.sum(OrderItem.quantity), 0).label("item_count"),
+        func.coalesce(func.sum(OrderItem.quantity * OrderItem.price_at_order), 0).label("revenue"),
+    ]
+    if bucket is not None:
+        period_start = func.date_trunc(bucket, Order.created_at).label("period_start")
+        columns.insert(0, period_start)
+    stmt = (
+        select(*columns)
+        .select_from(Order)
+        .outerjoin(OrderItem, OrderItem.order_id == Order.id)
+        .where(Order.created_at.between(start, end))
+    )
+    if bucket is not None:
+        stmt = stmt.group_by(period_start).order_by(period_start)
+    return stmt
+
+
+def _order_totals_stmt(order_ids: list[int] | None):
+    stmt = select(Order.id.label("order_id"), Order.subtotal, Order.discount, Order.total).order_by(Order.id)
+    if order_ids is None:
+        return stmt.where(Order.is_completed == False)
+    return stmt.where(Order.id.in_(order_ids))
+
+
+def _expected_totals_stmt():
+    # суми, перераховані з order_items, для замовлень, де збережені значення з ними розійшлися
+    sums = (
+        select(
+            OrderItem.order_id,
+            func.sum(OrderItem.price_at_order * OrderItem.quantity).label("subtotal"),
+            func.sum(OrderItem.discount).label("discount"),
+        )
+        .group_by(OrderItem.order_id)
+        .subquery()
+    )
+    expected_subtotal = func.coalesce(sums.c.subtotal, 0.0)
+    expected_discount = func.coalesce(sums.c.discount, 0.0)
+    return (
+        select(
+            Order.id.label("order_id"),
+            Order.subtotal,
+            Order.discount,
+            expected_subtotal.label("expected_subtotal"),
+            expected_discount.label("expected_discount"),
+        )
+        .outerjoin(sums, sums.c.order_id == Order.id)
+        .where(
+            or_(
+                func.abs(Order.subtotal - expected_subtotal) > TOTALS_TOLERANCE,
+                func.abs(Order.discount - expected_discount) > TOTALS_TOLERANCE,
+            )
+        )
+        .order_by(Order.id)
+    )
+
+
+def _prep_board_stmt():
+    # скільки кожної страви у відкритих замовленнях; найстаріша позиція - першою
+    oldest = func.min(OrderItem.created_at)
+    return (
+        select(
+            OrderItem.dish_id,
+            func.sum(OrderItem.quantity).label("quantity"),
+            func.count().label("order_count"),
+            oldest.label("oldest_item_at"),
+        )
+        .join(Order, Order.id == OrderItem.order_id)
+        .where(Order.is_completed == False)
+        .group_by(OrderItem.dish_id)
+        .order_by(oldest, OrderItem.dish_id)
+    )
+
+
+def _open_items_stmt():
+    # відкриті замовлення з позиціями; замовлення без позицій - один рядок з item_id = NULL
+    return (
+        select(
+            Order.id.label("order_id"),
+            OrderItem.id.label("item_id"),
+            OrderItem.dish_id,
+            OrderItem.quantity,
+            OrderItem.created_at,
+        )
+        .outerjoin(OrderItem, OrderItem.order_id == Order.id)
+        .where(Order.is_completed == False)
+    )
+
+
+def _locked_order_stmt(order_id: int):
+    # рядок замовлення блокується до кінця транзакції: закриття замовлення (UPDATE orders) чекає, доки правка
+    # його позицій закомітиться, тож позиція і суми не можуть розійтися
+    return select(Order).where(Order.id == order_id).with_for_update()
+
+
+def add_to_order_totals(order_id: int, subtotal_delta: float, discount_delta: float):
+    # атомарний інкремент: паралельні зміни позицій одного замовлення не губляться.
+    # Суми закритого замовлення не змінюються, навіть якщо його закрили паралельно з правкою позиції
+    return (
+        update(Order)
+        .where(Order.id == order_id, Order.is_completed == False)
+        .values(subtotal=Order.subtotal + subtotal_delta, discount=Order.discount + discount_delta)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _item_rows(data: OrderCreate, prices: dict[int, float], discount_rates: dict[int, float]) -> list[dict]:
+    # одна позиція на страву: повтори страви в запиті складаються
+    quantities: dict[int, int] = {}
+    for line in data.items:
+        quantities[line.dish_id] = quantities.get(line.dish_id, 0) + line.quantity
+    return [
+        {
+            "dish_id": dish_id,
+            "quantity": quantity,
+            "price_at_order": prices[dish_id],
+            "discount": prices[dish_id] * quantity * discount_rates[dish_id],
+        }
+        for dish_id, quantity in quantities.items()
+    ]
+
+
+def _order_values(data: OrderBulkItem, rows: list[dict]) -> dict:
+    return {
+        "table_id": data.table_id,
+        "is_completed": data.is_completed,
+        "subtotal": sum(row["price_at_order"] * row["quantity"] for row in rows),
+        "discount": sum(row["discount"] for row in rows),
+    }
+
+
+def _table_occupancy_stmt(table_ids: Iterable[int]):
+    active = exists().where(Order.table_id == CafeTable.id, Order.is_completed == False)
+    return select(CafeTable.id, active).where(CafeTable.id.in_(table_ids))
+
+
+# закриті замовлення вставляються як є, у порядку параметрів
+COMPLETED_ORDERS_INSERT = insert(Order).returning(Order, sort_by_parameter_order=True)
+# активне замовлення на стіл, який тим часом зайняв інший запит, пропускається (uq_orders_table_id_active),
+# а не зриває всю пачку; пропущених рядків немає в RETURNING
+ACTIVE_ORDERS_INSERT = (
+    insert(Order)
+    .on_conflict_do_nothing(index_elements=[Order.table_id], index_where=Order.is_completed == False)
+    .returning(Order)
+)
+ITEMS_INSERT = insert(OrderItem).returning(OrderItem, sort_by_parameter_order=True)
+
+
+def _publish_order_created(db, order: Order) -> None:
+    publish_order_event(db, "order_created", order_data(order))
+    for item in order.items:
+        publish_order_event(db, "item_added", item_data(item))
 
 
 class OrderRepo:
     def __init__(self, db: SessionContext):
         self.db = db
 
-    def get_all(self) -> list[Order]:
-        stmt = select(Order)
+    @reads
+    def get_all(
+        self,
+        limit: int,
+        cursor_id: int | None = None,
+        table_id: int | None = None,
+        is_completed: bool | None = None,
+        created_from: datetime | None = None,
+        created_to: datetime | None = None,
+    ) -> list[Order]:
+        stmt = _orders_page_stmt(limit, cursor_id, table_id, is_completed, created_from, created_to)
         result = self.db.execute(stmt)
         return result.scalars().all()
 
+    @reads
     def get_by_id(self, order_id: int) -> Order | None:
-        stmt = select(Order).where(Order.id == order_id)
+        stmt = select(Order).where(Order.id == order_id).options(*ORDER_RESPONSE_OPTIONS)
         result = self.db.execute(stmt)
         return result.scalar_one_or_none()
 
+    @writes
+    def get_for_update(self, order_id: int) -> Order | None:
+        # populate_existing: замовлення могло бути в сесії раніше, перевіряти треба значення під блокуванням
+        result = self.db.scalars(_locked_order_stmt(order_id), execution_options={"populate_existing": True})
+        return result.one_or_none()
+
+    @reads
     def get_active_orders(self) -> list[Order] :
-        stmt = select(Order).where(Order.is_completed == False)
+        stmt = select(Order).where(Order.is_completed == False).options(*ORDER_RESPONSE_OPTIONS)
         result = self.db.execute(stmt)
         return result.scalars().all()
 
+    @reads
+    def get_prep_board(self) -> list[Row]:
+        result = self.db.execute(_prep_board_stmt())
+        return result.all()
+
+    def get_open_items(self) -> list[Row]:
+        # з primary: події з NOTIFY застосовуються поверх цих рядків, тож рядки не можуть від них відставати
+        pin_to_primary(self.db)
+        result = self.db.execute(_open_items_stmt())
+        return result.all()
+
+    def get_active_orders_snapshot(self) -> list[Order]:
+        # знімок для потоку подій читається з primary: NOTIFY приходять звідти, і репліка, що відстала,
+        # віддала б стан без подій, які клієнт уже не отримає
+        pin_to_primary(self.db)
+        return self.get_active_orders()
+
+    @reads
+    def get_total(self, order_id: int) -> float | None:
+        result = self.db.execute(select(Order.total).where(Order.id == order_id))
+        return result.scalar_one_or_none()
+
+    @reads
+    def get_totals(self, order_ids: list[int] | None = None) -> list[Row]:
+        # order_ids=None - усі активні замовлення
+        result = self.db.execute(_order_totals_stmt(order_ids))
+        return result.all()
+
+    @reads
+    def get_inconsistent_totals(self) -> list[Row]:
+        result = self.db.execute(_expected_totals_stmt())
+        return result.all()
+
+    @writes
+    def repair_totals(self) -> list[Row]:
+        # перевірка і виправлення в одній транзакції; повертає виправлені замовлення зі старими значеннями
+        expected = _expected_totals_stmt().subquery()
+        result = self.db.execute(
+            update(Order)
+            .where(Order.id == expected.c.order_id)
+            .values(subtotal=expected.c.expected_subtotal, discount=expected.c.expected_discount)
+            .returning(*expected.c)
+            .execution_options(synchronize_session=False)
+        )
+        return result.all()
+
+    @reads
     def get_orders_by_period(self, start: datetime, end: datetime) -> list[Order]:
         stmt = (
             select(Order)
@@ -39,58 +294,348 @@ class OrderRepo:
                     Order.created_at <= end
                 )
             )
-            .options(joinedload(Order.items))
+            .options(*ORDER_RESPONSE_OPTIONS)
         )
-        result = self.db.execute(stmt).unique()
-        return result.unique().scalars().all()
+        result = self.db.execute(stmt)
+        return result.scalars().all()
 
-    def create(self, data: OrderCreate) -> Order:
-        order = Order(table_id=data.table_id, is_completed=False)
+    @reads
+    def stream_orders_by_period(self, start: datetime, end: datetime, batch_size: int) -> Iterator[Order]:
+        # yield_per з psycopg2 читає через серверний курсор: у пам'яті лише поточна пачка замовлень,
+        # а selectinload догружає позиції окремим запитом на кожну пачку
+        stmt = (
+            select(Order)
+            .where(Order.created_at.between(start, end))
+            .order_by(Order.created_at, Order.id)
+            .options(*ORDER_RESPONSE_OPTIONS)
+            .execution_options(yield_per=batch_size)
+        )
+        yield from self.db.scalars(stmt)
+
+    @reads
+    def get_period_summary(self, start: datetime, end: datetime, bucket: str | None = None) -> list[Row]:
+        result = self.db.execute(_period_summary_stmt(start, end, bucket))
+        return result.all()
+
+    @writes
+    def create(self, data: OrderCreate, prices: dict[int, float], discount_rates: dict[int, float]) -> Order:
+        rows = _item_rows(data, prices, discount_rates)
+        order = Order(
+            table_id=data.table_id,
+            is_completed=False,
+            subtotal=sum(row["price_at_order"] * row["quantity"] for row in rows),
+            discount=sum(row["discount"] for row in rows),
+        )
         self.db.add(order)
         self.db.flush()
 
-        for item_data in data.items:
-            dish_stmt = select(Dish).where(Dish.id == item_data.dish_id)
-            dish_result = self.db.execute(dish_stmt)
-            dish = dish_result.scalar_one()
-            order_item = OrderItem(
-                dish_id=item_data.dish_id,
-                order_id=order.id,
-                quantity=item_data.quantity,
-                price_at_order=dish.price,
+        # усі позиції одним INSERT ... VALUES (...), (...) RETURNING
+        items = []
+        if rows:
+            result = self.db.scalars(
+                insert(OrderItem).returning(OrderItem),
+                [{"order_id": order.id, **row} for row in rows],
             )
-            self.db.add(order_item)
-
-        self.db.commit()
-        self.db.refresh(order)
+            items = result.all()
+        # заповнюємо зв'язки вручну, щоб OrderResponse не робив lazy-load
+        set_committed_value(order, "items", items)
+        set_committed_value(order, "table", self.db.get(CafeTable, data.table_id))
+        _publish_order_created(self.db, order)
         return order
 
+    @reads
+    def get_table_occupancy(self, table_ids: Iterable[int]) -> dict[int, bool]:
+        # id столу -> чи є на ньому активне замовлення; столів, яких немає, у результаті немає
+        result = self.db.execute(_table_occupancy_stmt(table_ids))
+        return dict(result.all())
+
+    @writes
+    def create_many(
+        self, orders: list[OrderBulkItem], prices: dict[int, float], discount_rates: dict[int, float]
+    ) -> list[Order | None]:
+        # замовлення і всі їхні позиції багаторядковими INSERT ... RETURNING; результат - у порядку orders,
+        # None - активне замовлення, яке не вставилося, бо стіл уже зайнятий
+        item_rows = [_item_rows(data, prices, discount_rates) for data in orders]
+        values = [_order_values(data, rows) for data, rows in zip(orders, item_rows)]
+        created: list[Order | None] = [None] * len(orders)
+
+        completed = [i for i, data in enumerate(orders) if data.is_completed]
+        if completed:
+            result = self.db.scalars(COMPLETED_ORDERS_INSERT, [values[i] for i in completed])
+            for i, order in zip(completed, result.all()):
+                created[i] = order
+        active = [i for i, data in enumerate(orders) if not data.is_completed]
+        if active:
+            result = self.db.scalars(ACTIVE_ORDERS_INSERT, [values[i] for i in active])
+            # активних замовлень на один стіл у пачці не більше одного, тож стіл однозначно вказує на рядок
+            by_table = {order.table_id: order for order in result.all()}
+            for i in active:
+                created[i] = by_table.get(orders[i].table_id)
+
+        params = [
+            {"order_id": order.id, **row}
+            for order, rows in zip(created, item_rows) if order is not None
+            for row in rows
+        ]
+        items_by_order: dict[int, list[OrderItem]] = {}
+        if params:
+            result = self.db.scalars(ITEMS_INSERT, params)
+            for item in result.all():
+                items_by_order.setdefault(item.order_id, []).append(item)
+        for order in created:
+            if order is not None:
+                set_committed_value(order, "items", items_by_order.get(order.id, []))
+                _publish_order_created(self.db, order)
+        return created
+
+    @writes
     def update(self, order_id: int, data: OrderUpdate) -> Order | None:
         order = self.get_by_id(order_id)
         if not order:
             return None
-        for key, value in data.model_dump(exclude_unset=True).items():
+        changes = data.model_dump(exclude_unset=True)
+        for key, value in changes.items():
             setattr(order, key, value)
-        self.db.commit()
-        self.db.refresh(order)
+        self.db.flush()
+        if "table_id" in changes:
+            set_committed_value(order, "table", self.db.get(CafeTable, order.table_id))
+        publish_order_event(self.db, "order_updated", order_data(order))
         return order
 
+    @writes
     def complete_order(self, order_id: int) -> Order | None:
         order = self.get_by_id(order_id)
         if not order:
             return None
         order.is_completed = True
-        self.db.commit()
-        self.db.refresh(order)
+        self.db.flush()
+        publish_order_event(self.db, "order_completed", order_data(order))
         return order
 
+    @writes
     def delete(self, order_id: int) -> bool:
         order = self.get_by_id(order_id)
         if not order:
             return False
         self.db.delete(order)
-        self.db.commit()
+        self.db.flush()
+        publish_order_event(self.db, "order_deleted", {"id": order_id, "table_id": order.table_id})
         return True
 
 
 OrderRepoDep = Annotated[OrderRepo, Depends(OrderRepo)]
+
+
+class AsyncOrderRepo:
+    def __init__(self, db: AsyncSessionContext):
+        self.db = db
+
+    @reads
+    async def get_all(
+        self,
+        limit: int,
+        cursor_id: int | None = None,
+        table_id: int | None = None,
+        is_completed: bool | None = None,
+        created_from: datetime | None = None,
+        created_to: datetime | None = None,
+    ) -> list[Order]:
+        stmt = _orders_page_stmt(limit, cursor_id, table_id, is_completed, created_from, created_to)
+        result = await self.db.execute(stmt)
+        return result.scalars().all()
+
+    @reads
+    async def get_by_id(self, order_id: int) -> Order | None:
+        stmt = (
+            select(Order)
+            .where(Order.id == order_id)
+            .options(*ORDER_RESPONSE_OPTIONS)
+        )
+        result = await self.db.execute(stmt)
+        return result.scalar_one_or_none()
+
+    @writes
+    async def get_for_update(self, order_id: int) -> Order | None:
+        result = await self.db.scalars(_locked_order_stmt(order_id), execution_options={"populate_existing": True})
+        return result.one_or_none()
+
+    @reads
+    async def get_active_orders(self) -> list[Order]:
+        stmt = (
+            select(Order)
+            .where(Order.is_completed == False)
+            .options(*ORDER_RESPONSE_OPTIONS)
+        )
+        result = await self.db.execute(stmt)
+        return result.scalars().all()
+
+    @reads
+    async def get_prep_board(self) -> list[Row]:
+        result = await self.db.execute(_prep_board_stmt())
+        return result.all()
+
+    async def get_open_items(self) -> list[Row]:
+        pin_to_primary(self.db)
+        result = await self.db.execute(_open_items_stmt())
+        return result.all()
+
+    async def get_active_orders_snapshot(self) -> list[Order]:
+        pin_to_primary(self.db)
+        return await self.get_active_orders()
+
+    @reads
+    async def get_total(self, order_id: int) -> float | None:
+        result = await self.db.execute(select(Order.total).where(Order.id == order_id))
+        return result.scalar_one_or_none()
+
+    @reads
+    async def get_totals(self, order_ids: list[int] | None = None) -> list[Row]:
+        # order_ids=None - усі активні замовлення
+        result = await self.db.execute(_order_totals_stmt(order_ids))
+        return result.all()
+
+    @reads
+    async def get_inconsistent_totals(self) -> list[Row]:
+        result = await self.db.execute(_expected_totals_stmt())
+        return result.all()
+
+    @writes
+    async def repair_totals(self) -> list[Row]:
+        # перевірка і виправлення в одній транзакції; повертає виправлені замовлення зі старими значеннями
+        expected = _expected_totals_stmt().subquery()
+        result = await self.db.execute(
+            update(Order)
+            .where(Order.id == expected.c.order_id)
+            .values(subtotal=expected.c.expected_subtotal, discount=expected.c.expected_discount)
+            .returning(*expected.c)
+            .execution_options(synchronize_session=False)
+        )
+        return result.all()
+
+    @reads
+    async def get_orders_by_period(self, start: datetime, end: datetime) -> list[Order]:
+        stmt = (
+            select(Order)
+            .where(
+                and_(
+                    Order.created_at >= start,
+                    Order.created_at <= end
+                )
+            )
+            .options(*ORDER_RESPONSE_OPTIONS)
+        )
+        result = await self.db.execute(stmt)
+        return result.scalars().all()
+
+    @reads
+    async def get_period_summary(self, start: datetime, end: datetime, bucket: str | None = None) -> list[Row]:
+        result = await self.db.execute(_period_summary_stmt(start, end, bucket))
+        return result.all()
+
+    @writes
+    async def create(self, data: OrderCreate, prices: dict[int, float], discount_rates: dict[int, float]) -> Order:
+        rows = _item_rows(data, prices, discount_rates)
+        order = Order(
+            table_id=data.table_id,
+            is_completed=False,
+            subtotal=sum(row["price_at_order"] * row["quantity"] for row in rows),
+            discount=sum(row["discount"] for row in rows),
+        )
+        self.db.add(order)
+        await self.db.flush()
+
+        # усі позиції одним INSERT ... VALUES (...), (...) RETURNING
+        items = []
+        if rows:
+            result = await self.db.scalars(
+                insert(OrderItem).returning(OrderItem),
+                [{"order_id": order.id, **row} for row in rows],
+            )
+            items = result.all()
+        # заповнюємо зв'язки вручну, щоб OrderResponse не робив lazy-load
+        set_committed_value(order, "items", items)
+        set_committed_value(order, "table", await self.db.get(CafeTable, data.table_id))
+        _publish_order_created(self.db, order)
+        return order
+
+    @reads
+    async def get_table_occupancy(self, table_ids: Iterable[int]) -> dict[int, bool]:
+        # id столу -> чи є на ньому активне замовлення; столів, яких немає, у результаті немає
+        result = await self.db.execute(_table_occupancy_stmt(table_ids))
+        return dict(result.all())
+
+    @writes
+    async def create_many(
+        self, orders: list[OrderBulkItem], prices: dict[int, float], discount_rates: dict[int, float]
+    ) -> list[Order | None]:
+        # замовлення і всі їхні позиції багаторядковими INSERT ... RETURNING; результат - у порядку orders,
+        # None - активне замовлення, яке не вставилося, бо стіл уже зайнятий
+        item_rows = [_item_rows(data, prices, discount_rates) for data in orders]
+        values = [_order_values(data, rows) for data, rows in zip(orders, item_rows)]
+        created: list[Order | None] = [None] * len(orders)
+
+        completed = [i for i, data in enumerate(orders) if data.is_completed]
+        if completed:
+            result = await self.db.scalars(COMPLETED_ORDERS_INSERT, [values[i] for i in completed])
+            for i, order in zip(completed, result.all()):
+                created[i] = order
+        active = [i for i, data in enumerate(orders) if not data.is_completed]
+        if active:
+            result = await self.db.scalars(ACTIVE_ORDERS_INSERT, [values[i] for i in active])
+            # активних замовлень на один стіл у пачці не більше одного, тож стіл однозначно вказує на рядок
+            by_table = {order.table_id: order for order in result.all()}
+            for i in active:
+                created[i] = by_table.get(orders[i].table_id)
+
+        params = [
+            {"order_id": order.id, **row}
+            for order, rows in zip(created, item_rows) if order is not None
+            for row in rows
+        ]
+        items_by_order: dict[int, list[OrderItem]] = {}
+        if params:
+            result = await self.db.scalars(ITEMS_INSERT, params)
+            for item in result.all():
+                items_by_order.setdefault(item.order_id, []).append(item)
+        for order in created:
+            if order is not None:
+                set_committed_value(order, "items", items_by_order.get(order.id, []))
+                _publish_order_created(self.db, order)
+        return created
+
+    @writes
+    async def update(self, order_id: int, data: OrderUpdate) -> Order | None:
+        order = await self.get_by_id(order_id)
+        if not order:
+            return None
+        changes = data.model_dump(exclude_unset=True)
+        for key, value in changes.items():
+            setattr(order, key, value)
+        await self.db.flush()
+        if "table_id" in changes:
+            set_committed_value(order, "table", await self.db.get(CafeTable, order.table_id))
+        publish_order_event(self.db, "order_updated", order_data(order))
+        return order
+
+    @writes
+    async def complete_order(self, order_id: int) -> Order | None:
+        order = await self.get_by_id(order_id)
+        if not order:
+            return None
+        order.is_completed = True
+        await self.db.flush()
+        publish_order_event(self.db, "order_completed", order_data(order))
+        return order
+
+    @writes
+    async def delete(self, order_id: int) -> bool:
+        order = await self.get_by_id(order_id)
+        if not order:
+            return False
+        await self.db.delete(order)
+        await self.db.flush()
+        publish_order_event(self.db, "order_deleted", {"id": order_id, "table_id": order.table_id})
+        return True
+
+
+AsyncOrderRepoDep = Annotated[AsyncOrderRepo, Depends(AsyncOrderRepo)]
@@ -1,59 +1,210 @@
 from fastapi.params import Depends
 from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
 from typing import Annotated
 
-from app.db import SessionContext
+from app.core.order_events import publish_order_event, item_data
+from app.db import SessionContext, AsyncSessionContext
+from app.db.routing import reads, writes
 from app.models.models import OrderItem
+from app.crud.order import add_to_order_totals
 from app.schemas.order_item import OrderItemCreate, OrderItemUpdate
 
 
+def _order_items_page_stmt(limit: int, cursor_id: int | None, order_id: int | None, dish_id: int | None):
+    stmt = select(OrderItem)
+    if cursor_id is not None:
+        stmt = stmt.where(OrderItem.id > cursor_id)
+    if order_id is not None:
+        stmt = stmt.where(OrderItem.order_id == order_id)
+    if dish_id is not None:
+        stmt = stmt.where(OrderItem.dish_id == dish_id)
+    return stmt.order_by(OrderItem.id).limit(limit)
+
+
+def _rescaled_discount(order_item: OrderItem, old_quantity: int, discount_rate: float) -> float:
+    # додані одиниці отримують знижку, що діє зараз; прибрані забирають свою частку вже нарахованої
+    if order_item.quantity >= old_quantity:
+        return order_item.discount + order_item.price_at_order * (order_item.quantity - old_quantity) * discount_rate
+    return order_item.discount * order_item.quantity / old_quantity
+
+
+def _locked_item_stmt(order_item_id: int):
+    # рядок блокується до кінця транзакції: паралельні PUT/DELETE тієї ж позиції рахують зміну сум
+    # від кількості, яку залишив попередній, а не від тієї, що обидва прочитали
+    return select(OrderItem).where(OrderItem.id == order_item_id).with_for_update()
+
+
+def _add_item_stmt(data: OrderItemCreate, price: float, discount_rate: float):
+    # нова страва - нова позиція; повторна - додає кількість до наявної позиції за її ціною
+    stmt = insert(OrderItem).values(
+        **data.model_dump(),
+        price_at_order=price,
+        discount=price * data.quantity * discount_rate,
+    )
+    return stmt.on_conflict_do_update(
+        constraint="uq_order_items_order_id_dish_id",
+        set_={
+            "quantity": OrderItem.quantity + stmt.excluded.quantity,
+            "discount": OrderItem.discount + OrderItem.price_at_order * stmt.excluded.quantity * discount_rate,
+        },
+    ).returning(OrderItem)
+
+
 class OrderItemRepo:
     def __init__(self, db: SessionContext):
         self.db = db
 
-    def get_all(self) -> list[OrderItem]:
-        stmt = select(OrderItem)
+    @reads
+    def get_all(
+        self,
+        limit: int,
+        cursor_id: int | None = None,
+        order_id: int | None = None,
+        dish_id: int | None = None,
+    ) -> list[OrderItem]:
+        stmt = _order_items_page_stmt(limit, cursor_id, order_id, dish_id)
         result = self.db.execute(stmt)
         return result.scalars().all()
 
+    @reads
     def get_by_id(self, order_item_id: int) -> OrderItem | None:
         stmt = select(OrderItem).where(OrderItem.id == order_item_id)
         result = self.db.execute(stmt)
         return result.scalar_one_or_none()
 
+    @reads
     def get_by_order_id(self, order_id: int) -> list[OrderItem]:
         stmt = select(OrderItem).where(OrderItem.order_id == order_id)
         result = self.db.execute(stmt)
         return result.scalars().all()
 
-    def create(self, data: OrderItemCreate) -> OrderItem:
-        order_item = OrderItem(**data.model_dump())
-        self.db.add(order_item)
-        self.db.commit()
-        self.db.refresh(order_item)
+    def _get_locked(self, order_item_id: int) -> OrderItem | None:
+        # populate_existing: позиція могла бути в сесії з перевірки в сервісі, її значення треба оновити
+        result = self.db.scalars(_locked_item_stmt(order_item_id), execution_options={"populate_existing": True})
+        return result.one_or_none()
+
+    @writes
+    def add(self, data: OrderItemCreate, price: float, discount_rate: float) -> OrderItem:
+        # INSERT ... ON CONFLICT DO UPDATE ... RETURNING: паралельні додавання однієї страви не створюють дублікатів
+        result = self.db.scalars(
+            _add_item_stmt(data, price, discount_rate),
+            execution_options={"populate_existing": True},
+        )
+        order_item = result.one()
+        line = order_item.price_at_order * data.quantity
+        self.db.execute(add_to_order_totals(data.order_id, line, line * discount_rate))
+        publish_order_event(self.db, "item_added", item_data(order_item))
         return order_item
 
-    def update(self, order_item_id: int, data: OrderItemUpdate) -> OrderItem | None:
-        order_item = self.get_by_id(order_item_id)
+    @writes
+    def update(self, order_item_id: int, data: OrderItemUpdate, discount_rate: float) -> OrderItem | None:
+        order_item = self._get_locked(order_item_id)
         if not order_item:
             return None
+        old_quantity, old_discount = order_item.quantity, order_item.discount
         for key, value in data.model_dump(exclude_unset=True).items():
             setattr(order_item, key, value)
-        self.db.commit()
-        self.db.refresh(order_item)
+        order_item.discount = _rescaled_discount(order_item, old_quantity, discount_rate)
+        self.db.execute(add_to_order_totals(
+            order_item.order_id,
+            order_item.price_at_order * (order_item.quantity - old_quantity),
+            order_item.discount - old_discount,
+        ))
+        publish_order_event(self.db, "item_updated", item_data(order_item))
         return order_item
 
+    @writes
     def delete(self, order_item_id: int) -> bool:
-        order_item = self.get_by_id(order_item_id)
+        order_item = self._get_locked(order_item_id)
         if not order_item:
             return False
         self.db.delete(order_item)
-        self.db.commit()
+        self.db.execute(add_to_order_totals(
+            order_item.order_id,
+            -order_item.price_at_order * order_item.quantity,
+            -order_item.discount,
+        ))
+        publish_order_event(self.db, "item_removed", {"id": order_item.id, "order_id": order_item.order_id})
         return True
 
-    def delete_order_items_by_order_id(self, order_item_id: int) -> bool:
-        order_items = self.db.select(OrderItem).where(OrderItem.order_id == order_item_id)
-        self.db.delete(order_items)
-        self.db.commit()
+OrderItemRepoDep = Annotated[OrderItemRepo, Depends(OrderItemRepo)]
+
+
+class AsyncOrderItemRepo:
+    def __init__(self, db: AsyncSessionContext):
+        self.db = db
+
+    @reads
+    async def get_all(
+        self,
+        limit: int,
+        cursor_id: int | None = None,
+        order_id: int | None = None,
+        dish_id: int | None = None,
+    ) -> list[OrderItem]:
+        stmt = _order_items_page_stmt(limit, cursor_id, order_id, dish_id)
+        result = await self.db.execute(stmt)
+        return result.scalars().all()
+
+    @reads
+    async def get_by_id(self, order_item_id: int) -> OrderItem | None:
+        stmt = select(OrderItem).where(OrderItem.id == order_item_id)
+        result = await self.db.execute(stmt)
+        return result.scalar_one_or_none()
+
+    @reads
+    async def get_by_order_id(self, order_id: int) -> list[OrderItem]:
+        stmt = select(OrderItem).where(OrderItem.order_id == order_id)
+        result = await self.db.execute(stmt)
+        return result.scalars().all()
+
+    async def _get_locked(self, order_item_id: int) -> OrderItem | None:
+        result = await self.db.scalars(_locked_item_stmt(order_item_id), execution_options={"populate_existing": True})
+        return result.one_or_none()
+
+    @writes
+    async def add(self, data: OrderItemCreate, price: float, discount_rate: float) -> OrderItem:
+        # INSERT ... ON CONFLICT DO UPDATE ... RETURNING: паралельні додавання однієї страви не створюють дублікатів
+        result = await self.db.scalars(
+            _add_item_stmt(data, price, discount_rate),
+            execution_options={"populate_existing": True},
+        )
+        order_item = result.one()
+        line = order_item.price_at_order * data.quantity
+        await self.db.execute(add_to_order_totals(data.order_id, line, line * discount_rate))
+        publish_order_event(self.db, "item_added", item_data(order_item))
+        return order_item
+
+    @writes
+    async def update(self, order_item_id: int, data: OrderItemUpdate, discount_rate: float) -> OrderItem | None:
+        order_item = await self._get_locked(order_item_id)
+        if not order_item:
+            return None
+        old_quantity, old_discount = order_item.quantity, order_item.discount
+        for key, value in data.model_dump(exclude_unset=True).items():
+            setattr(order_item, key, value)
+        order_item.discount = _rescaled_discount(order_item, old_quantity, discount_rate)
+        await self.db.execute(add_to_order_totals(
+            order_item.order_id,
+            order_item.price_at_order * (order_item.quantity - old_quantity),
+            order_item.discount - old_discount,
+        ))
+        publish_order_event(self.db, "item_updated", item_data(order_item))
+        return order_item
+
+    @writes
+    async def delete(self, order_item_id: int) -> bool:
+        order_item = await self._get_locked(order_item_id)
+        if not order_item:
+            return False
+        await self.db.delete(order_item)
+        await self.db.execute(add_to_order_totals(
+            order_item.order_id,
+            -order_item.price_at_order * order_item.quantity,
+            -order_item.discount,
+        ))
+        publish_order_event(self.db, "item_removed", {"id": order_item.id, "order_id": order_item.order_id})
+        return True
 
-OrderItemRepoDep = Annotated[OrderItemRepo, Depends(OrderItemRepo)]
\ No newline at end of file
+AsyncOrderItemRepoDep = Annotated[AsyncOrderItemRepo, Depends(AsyncOrderItemRepo)]
\ No newline at end of file
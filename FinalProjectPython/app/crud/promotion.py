@@ -1,45 +1,86 @@
-from datetime import datetime
-from operator import or_
+from datetime import date
 
 from fastapi.params import Depends
-from sqlalchemy import select, and_
-from typing import Annotated
+from sqlalchemy import select
+from typing import Annotated, Iterable
 
-from app.db import SessionContext
-from app.models.models import Promotion, Dish
+from sqlalchemy.orm import selectinload
+
+from app.db import SessionContext, AsyncSessionContext
+from app.db.routing import reads, writes
+from app.crud.resource_version import touch_resources
+from app.core.menu_cache import publish_menu_change
+from app.models.models import Promotion, Dish, PromotionDishAssociation
 from app.schemas.promotion import PromotionCreate, PromotionUpdate
 
 
+# PromotionResponse серіалізує страви акції
+PROMOTION_RESPONSE_OPTIONS = (selectinload(Promotion.dishes),)
+
+# рядки індексу PricingEngine: по одному на пару акція-страва
+PRICING_RULES_STMT = select(
+    PromotionDishAssociation.dish_id,
+    Promotion.id,
+    Promotion.discount_percent,
+    Promotion.valid_from,
+    Promotion.valid_to,
+    Promotion.start_time,
+    Promotion.end_time,
+).join(Promotion, Promotion.id == PromotionDishAssociation.promotion_id)
+
+# рядки PromotionSchedule: вікно дії кожної акції
+SCHEDULE_STMT = select(
+    Promotion.id,
+    Promotion.valid_from,
+    Promotion.valid_to,
+    Promotion.start_time,
+    Promotion.end_time,
+)
+
+
 class PromotionRepo:
     def __init__(self, db: SessionContext):
         self.db = db
 
-    def get_all(self) -> list[Promotion]:
-        stmt = select(Promotion)
+    @reads
+    def get_all(self, limit: int, cursor_id: int | None = None) -> list[Promotion]:
+        stmt = select(Promotion).options(*PROMOTION_RESPONSE_OPTIONS)
+        if cursor_id is not None:
+            stmt = stmt.where(Promotion.id > cursor_id)
+        stmt = stmt.order_by(Promotion.id).limit(limit)
         result = self.db.execute(stmt)
         return result.scalars().all()
 
+    @reads
     def get_by_id(self, promotion_id: int) -> Promotion | None:
-        stmt = select(Promotion).where(Promotion.id == promotion_id)
+        stmt = select(Promotion).where(Promotion.id == promotion_id).options(*PROMOTION_RESPONSE_OPTIONS)
         result = self.db.execute(stmt)
         return result.scalar_one_or_none()
 
-
-    def get_active_promotion(self) -> list[Promotion]:
-        now = datetime.utcnow()
-        today = now.date()
-        current_time = now.time()
-
-        stmt = select(Promotion).where(
-            Promotion.valid_from <= today,
-            Promotion.valid_to >= today,
-            or_(Promotion.start_time == None, Promotion.start_time <= current_time),
-            or_(Promotion.end_time == None, Promotion.end_time >= current_time),
+    @reads
+    def get_by_ids(self, promotion_ids: Iterable[int]) -> list[Promotion]:
+        stmt = (
+            select(Promotion)
+            .where(Promotion.id.in_(promotion_ids))
+            .options(*PROMOTION_RESPONSE_OPTIONS)
+            .order_by(Promotion.id)
         )
         result = self.db.execute(stmt)
         return result.scalars().all()
 
-    def create(self, data: PromotionCreate) -> Promotion:
+    @reads
+    def get_schedule(self, today: date) -> list[tuple]:
+        # рядки PromotionSchedule; акції, що вже закінчилися, більше не стануть активними
+        result = self.db.execute(SCHEDULE_STMT.where(Promotion.valid_to >= today))
+        return result.all()
+
+    @reads
+    def get_pricing_rules(self) -> list[tuple]:
+        result = self.db.execute(PRICING_RULES_STMT)
+        return result.all()
+
+    @writes
+    def create(self, data: PromotionCreate, dishes: list[Dish]) -> Promotion:
         promotion = Promotion(
             description=data.description,
             discount_percent=data.discount_percent,
@@ -48,40 +89,132 @@ class PromotionRepo:
             start_time=data.start_time,
             end_time=data.end_time
         )
-
-        if data.dish_ids:
-            stmt = select(Dish).where(Dish.id.in_(data.dish_ids))
-            result = self.db.execute(stmt)
-            dishes = result.scalars().all()
-            promotion.dishes = dishes
+        promotion.dishes = dishes
 
         self.db.add(promotion)
-        self.db.commit()
-        self.db.refresh(promotion)
+        self.db.flush()
+        touch_resources(self.db, "promotions")
+        publish_menu_change(self.db)
         return promotion
 
-    def update(self, promotion_id: int, data: PromotionUpdate) -> Promotion | None:
+    @writes
+    def update(
+        self, promotion_id: int, data: PromotionUpdate, dishes: list[Dish] | None = None
+    ) -> Promotion | None:
         promotion = self.get_by_id(promotion_id)
         if not promotion:
             return None
         for key, value in data.model_dump(exclude_unset=True, exclude={"dish_ids"}).items():
             setattr(promotion, key, value)
 
-        if data.dish_ids is not None:
-            stmt = select(Dish).where(Dish.id.in_(data.dish_ids))
-            result = self.db.execute(stmt)
-            promotion.dishes = result.scalars().all()
+        if dishes is not None:
+            promotion.dishes = dishes
 
-        self.db.commit()
-        self.db.refresh(promotion)
+        self.db.flush()
+        touch_resources(self.db, "promotions")
+        publish_menu_change(self.db)
         return promotion
 
+    @writes
     def delete(self, promotion_id: int) -> bool:
         promotion = self.get_by_id(promotion_id)
         if not promotion:
             return False
         self.db.delete(promotion)
-        self.db.commit()
+        self.db.flush()
+        touch_resources(self.db, "promotions")
+        publish_menu_change(self.db)
+        return True
+
+PromotionRepoDep = Annotated[PromotionRepo, Depends(PromotionRepo)]
+
+
+class AsyncPromotionRepo:
+    def __init__(self, db: AsyncSessionContext):
+        self.db = db
+
+    @reads
+    async def get_all(self, limit: int, cursor_id: int | None = None) -> list[Promotion]:
+        stmt = select(Promotion).options(*PROMOTION_RESPONSE_OPTIONS)
+        if cursor_id is not None:
+            stmt = stmt.where(Promotion.id > cursor_id)
+        stmt = stmt.order_by(Promotion.id).limit(limit)
+        result = await self.db.execute(stmt)
+        return result.scalars().all()
+
+    @reads
+    async def get_by_id(self, promotion_id: int) -> Promotion | None:
+        stmt = select(Promotion).where(Promotion.id == promotion_id).options(*PROMOTION_RESPONSE_OPTIONS)
+        result = await self.db.execute(stmt)
+        return result.scalar_one_or_none()
+
+    @reads
+    async def get_by_ids(self, promotion_ids: Iterable[int]) -> list[Promotion]:
+        stmt = (
+            select(Promotion)
+            .where(Promotion.id.in_(promotion_ids))
+            .options(*PROMOTION_RESPONSE_OPTIONS)
+            .order_by(Promotion.id)
+        )
+        result = await self.db.execute(stmt)
+        return result.scalars().all()
+
+    @reads
+    async def get_schedule(self, today: date) -> list[tuple]:
+        # рядки PromotionSchedule; акції, що вже закінчилися, більше не стануть активними
+        result = await self.db.execute(SCHEDULE_STMT.where(Promotion.valid_to >= today))
+        return result.all()
+
+    @reads
+    async def get_pricing_rules(self) -> list[tuple]:
+        result = await self.db.execute(PRICING_RULES_STMT)
+        return result.all()
+
+    @writes
+    async def create(self, data: PromotionCreate, dishes: list[Dish]) -> Promotion:
+        promotion = Promotion(
+            description=data.description,
+            discount_percent=data.discount_percent,
+            valid_from=data.valid_from,
+            valid_to=data.valid_to,
+            start_time=data.start_time,
+            end_time=data.end_time
+        )
+        promotion.dishes = dishes
+
+        self.db.add(promotion)
+        await self.db.flush()
+        touch_resources(self.db, "promotions")
+        publish_menu_change(self.db)
+        return promotion
+
+    @writes
+    async def update(
+        self, promotion_id: int, data: PromotionUpdate, dishes: list[Dish] | None = None
+    ) -> Promotion | None:
+        promotion = await self.get_by_id(promotion_id)
+        if not promotion:
+            return None
+        for key, value in data.model_dump(exclude_unset=True, exclude={"dish_ids"}).items():
+            setattr(promotion, key, value)
+
+        if dishes is not None:
+            promotion.dishes = dishes
+
+        await self.db.flush()
+        touch_resources(self.db, "promotions")
+        publish_menu_change(self.db)
+        return promotion
+
+    @writes
+    async def delete(self, promotion_id: int) -> bool:
+        promotion = await self.get_by_id(promotion_id)
+        if not promotion:
+            return False
+        await self.db.delete(promotion)
+        await self.db.flush()
+        touch_resources(self.db, "promotions")
+        publish_menu_change(self.db)
         return True
 
-PromotionRepoDep = Annotated[PromotionRepo, Depends(PromotionRepo)]
\ No newline at end of file
+AsyncPromotionRepoDep = Annotated[AsyncPromotionRepo, Depends(AsyncPromotionRepo)]
\ No newline at end of file
@@ -0,0 +1,59 @@
+from fastapi.params import Depends
+from sqlalchemy import select, event
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from typing import Annotated, Iterable
+
+from app.db import SessionContext, AsyncSessionContext
+from app.db.routing import RoutingSession, reads
+from app.models.models import ResourceVersion
+
+
+def touch_resources(db: Session | AsyncSession, *resources: str) -> None:
+    # версії збільшуються один раз на транзакцію, скільки б записів у ній не було
+    db.info.setdefault("touched_resources", set()).update(resources)
+
+
+def _bump_versions_stmt(resources: Iterable[str]):
+    stmt = insert(ResourceVersion).values([{"resource": resource, "version": 1} for resource in sorted(resources)])
+    return stmt.on_conflict_do_update(
+        index_elements=[ResourceVersion.resource],
+        set_={"version": ResourceVersion.version + 1},
+    )
+
+
+@event.listens_for(RoutingSession, "before_commit")
+def _bump_touched_versions(session: Session) -> None:
+    resources = session.info.pop("touched_resources", None)
+    if resources:
+        session.execute(_bump_versions_stmt(resources))
+
+
+def _versions_stmt(resources: Iterable[str]):
+    return select(ResourceVersion.resource, ResourceVersion.version).where(ResourceVersion.resource.in_(resources))
+
+
+class ResourceVersionRepo:
+    def __init__(self, db: SessionContext):
+        self.db = db
+
+    @reads
+    def get_versions(self, resources: tuple[str, ...]) -> dict[str, int]:
+        # ресурс, який ще жодного разу не змінювали, має версію 0
+        result = self.db.execute(_versions_stmt(resources))
+        return {resource: 0 for resource in resources} | dict(result.all())
+
+ResourceVersionRepoDep = Annotated[ResourceVersionRepo, Depends(ResourceVersionRepo)]
+
+
+class AsyncResourceVersionRepo:
+    def __init__(self, db: AsyncSessionContext):
+        self.db = db
+
+    @reads
+    async def get_versions(self, resources: tuple[str, ...]) -> dict[str, int]:
+        result = await self.db.execute(_versions_stmt(resources))
+        return {resource: 0 for resource in resources} | dict(result.all())
+
+AsyncResourceVersionRepoDep = Annotated[AsyncResourceVersionRepo, Depends(AsyncResourceVersionRepo)]
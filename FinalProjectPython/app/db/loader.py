@@ -0,0 +1,25 @@
+from typing import Iterable
+
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+class IdentityLoader:
+    # DataLoader у межах запиту: сесія живе один запит, тож кеш у db.info зникає разом із нею.
+    # Ще не бачені id вибираються одним IN-запитом, повторні звернення (і відсутні id) - з пам'яті
+    def __init__(self, db: Session | AsyncSession, model):
+        self._cache: dict[int, object | None] = db.info.setdefault(("identity_loader", model), {})
+
+    def missing(self, ids: Iterable[int]) -> set[int]:
+        return set(ids) - self._cache.keys()
+
+    def remember(self, ids: Iterable[int], objects: Iterable) -> None:
+        # ids - усі запитані id; ті, яких немає серед objects, запам'ятовуються як відсутні
+        self._cache.update(dict.fromkeys(ids))
+        self._cache.update({obj.id: obj for obj in objects})
+
+    def forget(self, object_id: int) -> None:
+        self._cache[object_id] = None
+
+    def get_many(self, ids: Iterable[int]) -> dict:
+        return {object_id: obj for object_id in ids if (obj := self._cache.get(object_id)) is not None}
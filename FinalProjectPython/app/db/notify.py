@@ -0,0 +1,97 @@
+import logging
+import select as selectors
+import threading
+from typing import Callable
+
+from sqlalchemy import Engine, event, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.db.routing import RoutingSession
+
+logger = logging.getLogger(__name__)
+
+RECONNECT_DELAY = 5.0  # секунд між спробами перепідключити слухача
+
+
+def notify_on_commit(db: Session | AsyncSession, channel: str, payload: str = "") -> None:
+    # NOTIFY іде в тій самій транзакції: Postgres доставить його лише після коміту, а при rollback - відкине.
+    # Однакові (channel, payload) в одній транзакції Postgres і так доставляє один раз
+    db.info.setdefault("notify", {})[(channel, payload)] = None
+
+
+# усі сповіщення транзакції одним запитом, у порядку виклику notify_on_commit; unnest, а не стовпець
+# на сповіщення, бо масове створення замовлень дає тисячі подій, а стовпців у SELECT не більше 1664
+NOTIFY_STMT = text(
+    "SELECT pg_notify(n.channel, n.payload) "
+    "FROM unnest(CAST(:channels AS text[]), CAST(:payloads AS text[])) AS n(channel, payload)"
+)
+
+
+@event.listens_for(RoutingSession, "before_commit")
+def _send_notifications(session: Session) -> None:
+    notifications = session.info.pop("notify", None)
+    if notifications:
+        channels, payloads = zip(*notifications)
+        session.execute(NOTIFY_STMT, {"channels": list(channels), "payloads": list(payloads)})
+
+
+class NotificationListener:
+    # окреме з'єднання з primary (не з пулу) у фоновому потоці воркера слухає LISTEN-канали, handlers
+    # отримують payload сповіщення; on_connect викликається після кожного (пере)підключення, on_disconnect - після втрати з'єднання:
+    # поки слухача немає, сповіщення можна пропустити, тож кеші, що на них покладаються, мають вимикатися
+    def __init__(
+        self,
+        engine: Engine,
+        handlers: dict[str, Callable[[str], None]],
+        on_connect: Callable[[], None],
+        on_disconnect: Callable[[], None],
+    ):
+        self.engine = engine
+        self.handlers = handlers
+        self.on_connect = on_connect
+        self.on_disconnect = on_disconnect
+        self._stopping = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="notification-listener", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopping.set()
+        self._thread.join()
+
+    def _connect(self):
+        dialect = self.engine.dialect
+        cargs, cparams = dialect.create_connect_args(self.engine.url)
+        connection = dialect.connect(*cargs, **cparams)
+        connection.autocommit = True
+        with connection.cursor() as cursor:
+            for channel in self.handlers:
+                cursor.execute(f'LISTEN "{channel}"')
+        return connection
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            connection = None
+            try:
+                connection = self._connect()
+                self.on_connect()
+                self._listen(connection)
+            except Exception:
+                logger.exception("Notification listener lost its connection")
+            finally:
+                self.on_disconnect()
+                if connection is not None:
+                    connection.close()
+            self._stopping.wait(RECONNECT_DELAY)
+
+    def _listen(self, connection) -> None:
+        while not self._stopping.is_set():
+            # таймаут лише для того, щоб помітити stop()
+            if not selectors.select([connection], [], [], 1.0)[0]:
+                continue
+            connection.poll()
+            while connection.notifies:
+                notification = connection.notifies.pop(0)
+                self.handlers[notification.channel](notification.payload)
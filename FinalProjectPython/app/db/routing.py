@@ -0,0 +1,72 @@
+import inspect
+from contextlib import contextmanager
+from functools import wraps
+
+from sqlalchemy import Engine
+from sqlalchemy.orm import Session
+
+
+class RoutingSession(Session):
+    # запити з методів @reads йдуть на репліку, поки сесія нічого не записала;
+    # усе інше (записи, lazy-load, читання після запису) - на primary
+    def __init__(self, primary: Engine, replica: Engine | None = None, **kwargs):
+        super().__init__(**kwargs)
+        self.primary = primary
+        self.replica = replica
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self.replica is not None and self.info.get("reading") and not self.info.get("primary_only"):
+            return self.replica
+        return self.primary
+
+
+def pin_to_primary(db) -> None:
+    db.info["primary_only"] = True
+
+
+@contextmanager
+def _reading(db):
+    previous = db.info.get("reading", False)
+    db.info["reading"] = True
+    try:
+        yield
+    finally:
+        db.info["reading"] = previous
+
+
+def reads(method):
+    if inspect.iscoroutinefunction(method):
+        @wraps(method)
+        async def async_wrapper(self, *args, **kwargs):
+            with _reading(self.db):
+                return await method(self, *args, **kwargs)
+        return async_wrapper
+
+    if inspect.isgeneratorfunction(method):
+        # потокове читання: сесія лишається на репліці, поки генератор не вичерпано
+        @wraps(method)
+        def generator_wrapper(self, *args, **kwargs):
+            with _reading(self.db):
+                yield from method(self, *args, **kwargs)
+        return generator_wrapper
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with _reading(self.db):
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+def writes(method):
+    if inspect.iscoroutinefunction(method):
+        @wraps(method)
+        async def async_wrapper(self, *args, **kwargs):
+            pin_to_primary(self.db)
+            return await method(self, *args, **kwargs)
+        return async_wrapper
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        pin_to_primary(self.db)
+        return method(self, *args, **kwargs)
+    return wrapper
@@ -0,0 +1,40 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from sqlalchemy import Engine, event
+
+
+class StatementCounter:
+    def __init__(self):
+        self.count = 0
+
+
+_current_counter: ContextVar[StatementCounter | None] = ContextVar("statement_counter", default=None)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _count_statement(conn, cursor, statement, parameters, context, executemany):
+    counter = _current_counter.get()
+    if counter is not None:
+        counter.count += 1
+
+
+@contextmanager
+def count_statements():
+    # рахує SQL-запити всіх engine (sync і async) у поточному контексті, включно з threadpool
+    counter = StatementCounter()
+    token = _current_counter.set(counter)
+    try:
+        yield counter
+    finally:
+        _current_counter.reset(token)
+
+
+@contextmanager
+def assert_statements(expected: int):
+    # для тестів: блок має виконати рівно expected SQL-запитів. N+1 або новий зайвий запит ламає тест,
+    # а не лише бюджет CAFE_SQL_STATEMENT_BUDGET у проді
+    with count_statements() as counter:
+        yield counter
+    if counter.count != expected:
+        raise AssertionError(f"expected {expected} SQL statements, executed {counter.count}")
@@ -1,20 +1,112 @@
-from fastapi import FastAPI
-from app.controllers.category_dish import router as category_dish_router
-from app.controllers.dish import router as dish_router
-from app.controllers.order import router as order_router
-from app.controllers.order_item import router as order_item_router
-from app.controllers.promotion import router as promotion_router
-from app.controllers.cafe_table import router as cafe_table_router
-
-
-app = FastAPI(title="Cafe menagment API")
-app.include_router(category_dish_router)
-app.include_router(dish_router)
-app.include_router(order_router)
-app.include_router(order_item_router)
-app.include_router(promotion_router)
-app.include_router(cafe_table_router)
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, APIRouter, Request
+from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.db import engine, replica_engine, async_engine, async_replica_engine
+from app.db.notify import NotificationListener
+from app.db.pool import pool_stats, warm_up, warm_up_async
+from app.db.statements import count_statements
+from app.controllers.category_dish import router as category_dish_router, async_router as async_category_dish_router
+from app.controllers.dish import router as dish_router, async_router as async_dish_router
+from app.controllers.order import router as order_router, async_router as async_order_router
+from app.controllers.order_item import router as order_item_router, async_router as async_order_item_router
+from app.controllers.promotion import router as promotion_router, async_router as async_promotion_router
+from app.controllers.cafe_table import router as cafe_table_router, async_router as async_cafe_table_router
+from app.controllers.menu import router as menu_router, async_router as async_menu_router
+from app.core.menu_cache import MENU_CHANNEL, menu_cache, invalidate_menu
+from app.core.order_events import ORDER_EVENTS_CHANNEL, order_event_hub
+from app.core.prep_board import prep_board
+
+
+def _order_event(payload: str) -> None:
+    order_event_hub.dispatch(payload)
+    prep_board.apply(payload)
+
+
+def _listener_connected() -> None:
+    menu_cache.activate()
+    order_event_hub.reset()
+    prep_board.activate()
+
+
+def _listener_disconnected() -> None:
+    menu_cache.deactivate()
+    order_event_hub.reset()
+    prep_board.deactivate()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.pool_warm_up:
+        for sync_engine in (engine, replica_engine):
+            if sync_engine is not None:
+                await run_in_threadpool(warm_up, sync_engine, settings.pool_size)
+        for aio_engine in (async_engine, async_replica_engine):
+            if aio_engine is not None:
+                await warm_up_async(aio_engine, settings.pool_size)
+    # NOTIFY доставляється лише з primary, тож слухаємо його навіть при читанні з репліки
+    listener = NotificationListener(
+        engine,
+        {
+            MENU_CHANNEL: lambda payload: invalidate_menu(),
+            ORDER_EVENTS_CHANNEL: _order_event,
+        },
+        on_connect=_listener_connected,
+        on_disconnect=_listener_disconnected,
+    )
+    listener.start()
+    yield
+    await run_in_threadpool(listener.stop)
+
+
+app = FastAPI(title="Cafe menagment API", lifespan=lifespan)
+
+
+if settings.sql_statement_budget is not None:
+    @app.middleware("http")
+    async def enforce_sql_statement_budget(request: Request, call_next):
+        with count_statements() as counter:
+            response = await call_next(request)
+        if counter.count > settings.sql_statement_budget:
+            return JSONResponse(
+                status_code=500,
+                content={"detail": f"{request.method} {request.url.path} executed {counter.count} SQL statements, "
+                                   f"budget is {settings.sql_statement_budget}"},
+            )
+        response.headers["X-SQL-Statements"] = str(counter.count)
+        return response
+
+
+def include_router(router: APIRouter, async_router: APIRouter) -> None:
+    # async-версія маршруту замінює sync-версію на тому ж місці, тож порядок маршрутів зберігається,
+    # а маршрути без async-версії й далі працюють через sync-сесію
+    if settings.use_async:
+        async_routes = {(route.path, frozenset(route.methods)): route for route in async_router.routes}
+        router.routes = [async_routes.get((route.path, frozenset(route.methods)), route) for route in router.routes]
+    app.include_router(router)
+
+
+include_router(category_dish_router, async_category_dish_router)
+include_router(dish_router, async_dish_router)
+include_router(order_router, async_order_router)
+include_router(order_item_router, async_order_item_router)
+include_router(promotion_router, async_promotion_router)
+include_router(cafe_table_router, async_cafe_table_router)
+include_router(menu_router, async_menu_router)
 
 @app.get("/")
 def root():
     return {"message": "Cafe API is running!"}
+
+@app.get("/db/pool")
+def get_pool_stats():
+    engines = {
+        "sync": engine,
+        "sync_replica": replica_engine,
+        "async": async_engine,
+        "async_replica": async_replica_engine,
+    }
+    return {name: pool_stats(e) for name, e in engines.items() if e is not None}
@@ -1,7 +1,7 @@
 from datetime import date, datetime, time
 from typing import List, Optional
 
-from sqlalchemy import String, ForeignKey, Date, Integer, Time, Boolean
+from sqlalchemy import String, ForeignKey, Date, Integer, BigInteger, Time, Boolean, Index, Computed, UniqueConstraint, LargeBinary, Text, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base
@@ -33,6 +33,9 @@ class Dish(Base):
 
 class Promotion(Base):
     __tablename__ = "promotions"
+    __table_args__ = (
+        Index("ix_promotions_valid_to_valid_from", "valid_to", "valid_from"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     description: Mapped[str] = mapped_column(String(255), nullable=False)
@@ -51,27 +54,49 @@ class PromotionDishAssociation(Base):
     __tablename__ = "promotion_dish_association"
 
     promotion_id: Mapped[int] = mapped_column(ForeignKey("promotions.id"), primary_key=True)
-    dish_id: Mapped[int] = mapped_column(ForeignKey("dishes.id"), primary_key=True)
+    dish_id: Mapped[int] = mapped_column(ForeignKey("dishes.id"), primary_key=True, index=True)
+
+ORDER_TOTAL_EXPRESSION = "round(greatest(subtotal - discount, 0)::numeric, 2)::float8"
 
 class Order(Base):
     __tablename__ = "orders"
+    __table_args__ = (
+        # не більше одного активного замовлення на стіл; також індекс для is_table_occupied і get_active_orders
+        Index("uq_orders_table_id_active", "table_id", unique=True, postgresql_where=text("is_completed = false")),
+    )
+    # total рахує база: INSERT/UPDATE повертають його через RETURNING замість окремого lazy-load
+    __mapper_args__ = {"eager_defaults": True}
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     table_id: Mapped[int] = mapped_column(ForeignKey("cafe_tables.id"), nullable=True)
-    created_at: Mapped[datetime] = mapped_column(default=datetime.utcnow, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(default=datetime.utcnow, nullable=False, index=True)
     is_completed: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+    # суми ведуться інкрементально при зміні позицій; знижка - та, що діяла, коли позиції додавали
+    subtotal: Mapped[float] = mapped_column(default=0.0, server_default="0", nullable=False)
+    discount: Mapped[float] = mapped_column(default=0.0, server_default="0", nullable=False)
+    total: Mapped[float] = mapped_column(Computed(ORDER_TOTAL_EXPRESSION))
 
     items: Mapped[List["OrderItem"]] = relationship("OrderItem", back_populates="order", cascade="all, delete")
     table: Mapped["CafeTable"] = relationship("CafeTable")  # <-- об'єкт тут
 
 class OrderItem(Base):
     __tablename__ = "order_items"
+    __table_args__ = (
+        # одна позиція на страву в замовленні; індекс також обслуговує пошук позицій за order_id
+        UniqueConstraint("order_id", "dish_id", name="uq_order_items_order_id_dish_id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     order_id: Mapped[int] = mapped_column(ForeignKey("orders.id"))
-    dish_id: Mapped[int] = mapped_column(ForeignKey("dishes.id"))
+    dish_id: Mapped[int] = mapped_column(ForeignKey("dishes.id"), index=True)
     quantity: Mapped[int] = mapped_column(default=1, nullable=False)
     price_at_order: Mapped[float] = mapped_column(nullable=False)
+    discount: Mapped[float] = mapped_column(default=0.0, server_default="0", nullable=False)  # знижка на всю позицію
+    # коли страву вперше додали в замовлення; повторне додавання лише збільшує quantity.
+    # server_default - для вставок в обхід ORM, час у UTC, як і datetime.utcnow
+    created_at: Mapped[datetime] = mapped_column(
+        default=datetime.utcnow, server_default=text("timezone('utc', now())"), nullable=False
+    )
 
     order: Mapped["Order"] = relationship("Order", back_populates="items")
     dish: Mapped["Dish"] = relationship("Dish")
@@ -84,3 +109,21 @@ class CafeTable(Base):
     location:Mapped[str] = mapped_column(String(255), nullable=True)
     orders: Mapped[List["Order"]] = relationship("Order", back_populates="table")
 
+class ResourceVersion(Base):
+    # лічильник змін на ресурс (dishes, categories, promotions, tables) для ETag;
+    # збільшується в тій самій транзакції, що й зміна
+    __tablename__ = "resource_versions"
+
+    resource: Mapped[str] = mapped_column(String(50), primary_key=True)
+    version: Mapped[int] = mapped_column(BigInteger, nullable=False, server_default="0")
+
+class IdempotencyKey(Base):
+    # відповідь на запит з Idempotency-Key; пишеться в тій самій транзакції, що й сам запис,
+    # тож повтор або бачить закомічену відповідь, або чекає на транзакцію першого запиту
+    __tablename__ = "idempotency_keys"
+
+    endpoint: Mapped[str] = mapped_column(String(100), primary_key=True)
+    key: Mapped[str] = mapped_column(String(255), primary_key=True)
+    fingerprint: Mapped[bytes] = mapped_column(LargeBinary(16), nullable=False)  # хеш тіла запиту
+    response: Mapped[Optional[str]] = mapped_column(Text, nullable=True)  # NULL, доки транзакція не завершила роботу
+    created_at: Mapped[datetime] = mapped_column(nullable=False, index=True)
@@ -1,3 +1,4 @@
+from datetime import datetime
 from pydantic import BaseModel
 from typing import Optional
 from pydantic_settings import SettingsConfigDict
@@ -17,3 +18,12 @@ class CafeTableResponse(CafeTableBase):
     id: int
 
     model_config = SettingsConfigDict(from_attributes=True)
+
+
+class TableFloorStatus(CafeTableBase):
+    # стіл і його активне замовлення; для вільного столу поля замовлення - None, item_count - 0
+    id: int
+    order_id: Optional[int]
+    opened_at: Optional[datetime]
+    item_count: int
+    total: Optional[float]
@@ -0,0 +1,23 @@
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class MenuDish(BaseModel):
+    id: int
+    name: str
+    description: Optional[str] = None
+    price: float
+    discount_percent: int  # сума активних зараз акцій на страву
+    effective_price: float
+
+class MenuCategory(BaseModel):
+    id: int
+    name: str
+    description: Optional[str] = None
+    dishes: List[MenuDish]
+
+class MenuResponse(BaseModel):
+    generated_at: datetime
+    categories: List[MenuCategory]
@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import List, Literal, Optional
 from datetime import datetime
 from pydantic import BaseModel
 from pydantic_settings import SettingsConfigDict
@@ -11,6 +11,12 @@ class OrderBase(BaseModel):
 class OrderCreate(OrderBase):
     items: List[OrderItemCreate]
 
+class OrderBulkItem(OrderCreate):
+    is_completed: bool = False  # замовлення, яке термінал уже закрив, поки був офлайн
+
+class OrderBulkCreate(BaseModel):
+    orders: List[OrderBulkItem]
+
 class OrderUpdate(BaseModel):
     table_id: Optional[int] = None
     is_completed: Optional[bool] = None
@@ -19,7 +25,64 @@ class OrderResponse(OrderBase):
     id: int
     created_at: datetime
     is_completed: Optional[bool]
+    subtotal: float
+    discount: float
+    total: float
     items: List[OrderItemResponse]
     table: Optional[CafeTableResponse]
 
     model_config = SettingsConfigDict(from_attributes=True)
+
+
+class OrderTotal(BaseModel):
+    order_id: int
+    subtotal: float
+    discount: float
+    total: float
+
+class OrderTotalsMismatch(BaseModel):
+    order_id: int
+    subtotal: float
+    discount: float
+    expected_subtotal: float
+    expected_discount: float
+
+class OrderTotalsCheck(BaseModel):
+    repaired: bool
+    mismatches: List[OrderTotalsMismatch]
+
+class OrderSummaryBucket(BaseModel):
+    period_start: datetime
+    order_count: int
+    item_count: int
+    revenue: float
+    average_ticket: float
+
+class OrderPeriodSummary(BaseModel):
+    start: datetime
+    end: datetime
+    order_count: int
+    item_count: int
+    revenue: float  # сума quantity * price_at_order, без знижок акцій
+    average_ticket: float
+    buckets: List[OrderSummaryBucket]  # порожній, якщо групування не задано
+
+
+class PrepBoardDish(BaseModel):
+    dish_id: int
+    name: Optional[str]
+    quantity: int  # одиниць страви у відкритих замовленнях
+    order_count: int
+    oldest_item_at: datetime
+
+
+class OrderBulkResult(BaseModel):
+    index: int  # позиція замовлення в запиті
+    status: Literal["created", "rejected"]
+    order_id: Optional[int] = None
+    detail: Optional[str] = None
+
+class OrderBulkResponse(BaseModel):
+    created: int
+    rejected: int
+    results: List[OrderBulkResult]
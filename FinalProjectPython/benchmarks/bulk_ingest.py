@@ -0,0 +1,56 @@
+"""Швидкість завантаження офлайн-замовлень: один POST /orders/bulk проти POST /orders/ по одному.
+
+Обидва способи завантажують по --orders відкритих замовлень на --items позицій, кожне на власний стіл,
+і друкують час, кількість SQL-запитів і замовлень за секунду.
+
+    CAFE_BENCH_DATABASE_URL=postgresql://... python -m benchmarks.bulk_ingest --orders 500 --items 4
+"""
+import argparse
+import time
+
+from benchmarks.common import check, count_sql, reset_database, seed_menu
+
+
+def report(label: str, orders: int, elapsed: float, counts: dict) -> str:
+    return f"{label:<22} {elapsed:7.2f} s  {counts['statements']:>6} stmts  {orders / elapsed:8.0f} orders/s"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--orders", type=int, default=500)
+    parser.add_argument("--items", type=int, default=4)
+    args = parser.parse_args()
+
+    reset_database()
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    with TestClient(app) as client:
+        menu = seed_menu(client, dishes=max(args.items, 20), tables=2 * args.orders + 1)
+        items = [{"dish_id": dish_id, "order_id": 0, "quantity": 2} for dish_id in menu["dish_ids"][:args.items]]
+        # перше замовлення прогріває пул з'єднань і кеші, у вимір не входить
+        check(client.post("/orders/", json={"table_id": menu["table_ids"][-1], "items": items}))
+        bulk_tables, sequential_tables = menu["table_ids"][:args.orders], menu["table_ids"][args.orders:-1]
+
+        batch = {"orders": [{"table_id": table_id, "items": items} for table_id in bulk_tables]}
+        with count_sql() as bulk_counts:
+            started = time.perf_counter()
+            result = check(client.post("/orders/bulk", json=batch))
+            bulk_elapsed = time.perf_counter() - started
+        if result["created"] != args.orders:
+            raise SystemExit(f"bulk ingest rejected {result['rejected']} orders")
+
+        with count_sql() as sequential_counts:
+            started = time.perf_counter()
+            for table_id in sequential_tables:
+                check(client.post("/orders/", json={"table_id": table_id, "items": items}))
+            sequential_elapsed = time.perf_counter() - started
+
+    print(f"{args.orders} orders x {args.items} items")
+    print(report("POST /orders/bulk", args.orders, bulk_elapsed, bulk_counts))
+    print(report("POST /orders/ x N", args.orders, sequential_elapsed, sequential_counts))
+
+
+if __name__ == "__main__":
+    main()
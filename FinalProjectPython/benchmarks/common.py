@@ -0,0 +1,85 @@
+import os
+import statistics
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# бенчмарки наповнюють і очищають базу, тож працюють лише з окремою, явно вказаною базою
+BENCH_DATABASE_URL = os.environ.get("CAFE_BENCH_DATABASE_URL")
+if not BENCH_DATABASE_URL:
+    sys.exit("set CAFE_BENCH_DATABASE_URL to a disposable PostgreSQL database")
+# до імпорту app: engine створюються з налаштувань під час імпорту
+os.environ["CAFE_DATABASE_URL"] = BENCH_DATABASE_URL
+os.environ.pop("CAFE_REPLICA_DATABASE_URL", None)
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+
+def reset_database() -> None:
+    # схема - до head, дані - порожні; id знову починаються з 1
+    from alembic import command
+    from alembic.config import Config
+    from sqlalchemy import create_engine, text
+
+    from app.models.base import Base
+
+    config = Config(str(PROJECT_ROOT / "alembic.ini"))
+    config.set_main_option("script_location", str(PROJECT_ROOT / "persistence"))
+    command.upgrade(config, "head")
+    tables = ", ".join(f'"{table.name}"' for table in Base.metadata.sorted_tables)
+    engine = create_engine(BENCH_DATABASE_URL)
+    with engine.begin() as conn:
+        conn.execute(text(f"TRUNCATE {tables} RESTART IDENTITY CASCADE"))
+    engine.dispose()
+
+
+def check(response, status_code: int = 200):
+    if response.status_code != status_code:
+        sys.exit(f"{response.request.method} {response.request.url} -> {response.status_code}: {response.text}")
+    return response.json()
+
+
+def seed_menu(client, dishes: int = 20, tables: int = 50) -> dict:
+    # через API, тож ті самі скрипти можна запустити і на старішому коміті, щоб отримати число "до"
+    category = check(client.post("/categories/", json={"name": "Bench", "description": "bench"}))
+    dish_ids = [
+        check(client.post("/dishes/", json={"name": f"Dish {n}", "price": 5 + n, "category_id": category["id"]}))["id"]
+        for n in range(dishes)
+    ]
+    table_ids = [check(client.post("/tables/", json={"number": n + 1}))["id"] for n in range(tables)]
+    return {"category_id": category["id"], "dish_ids": dish_ids, "table_ids": table_ids}
+
+
+@contextmanager
+def count_sql():
+    # слухач на класі Engine бачить і sync engine, і sync_engine async-стеку, і є в будь-якій версії app
+    counts = {"statements": 0, "commits": 0}
+
+    def on_execute(conn, cursor, statement, parameters, context, executemany):
+        counts["statements"] += 1
+
+    def on_commit(conn):
+        counts["commits"] += 1
+
+    event.listen(Engine, "before_cursor_execute", on_execute)
+    event.listen(Engine, "commit", on_commit)
+    try:
+        yield counts
+    finally:
+        event.remove(Engine, "before_cursor_execute", on_execute)
+        event.remove(Engine, "commit", on_commit)
+
+
+def percentile(samples: list[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def describe_ms(samples: list[float]) -> str:
+    return (
+        f"mean {statistics.mean(samples) * 1000:.2f} ms, p50 {percentile(samples, 0.5) * 1000:.2f} ms, "
+        f"p95 {percentile(samples, 0.95) * 1000:.2f} ms"
+    )
@@ -0,0 +1,51 @@
+"""SQL-запити і час POST /orders/ залежно від кількості позицій у замовленні.
+
+Створює по --repeats замовлень на 1, 5, 10 і 20 позицій (кожне на вільному столі) і друкує середню кількість
+statements і COMMIT на запит та час запиту. Стек - як у застосунку, CAFE_USE_ASYNC=true міряє async-маршрути.
+
+    CAFE_BENCH_DATABASE_URL=postgresql://... python -m benchmarks.order_round_trips
+"""
+import argparse
+import time
+
+from benchmarks.common import check, count_sql, describe_ms, reset_database, seed_menu
+
+SIZES = (1, 5, 10, 20)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    reset_database()
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    with TestClient(app) as client:
+        menu = seed_menu(client, dishes=max(SIZES), tables=len(SIZES) * args.repeats + 1)
+        tables = iter(menu["table_ids"])
+
+        def place(size: int) -> dict:
+            items = [{"dish_id": dish_id, "order_id": 0, "quantity": 2} for dish_id in menu["dish_ids"][:size]]
+            return check(client.post("/orders/", json={"table_id": next(tables), "items": items}))
+
+        # перше замовлення прогріває пул з'єднань і кеші, у вимір не входить
+        place(1)
+        print(f"{'items':>5}  {'statements':>10}  {'commits':>7}  time")
+        for size in SIZES:
+            durations = []
+            with count_sql() as counts:
+                for _ in range(args.repeats):
+                    started = time.perf_counter()
+                    place(size)
+                    durations.append(time.perf_counter() - started)
+            print(
+                f"{size:>5}  {counts['statements'] / args.repeats:>10.1f}  {counts['commits'] / args.repeats:>7.1f}  "
+                f"{describe_ms(durations)}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Час GET /orders/{id}/total при великій кількості акцій, поруч із GET /orders/{id} як базою.
+
+Створює --promotions акцій (половина діє сьогодні, половина вже закінчилася) по кілька страв у кожній
+і замовлення на 5 позицій, тоді --repeats разів запитує суму і саме замовлення.
+
+    CAFE_BENCH_DATABASE_URL=postgresql://... python -m benchmarks.order_total --promotions 300
+"""
+import argparse
+import random
+import time
+from datetime import date, timedelta
+
+from benchmarks.common import check, count_sql, describe_ms, reset_database, seed_menu
+
+DISHES_PER_PROMOTION = 3
+
+
+def measure(client, path: str, repeats: int) -> str:
+    durations = []
+    with count_sql() as counts:
+        for _ in range(repeats):
+            started = time.perf_counter()
+            check(client.get(path))
+            durations.append(time.perf_counter() - started)
+    return f"{path:<18} {counts['statements'] / repeats:5.1f} stmts  {describe_ms(durations)}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--promotions", type=int, default=300)
+    parser.add_argument("--repeats", type=int, default=200)
+    args = parser.parse_args()
+
+    reset_database()
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    today = date.today()
+    rnd = random.Random(0)
+    with TestClient(app) as client:
+        menu = seed_menu(client, tables=1)
+        for n in range(args.promotions):
+            # непарні вже закінчилися: їх теж треба відкинути під час розрахунку
+            valid_to = today + timedelta(days=30) if n % 2 == 0 else today - timedelta(days=1)
+            check(client.post("/promotions/", json={
+                "description": f"Promotion {n}",
+                "discount_percent": rnd.randint(1, 10),
+                "valid_from": (today - timedelta(days=60)).isoformat(),
+                "valid_to": valid_to.isoformat(),
+                "dish_ids": rnd.sample(menu["dish_ids"], DISHES_PER_PROMOTION),
+            }))
+        items = [{"dish_id": dish_id, "order_id": 0, "quantity": 2} for dish_id in menu["dish_ids"][:5]]
+        order = check(client.post("/orders/", json={"table_id": menu["table_ids"][0], "items": items}))
+
+        # перші запити прогрівають пул з'єднань і кеші, у вимір не входять
+        for path in (f"/orders/{order['id']}/total", f"/orders/{order['id']}"):
+            check(client.get(path))
+        print(f"{args.promotions} promotions, {args.repeats} requests each")
+        print(measure(client, f"/orders/{order['id']}/total", args.repeats))
+        print(measure(client, f"/orders/{order['id']}", args.repeats))
+
+
+if __name__ == "__main__":
+    main()
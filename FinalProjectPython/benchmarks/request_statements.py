@@ -0,0 +1,70 @@
+"""Кількість SQL-запитів і COMMIT на запит для основних ендпоінтів, що змінюють дані, і GET /orders/{id}.
+
+Проходить сценарій (меню, стіл, замовлення, позиції, перенесення, закриття, видалення) двічі і друкує
+лічильники другого проходу, коли пул з'єднань і кеші вже прогріті. CAFE_USE_ASYNC=true міряє async-маршрути.
+
+    CAFE_BENCH_DATABASE_URL=postgresql://... python -m benchmarks.request_statements
+"""
+from benchmarks.common import check, count_sql, reset_database
+
+MISSING = object()
+
+
+def path(template: str, entity_id):
+    return MISSING if entity_id is MISSING else template.format(entity_id)
+
+
+def scenario(client, round_no: int):
+    # кожен прохід створює власні сутності, тож стан першого проходу не заважає другому
+    state = {}
+
+    def step(label: str, method: str, path: str, body: dict | None = None, key: str | None = None):
+        # старіші коміти мають власні помилки; запит, що впав, і залежні від нього кроки лише позначаються
+        if MISSING in (path, *(body or {}).values()):
+            return label, None, "skipped"
+        with count_sql() as counts:
+            response = client.request(method, path, json=body)
+        if key:
+            state[key] = response.json()["id"] if response.status_code == 200 else MISSING
+        return label, counts, response.status_code
+
+    category = f"Bench {round_no}"
+    yield step("POST /categories/", "POST", "/categories/", {"name": category, "description": "bench"}, "category")
+    dish = {"name": f"Tea {round_no}", "price": 10, "category_id": state["category"]}
+    yield step("POST /dishes/", "POST", "/dishes/", dish, "dish")
+    yield step("PUT  /dishes/{id}", "PUT", path("/dishes/{}", state["dish"]), {"price": 12})
+    yield step("POST /tables/", "POST", "/tables/", {"number": 2 * round_no + 1}, "table")
+    check(client.post("/tables/", json={"number": 2 * round_no + 2}))
+    spare_table = state["table"] + 1 if state["table"] is not MISSING else MISSING
+    order = {"table_id": state["table"], "items": [{"dish_id": state["dish"], "order_id": 0, "quantity": 1}]}
+    yield step("POST /orders/", "POST", "/orders/", order, "order")
+    spare_dish = check(client.post("/dishes/", json={**dish, "name": f"Cake {round_no}"}))["id"]
+    item = {"order_id": state["order"], "dish_id": spare_dish, "quantity": 2}
+    yield step("POST /order-items/", "POST", "/order-items/", item, "item")
+    yield step("PUT  /order-items/{id}", "PUT", path("/order-items/{}", state["item"]), {"quantity": 3})
+    yield step("GET  /orders/{id}", "GET", path("/orders/{}", state["order"]))
+    yield step("PUT  /orders/{id}", "PUT", path("/orders/{}", state["order"]), {"table_id": spare_table})
+    yield step("DELETE /order-items/{id}", "DELETE", path("/order-items/{}", state["item"]))
+    yield step("PUT  /orders/{id}/complete", "PUT", path("/orders/{}/complete", state["order"]))
+    yield step("DELETE /orders/{id}", "DELETE", path("/orders/{}", state["order"]))
+    yield step("DELETE /dishes/{id}", "DELETE", f"/dishes/{spare_dish}")
+
+
+def main():
+    reset_database()
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    with TestClient(app, raise_server_exceptions=False) as client:
+        list(scenario(client, 0))
+        print(f"{'request':<28} {'statements':>10} {'commits':>7}")
+        for label, counts, status in scenario(client, 1):
+            if status != 200:
+                print(f"{label:<28} {status}")
+            else:
+                print(f"{label:<28} {counts['statements']:>10} {counts['commits']:>7}")
+
+
+if __name__ == "__main__":
+    main()
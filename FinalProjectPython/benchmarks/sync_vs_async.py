@@ -0,0 +1,115 @@
+"""Пропускна здатність sync- і async-стеку (CAFE_USE_ASYNC) під однаковим навантаженням.
+
+Для кожного режиму піднімає uvicorn з одним воркером, наповнює базу через API і протягом --duration секунд
+шле запити з --concurrency одночасних клієнтів: 70% GET /orders/{id}, 20% GET /orders/active/,
+10% POST /order-items/. Друкує запити за секунду і затримки.
+
+    CAFE_BENCH_DATABASE_URL=postgresql://... python -m benchmarks.sync_vs_async --duration 20 --concurrency 64
+"""
+import argparse
+import asyncio
+import os
+import random
+import subprocess
+import sys
+import time
+
+import httpx
+
+from benchmarks.common import BENCH_DATABASE_URL, PROJECT_ROOT, check, percentile, reset_database, seed_menu
+
+ITEMS_PER_ORDER = 3
+
+
+def start_server(use_async: bool, port: int) -> subprocess.Popen:
+    env = {**os.environ, "CAFE_DATABASE_URL": BENCH_DATABASE_URL, "CAFE_USE_ASYNC": str(use_async).lower()}
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=PROJECT_ROOT,
+        env=env,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/", timeout=1)
+            return server
+        except httpx.TransportError:
+            time.sleep(0.2)
+    server.kill()
+    sys.exit("uvicorn did not start")
+
+
+def seed(base_url: str) -> tuple[list[int], list[int]]:
+    with httpx.Client(base_url=base_url, timeout=30) as client:
+        menu = seed_menu(client)
+        order_ids = []
+        for table_id in menu["table_ids"]:
+            items = [
+                {"dish_id": dish_id, "order_id": 0, "quantity": 1}
+                for dish_id in random.sample(menu["dish_ids"], ITEMS_PER_ORDER)
+            ]
+            order_ids.append(check(client.post("/orders/", json={"table_id": table_id, "items": items}))["id"])
+    return order_ids, menu["dish_ids"]
+
+
+async def load(base_url: str, order_ids: list[int], dish_ids: list[int], duration: float, concurrency: int):
+    latencies: list[float] = []
+    errors = 0
+    deadline = time.monotonic() + duration
+
+    async def worker(client: httpx.AsyncClient):
+        nonlocal errors
+        rnd = random.Random()
+        while time.monotonic() < deadline:
+            roll = rnd.random()
+            started = time.perf_counter()
+            if roll < 0.7:
+                response = await client.get(f"/orders/{rnd.choice(order_ids)}")
+            elif roll < 0.9:
+                response = await client.get("/orders/active/")
+            else:
+                body = {"order_id": rnd.choice(order_ids), "dish_id": rnd.choice(dish_ids), "quantity": 1}
+                response = await client.post("/order-items/", json=body)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code != 200:
+                errors += 1
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    return latencies, errors, elapsed
+
+
+def run(use_async: bool, args) -> str:
+    reset_database()
+    server = start_server(use_async, args.port)
+    try:
+        base_url = f"http://127.0.0.1:{args.port}"
+        order_ids, dish_ids = seed(base_url)
+        latencies, errors, elapsed = asyncio.run(load(base_url, order_ids, dish_ids, args.duration, args.concurrency))
+    finally:
+        server.terminate()
+        server.wait()
+    return (
+        f"{'async' if use_async else 'sync':5}  {len(latencies) / elapsed:8.1f} req/s  "
+        f"p50 {percentile(latencies, 0.5) * 1000:7.1f} ms  p95 {percentile(latencies, 0.95) * 1000:7.1f} ms  "
+        f"p99 {percentile(latencies, 0.99) * 1000:7.1f} ms  errors {errors}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--modes", nargs="+", choices=("sync", "async"), default=["sync", "async"])
+    args = parser.parse_args()
+    results = [run(mode == "async", args) for mode in args.modes]
+    print(f"{args.concurrency} concurrent clients, {args.duration:.0f} s per mode")
+    print("\n".join(results))
+
+
+if __name__ == "__main__":
+    main()
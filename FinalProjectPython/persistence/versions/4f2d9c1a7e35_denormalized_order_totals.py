@@ -0,0 +1,63 @@
+"""denormalized order totals
+
+Revision ID: 4f2d9c1a7e35
+Revises: b98c4767f63f
+Create Date: 2026-10-18 13:40:05.127733
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4f2d9c1a7e35'
+down_revision: Union[str, None] = 'b98c4767f63f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('order_items', sa.Column('discount', sa.Float(), server_default='0', nullable=False))
+    op.add_column('orders', sa.Column('subtotal', sa.Float(), server_default='0', nullable=False))
+    op.add_column('orders', sa.Column('discount', sa.Float(), server_default='0', nullable=False))
+    op.add_column('orders', sa.Column(
+        'total', sa.Float(),
+        sa.Computed('round(greatest(subtotal - discount, 0)::numeric, 2)::float8'),
+        nullable=False,
+    ))
+    # існуючим позиціям - знижка за акціями, що діють зараз (час у UTC, як у застосунку)
+    op.execute("""
+        UPDATE order_items SET discount = price_at_order * quantity * d.discount_percent / 100.0
+        FROM (
+            SELECT oi.id, sum(p.discount_percent) AS discount_percent
+            FROM order_items oi
+            JOIN promotion_dish_association pda ON pda.dish_id = oi.dish_id
+            JOIN promotions p ON p.id = pda.promotion_id
+            WHERE p.valid_from <= (now() AT TIME ZONE 'utc')::date
+              AND p.valid_to >= (now() AT TIME ZONE 'utc')::date
+              AND (p.start_time IS NULL OR p.start_time <= (now() AT TIME ZONE 'utc')::time)
+              AND (p.end_time IS NULL OR p.end_time >= (now() AT TIME ZONE 'utc')::time)
+            GROUP BY oi.id
+        ) d
+        WHERE order_items.id = d.id
+    """)
+    op.execute("""
+        UPDATE orders SET subtotal = s.subtotal, discount = s.discount
+        FROM (
+            SELECT order_id, sum(price_at_order * quantity) AS subtotal, sum(discount) AS discount
+            FROM order_items
+            GROUP BY order_id
+        ) s
+        WHERE orders.id = s.order_id
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('orders', 'total')
+    op.drop_column('orders', 'discount')
+    op.drop_column('orders', 'subtotal')
+    op.drop_column('order_items', 'discount')
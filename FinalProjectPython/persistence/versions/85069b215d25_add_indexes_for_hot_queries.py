@@ -0,0 +1,43 @@
+"""add indexes for hot queries
+
+Revision ID: 85069b215d25
+Revises: 23271ce67523
+Create Date: 2026-10-18 10:12:41.318205
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '85069b215d25'
+down_revision: Union[str, None] = '23271ce67523'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(op.f('ix_order_items_order_id'), 'order_items', ['order_id'], unique=False)
+    op.create_index(op.f('ix_order_items_dish_id'), 'order_items', ['dish_id'], unique=False)
+    op.create_index(op.f('ix_orders_created_at'), 'orders', ['created_at'], unique=False)
+    op.create_index(
+        'ix_orders_table_id_active', 'orders', ['table_id'], unique=False,
+        postgresql_where=sa.text('is_completed = false'),
+    )
+    op.create_index('ix_promotions_valid_to_valid_from', 'promotions', ['valid_to', 'valid_from'], unique=False)
+    op.create_index(
+        op.f('ix_promotion_dish_association_dish_id'), 'promotion_dish_association', ['dish_id'], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_promotion_dish_association_dish_id'), table_name='promotion_dish_association')
+    op.drop_index('ix_promotions_valid_to_valid_from', table_name='promotions')
+    op.drop_index('ix_orders_table_id_active', table_name='orders', postgresql_where=sa.text('is_completed = false'))
+    op.drop_index(op.f('ix_orders_created_at'), table_name='orders')
+    op.drop_index(op.f('ix_order_items_dish_id'), table_name='order_items')
+    op.drop_index(op.f('ix_order_items_order_id'), table_name='order_items')
@@ -0,0 +1,36 @@
+"""order item created_at
+
+Revision ID: a4c6e19d3b57
+Revises: e5a7b2c94d18
+Create Date: 2026-10-18 17:05:12.604318
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4c6e19d3b57'
+down_revision: Union[str, None] = 'e5a7b2c94d18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('order_items', sa.Column(
+        'created_at', sa.DateTime(), server_default=sa.text("timezone('utc', now())"), nullable=False
+    ))
+    # час додавання існуючих позицій невідомий - беремо час створення їхнього замовлення
+    op.execute("""
+        UPDATE order_items SET created_at = orders.created_at
+        FROM orders
+        WHERE orders.id = order_items.order_id
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('order_items', 'created_at')
@@ -0,0 +1,47 @@
+"""one active order per table
+
+Revision ID: b98c4767f63f
+Revises: 85069b215d25
+Create Date: 2026-10-18 11:02:17.904416
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b98c4767f63f'
+down_revision: Union[str, None] = '85069b215d25'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # до індексу два запити могли відкрити замовлення на одному столі одночасно; без цього кроку
+    # CREATE UNIQUE INDEX упаде на такій базі. Активним лишається найновіше замовлення столу, решта закриваються
+    op.execute("""
+        UPDATE orders SET is_completed = true
+        FROM (
+            SELECT id, row_number() OVER (PARTITION BY table_id ORDER BY created_at DESC, id DESC) AS rank
+            FROM orders
+            WHERE is_completed = false AND table_id IS NOT NULL
+        ) r
+        WHERE orders.id = r.id AND r.rank > 1
+    """)
+    op.drop_index('ix_orders_table_id_active', table_name='orders', postgresql_where=sa.text('is_completed = false'))
+    op.create_index(
+        'uq_orders_table_id_active', 'orders', ['table_id'], unique=True,
+        postgresql_where=sa.text('is_completed = false'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('uq_orders_table_id_active', table_name='orders', postgresql_where=sa.text('is_completed = false'))
+    op.create_index(
+        'ix_orders_table_id_active', 'orders', ['table_id'], unique=False,
+        postgresql_where=sa.text('is_completed = false'),
+    )
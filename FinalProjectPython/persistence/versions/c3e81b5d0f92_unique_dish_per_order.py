@@ -0,0 +1,66 @@
+"""unique dish per order
+
+Revision ID: c3e81b5d0f92
+Revises: 4f2d9c1a7e35
+Create Date: 2026-10-18 14:25:51.640182
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3e81b5d0f92'
+down_revision: Union[str, None] = '4f2d9c1a7e35'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # дублікати зливаються в позицію з найменшим id; середньозважена ціна зберігає суми замовлень
+    op.execute("""
+        UPDATE order_items SET quantity = d.quantity, price_at_order = d.line / d.quantity, discount = d.discount
+        FROM (
+            SELECT min(id) AS id, sum(quantity) AS quantity, sum(price_at_order * quantity) AS line,
+                   sum(discount) AS discount
+            FROM order_items
+            GROUP BY order_id, dish_id
+            HAVING count(*) > 1 AND sum(quantity) > 0
+        ) d
+        WHERE order_items.id = d.id
+    """)
+    # дублікати, що в сумі дають нуль або менше одиниць (позиція і її сторно), не мають позиції, в яку їх злити:
+    # така страва фактично не замовлена, тож уся група видаляється, а суми замовлення зменшуються на її рядки,
+    # щоб і далі дорівнювати сумам його позицій
+    op.execute("""
+        WITH emptied AS (
+            DELETE FROM order_items oi
+            USING (
+                SELECT order_id, dish_id
+                FROM order_items
+                GROUP BY order_id, dish_id
+                HAVING count(*) > 1 AND sum(quantity) <= 0
+            ) g
+            WHERE oi.order_id = g.order_id AND oi.dish_id = g.dish_id
+            RETURNING oi.order_id, oi.price_at_order * oi.quantity AS line, oi.discount
+        )
+        UPDATE orders SET subtotal = orders.subtotal - e.line, discount = orders.discount - e.discount
+        FROM (SELECT order_id, sum(line) AS line, sum(discount) AS discount FROM emptied GROUP BY order_id) e
+        WHERE orders.id = e.order_id
+    """)
+    # у злитих групах лишається позиція з найменшим id, решта рядків уже врахована в ній
+    op.execute("""
+        DELETE FROM order_items oi
+        USING order_items keep
+        WHERE keep.order_id = oi.order_id AND keep.dish_id = oi.dish_id AND keep.id < oi.id
+    """)
+    op.create_unique_constraint('uq_order_items_order_id_dish_id', 'order_items', ['order_id', 'dish_id'])
+    op.drop_index(op.f('ix_order_items_order_id'), table_name='order_items')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index(op.f('ix_order_items_order_id'), 'order_items', ['order_id'], unique=False)
+    op.drop_constraint('uq_order_items_order_id_dish_id', 'order_items', type_='unique')
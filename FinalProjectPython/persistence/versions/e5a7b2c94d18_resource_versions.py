@@ -0,0 +1,33 @@
+"""resource versions
+
+Revision ID: e5a7b2c94d18
+Revises: c3e81b5d0f92
+Create Date: 2026-10-18 16:02:37.415920
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a7b2c94d18'
+down_revision: Union[str, None] = 'c3e81b5d0f92'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'resource_versions',
+        sa.Column('resource', sa.String(length=50), nullable=False),
+        sa.Column('version', sa.BigInteger(), server_default='0', nullable=False),
+        sa.PrimaryKeyConstraint('resource')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('resource_versions')
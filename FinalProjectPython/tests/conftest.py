@@ -0,0 +1,68 @@
+import os
+from pathlib import Path
+
+import pytest
+
+# тести мігрують і очищають базу, тож працюють лише з окремою, явно вказаною базою - ніколи з CAFE_DATABASE_URL
+TEST_DATABASE_URL = os.environ.get("CAFE_TEST_DATABASE_URL")
+if TEST_DATABASE_URL:
+    # до імпорту app: engine створюються з налаштувань під час імпорту
+    os.environ["CAFE_DATABASE_URL"] = TEST_DATABASE_URL
+    os.environ.pop("CAFE_REPLICA_DATABASE_URL", None)
+    os.environ["CAFE_POOL_WARM_UP"] = "false"
+
+from alembic import command
+from alembic.config import Config
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from app.core.menu_cache import invalidate_menu
+from app.db import async_engine, engine
+from app.main import app
+from app.models.base import Base
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+
+def pytest_collection_modifyitems(config, items):
+    if TEST_DATABASE_URL:
+        return
+    skip = pytest.mark.skip(reason="set CAFE_TEST_DATABASE_URL to a disposable PostgreSQL database")
+    for item in items:
+        item.add_marker(skip)
+
+
+@pytest.fixture(scope="session")
+def migrated_db():
+    config = Config(str(PROJECT_ROOT / "alembic.ini"))
+    config.set_main_option("script_location", str(PROJECT_ROOT / "persistence"))
+    command.upgrade(config, "head")
+
+
+@pytest.fixture(autouse=True)
+def clean_db(migrated_db):
+    tables = ", ".join(f'"{table.name}"' for table in Base.metadata.sorted_tables)
+    with engine.begin() as conn:
+        conn.execute(text(f"TRUNCATE {tables} RESTART IDENTITY CASCADE"))
+    # кеші воркера пам'ятають меню та акції з попереднього тесту
+    invalidate_menu()
+
+
+@pytest.fixture
+def client():
+    with TestClient(app) as test_client:
+        yield test_client
+        # з'єднання asyncpg прив'язані до event loop клієнта, а наступний тест запускає новий
+        if async_engine is not None:
+            test_client.portal.call(async_engine.dispose)
+
+
+
+@pytest.fixture
+def menu(client):
+    # категорія, дві страви й стіл - мінімум для замовлень
+    category = client.post("/categories/", json={"name": "Drinks", "description": "d"}).json()
+    tea = client.post("/dishes/", json={"name": "Tea", "price": 10, "category_id": category["id"]}).json()
+    cake = client.post("/dishes/", json={"name": "Cake", "price": 25.5, "category_id": category["id"]}).json()
+    table = client.post("/tables/", json={"number": 1}).json()
+    return {"category": category, "tea": tea, "cake": cake, "table": table}
@@ -0,0 +1,39 @@
+def test_unchanged_list_revalidates_with_304(client, menu):
+    first = client.get("/dishes/")
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+    assert first.headers["Cache-Control"] == "no-cache"
+
+    response = client.get("/dishes/", headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["ETag"] == etag
+    # слабке порівняння і список тегів, як їх шлють проксі
+    stripped = etag.removeprefix("W/")
+    assert client.get("/dishes/", headers={"If-None-Match": f'"other", {stripped}'}).status_code == 304
+
+
+def test_write_bumps_version_and_invalidates_etag(client, menu):
+    etag = client.get("/dishes/").headers["ETag"]
+    # зміна іншого ресурсу тег страв не чіпає
+    assert client.post("/tables/", json={"number": 2}).status_code == 200
+    assert client.get("/dishes/", headers={"If-None-Match": etag}).status_code == 304
+
+    assert client.put(f"/dishes/{menu['tea']['id']}", json={"price": 12}).status_code == 200
+    response = client.get("/dishes/", headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    prices = {dish["id"]: dish["price"] for dish in response.json()["items"]}
+    assert prices[menu["tea"]["id"]] == 12
+    assert client.get("/dishes/", headers={"If-None-Match": response.headers["ETag"]}).status_code == 304
+
+
+def test_tag_covers_every_resource_of_the_route(client, menu):
+    path = f"/dishes/category/{menu['category']['id']}"
+    etag = client.get(path).headers["ETag"]
+
+    assert client.put(f"/categories/{menu['category']['id']}", json={"name": "Hot drinks"}).status_code == 200
+
+    assert client.get(path, headers={"If-None-Match": etag}).status_code == 200
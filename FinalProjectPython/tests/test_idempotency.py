@@ -0,0 +1,138 @@
+import threading
+import time
+from datetime import datetime, timedelta
+
+import anyio
+from sqlalchemy import select, text, update
+
+import app.core.idempotency
+from app.core.order_item import AsyncOrderItemService, OrderItemService
+from app.db import engine
+from app.models.models import IdempotencyKey
+from tests.test_orders import create_order
+
+
+def add_item(client, order_id, dish_id, key, quantity=1):
+    body = {"order_id": order_id, "dish_id": dish_id, "quantity": quantity}
+    return client.post("/order-items/", json=body, headers={"Idempotency-Key": key})
+
+
+def item_quantity(client, order_id, dish_id):
+    items = client.get(f"/orders/{order_id}").json()["items"]
+    return sum(item["quantity"] for item in items if item["dish_id"] == dish_id)
+
+
+def stored_keys():
+    with engine.connect() as conn:
+        return set(conn.execute(select(IdempotencyKey.key)).scalars())
+
+
+def age_keys(*keys: str):
+    with engine.begin() as conn:
+        conn.execute(
+            update(IdempotencyKey)
+            .where(IdempotencyKey.key.in_(keys))
+            .values(created_at=datetime.utcnow() - timedelta(days=2))
+        )
+
+
+def waiting_for_lock() -> bool:
+    with engine.connect() as conn:
+        return conn.execute(text("SELECT count(*) FROM pg_locks WHERE NOT granted")).scalar() > 0
+
+
+def test_retry_with_same_key_replays_stored_response(client, menu):
+    order = create_order(client, menu["table"]["id"])
+
+    first = add_item(client, order["id"], menu["tea"]["id"], "retry-1")
+    retry = add_item(client, order["id"], menu["tea"]["id"], "retry-1")
+
+    assert first.status_code == retry.status_code == 200
+    assert "Idempotent-Replayed" not in first.headers
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert retry.json() == first.json()
+    assert item_quantity(client, order["id"], menu["tea"]["id"]) == 1
+
+
+def test_reusing_key_with_different_body_is_422(client, menu):
+    order = create_order(client, menu["table"]["id"])
+    assert add_item(client, order["id"], menu["tea"]["id"], "reused").status_code == 200
+
+    response = add_item(client, order["id"], menu["tea"]["id"], "reused", quantity=2)
+
+    assert response.status_code == 422
+    assert response.json()["detail"] == "Idempotency-Key has already been used with a different request"
+    assert item_quantity(client, order["id"], menu["tea"]["id"]) == 1
+
+
+def test_failed_request_leaves_key_free(client, menu):
+    table_id = menu["table"]["id"]
+    blocking = create_order(client, table_id)
+    body = {"table_id": table_id, "items": []}
+
+    assert client.post("/orders/", json=body, headers={"Idempotency-Key": "after-fail"}).status_code == 400
+    assert client.put(f"/orders/{blocking['id']}/complete").status_code == 200
+    response = client.post("/orders/", json=body, headers={"Idempotency-Key": "after-fail"})
+
+    assert response.status_code == 200, response.text
+    assert "Idempotent-Replayed" not in response.headers
+
+
+def test_expired_key_is_reclaimed_and_purged(client, menu, monkeypatch):
+    order = create_order(client, menu["table"]["id"])
+    assert add_item(client, order["id"], menu["tea"]["id"], "old").status_code == 200
+    assert add_item(client, order["id"], menu["cake"]["id"], "stale").status_code == 200
+    age_keys("old", "stale")
+
+    # прострочений ключ - знову вільний: інше тіло виконується, а не дає 422
+    response = add_item(client, order["id"], menu["tea"]["id"], "old", quantity=2)
+    assert response.status_code == 200, response.text
+    assert "Idempotent-Replayed" not in response.headers
+    assert item_quantity(client, order["id"], menu["tea"]["id"]) == 3
+
+    # прострочені ключі видаляються, коли зберігається новий
+    monkeypatch.setattr(app.core.idempotency, "PURGE_EVERY", 1)
+    assert add_item(client, order["id"], menu["cake"]["id"], "fresh").status_code == 200
+    assert stored_keys() == {"old", "fresh"}
+
+
+def test_concurrent_requests_with_same_key_run_once(client, menu, monkeypatch):
+    order = create_order(client, menu["table"]["id"])
+    claimed, release = threading.Event(), threading.Event()
+    sync_create, async_create = OrderItemService.create, AsyncOrderItemService.create
+
+    # перший запит зайняв ключ і тримає транзакцію відкритою, поки другий не стане в чергу на той самий ключ
+    def sync_wrapper(self, data):
+        claimed.set()
+        release.wait(timeout=10)
+        return sync_create(self, data)
+
+    async def async_wrapper(self, data):
+        claimed.set()
+        await anyio.to_thread.run_sync(lambda: release.wait(timeout=10))
+        return await async_create(self, data)
+
+    monkeypatch.setattr(OrderItemService, "create", sync_wrapper)
+    monkeypatch.setattr(AsyncOrderItemService, "create", async_wrapper)
+    responses = {}
+
+    def send(name):
+        responses[name] = add_item(client, order["id"], menu["tea"]["id"], "concurrent")
+
+    first = threading.Thread(target=send, args=("first",))
+    first.start()
+    assert claimed.wait(timeout=10)
+    second = threading.Thread(target=send, args=("second",))
+    second.start()
+    deadline = time.monotonic() + 10
+    while not waiting_for_lock() and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert waiting_for_lock()
+    release.set()
+    first.join(timeout=10)
+    second.join(timeout=10)
+
+    assert responses["first"].status_code == responses["second"].status_code == 200
+    assert responses["second"].headers["Idempotent-Replayed"] == "true"
+    assert responses["second"].json() == responses["first"].json()
+    assert item_quantity(client, order["id"], menu["tea"]["id"]) == 1
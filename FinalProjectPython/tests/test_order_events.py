@@ -0,0 +1,125 @@
+import asyncio
+import json
+import time
+
+from app.core.order_events import OrderEventHub, order_event_hub
+from app.core.prep_board import prep_board
+from tests.test_orders import create_order
+
+
+def parse(chunk: str) -> dict[str, str]:
+    fields = dict(line.split(": ", 1) for line in chunk.strip().splitlines())
+    return {"id": fields["id"], "event": fields["event"], "data": fields["data"]}
+
+
+async def take(stream, count: int) -> list[dict[str, str]]:
+    # перший рядок потоку - "retry:", далі події
+    chunks = [await asyncio.wait_for(anext(stream), 5) for _ in range(count + 1)]
+    return [parse(chunk) for chunk in chunks[1:]]
+
+
+async def empty_snapshot() -> str:
+    return "[]"
+
+
+def dispatch(hub: OrderEventHub, *order_ids: int) -> None:
+    for order_id in order_ids:
+        hub.dispatch(f"order_created {json.dumps({'id': order_id})}")
+
+
+async def open_events(hub: OrderEventHub, cursor: str | None, count: int) -> list[dict[str, str]]:
+    stream = await hub.open_stream(cursor, empty_snapshot)
+    try:
+        return await take(stream, count)
+    finally:
+        await stream.aclose()
+
+
+def test_cursor_resumes_after_last_seen_event():
+    async def scenario():
+        hub = OrderEventHub(buffer_size=10, queue_size=10)
+        dispatch(hub, 1, 2, 3)
+        (snapshot,) = await open_events(hub, None, 1)
+        epoch = snapshot["id"].split(":")[0]
+        return snapshot, epoch, await open_events(hub, f"{epoch}:1", 2)
+
+    snapshot, epoch, resumed = asyncio.run(scenario())
+
+    assert snapshot == {"id": f"{epoch}:3", "event": "snapshot", "data": "[]"}
+    assert [event["id"] for event in resumed] == [f"{epoch}:2", f"{epoch}:3"]
+    assert {event["event"] for event in resumed} == {"order_created"}
+    assert [json.loads(event["data"])["id"] for event in resumed] == [2, 3]
+
+
+def test_unusable_cursor_gets_fresh_snapshot():
+    async def scenario():
+        hub = OrderEventHub(buffer_size=2, queue_size=10)
+        dispatch(hub, 1)
+        (before_reset,) = await open_events(hub, None, 1)
+        hub.reset()  # слухач перепідключився: сповіщення могли загубитися, нумерація починається знову
+        dispatch(hub, 2, 3, 4)  # у буфері лишаються події 2 і 3 нової епохи
+        (current,) = await open_events(hub, None, 1)
+        epoch = current["id"].split(":")[0]
+        cursors = [
+            before_reset["id"],  # інша епоха
+            f"{epoch}:0",  # наступна за курсором подія 1 вже витіснена з буфера
+            f"{epoch}:9",  # з майбутнього
+            "garbage",
+        ]
+        return current, [await open_events(hub, cursor, 1) for cursor in cursors]
+
+    current, replies = asyncio.run(scenario())
+
+    assert current["id"].endswith(":3")
+    for (event,) in replies:
+        assert event == current
+
+
+def test_live_events_follow_the_backlog():
+    async def scenario():
+        hub = OrderEventHub(buffer_size=10, queue_size=10)
+        dispatch(hub, 1)
+        stream = await hub.open_stream(None, empty_snapshot)
+        try:
+            (snapshot,) = await take(stream, 1)
+            dispatch(hub, 2)
+            live = parse(await asyncio.wait_for(anext(stream), 5))
+        finally:
+            await stream.aclose()
+        return snapshot, live
+
+    snapshot, live = asyncio.run(scenario())
+
+    assert snapshot["event"] == "snapshot"
+    assert live["id"] == snapshot["id"].replace(":1", ":2")
+    assert json.loads(live["data"]) == {"id": 2}
+
+
+def wait_for_listener():
+    # дошка кухні вмикається, коли слухач NOTIFY підключився
+    deadline = time.monotonic() + 10
+    while not prep_board.active and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert prep_board.active
+
+
+def test_committed_writes_reach_subscribers_and_resume(client, menu):
+    wait_for_listener()
+    item = {"dish_id": menu["tea"]["id"], "order_id": 0, "quantity": 2}
+
+    async def scenario():
+        stream = await order_event_hub.open_stream(None, empty_snapshot)
+        try:
+            (snapshot,) = await take(stream, 1)
+            order = await asyncio.to_thread(create_order, client, menu["table"]["id"], [item])
+            live = [parse(await asyncio.wait_for(anext(stream), 5)) for _ in range(2)]
+        finally:
+            await stream.aclose()
+        return order, live, await open_events(order_event_hub, snapshot["id"], 2)
+
+    order, live, resumed = asyncio.run(scenario())
+
+    assert [event["event"] for event in live] == ["order_created", "item_added"]
+    assert json.loads(live[0]["data"])["id"] == order["id"]
+    assert json.loads(live[1]["data"])["quantity"] == 2
+    assert resumed == live
@@ -0,0 +1,80 @@
+import threading
+
+import pytest
+
+from app.crud.order import OrderRepo
+from app.crud.order_item import AsyncOrderItemRepo, OrderItemRepo
+from app.db import LocalSession
+from tests.test_orders import create_order
+
+
+def complete_in_background(order_id: int) -> threading.Thread:
+    # окрема сесія, як у паралельного запиту PUT /orders/{id}/complete
+    def complete():
+        with LocalSession() as db:
+            OrderRepo(db).complete_order(order_id)
+            db.commit()
+
+    thread = threading.Thread(target=complete)
+    thread.start()
+    # поки рядок замовлення заблоковано, закриття чекає; без блокування встигає закомітитись
+    thread.join(timeout=1)
+    return thread
+
+
+def complete_between_check_and_write(monkeypatch, method: str, order_id: int) -> list[threading.Thread]:
+    # замовлення закривається після перевірки is_completed у сервісі, але до запису в репозиторії
+    started = []
+    sync_method, async_method = getattr(OrderItemRepo, method), getattr(AsyncOrderItemRepo, method)
+
+    def sync_wrapper(self, *args, **kwargs):
+        started.append(complete_in_background(order_id))
+        return sync_method(self, *args, **kwargs)
+
+    async def async_wrapper(self, *args, **kwargs):
+        started.append(complete_in_background(order_id))
+        return await async_method(self, *args, **kwargs)
+
+    monkeypatch.setattr(OrderItemRepo, method, sync_wrapper)
+    monkeypatch.setattr(AsyncOrderItemRepo, method, async_wrapper)
+    return started
+
+
+def add_cake(client, order, menu):
+    return client.post("/order-items/", json={"order_id": order["id"], "dish_id": menu["cake"]["id"], "quantity": 2})
+
+
+def change_quantity(client, order, menu):
+    return client.put(f"/order-items/{order['items'][0]['id']}", json={"quantity": 5})
+
+
+def remove_item(client, order, menu):
+    return client.delete(f"/order-items/{order['items'][0]['id']}")
+
+
+@pytest.mark.parametrize("method, change", [("add", add_cake), ("update", change_quantity), ("delete", remove_item)])
+def test_item_change_racing_order_completion_keeps_totals(client, menu, monkeypatch, method, change):
+    order = create_order(client, menu["table"]["id"], [{"dish_id": menu["tea"]["id"], "order_id": 0, "quantity": 1}])
+    started = complete_between_check_and_write(monkeypatch, method, order["id"])
+
+    response = change(client, order, menu)
+
+    assert response.status_code == 200, response.text
+    (completion,) = started
+    completion.join(timeout=5)
+    assert not completion.is_alive()
+    completed = client.get(f"/orders/{order['id']}").json()
+    assert completed["is_completed"] is True
+    lines = [item["price_at_order"] * item["quantity"] for item in completed["items"]]
+    assert completed["subtotal"] == pytest.approx(sum(lines))
+    assert client.post("/orders/totals/check").json()["mismatches"] == []
+
+
+def test_adding_item_to_completed_order_is_rejected(client, menu):
+    order = create_order(client, menu["table"]["id"])
+    assert client.put(f"/orders/{order['id']}/complete").status_code == 200
+
+    response = add_cake(client, order, menu)
+
+    assert response.status_code == 400
+    assert client.get(f"/orders/{order['id']}").json()["items"] == []
@@ -0,0 +1,118 @@
+from datetime import date, datetime, time
+
+import pytest
+
+import app.core.order
+import app.core.order_item
+from app.crud.order import OrderRepo
+from app.db import LocalSession
+
+NOW = datetime(2026, 3, 10, 12, 0, 0)
+
+
+class FrozenDateTime(datetime):
+    @classmethod
+    def utcnow(cls):
+        return NOW
+
+
+def _active(promotion: dict, now: datetime) -> bool:
+    # еталон, незалежний від app.core.pricing: дати й години дії включно з межами
+    start = time.fromisoformat(promotion["start_time"]) if promotion["start_time"] else time.min
+    end = time.fromisoformat(promotion["end_time"]) if promotion["end_time"] else time.max
+    return (
+        date.fromisoformat(promotion["valid_from"]) <= now.date() <= date.fromisoformat(promotion["valid_to"])
+        and start <= now.time() <= end
+    )
+
+
+def expected_totals(order: dict, prices: dict[int, float], promotions: list[dict]) -> tuple[float, float, float]:
+    subtotal = discount = 0.0
+    for item in order["items"]:
+        line = prices[item["dish_id"]] * item["quantity"]
+        percent = sum(
+            promotion["discount_percent"]
+            for promotion in promotions
+            if _active(promotion, NOW) and item["dish_id"] in {dish["id"] for dish in promotion["dishes"]}
+        )
+        subtotal += line
+        discount += line * percent / 100
+    return subtotal, discount, round(max(subtotal - discount, 0), 2)
+
+
+@pytest.fixture
+def frozen_now(monkeypatch):
+    # ціни позицій рахуються на NOW, тож акції можна поставити точно на межі їхніх вікон
+    monkeypatch.setattr(app.core.order, "datetime", FrozenDateTime)
+    monkeypatch.setattr(app.core.order_item, "datetime", FrozenDateTime)
+
+
+def post(client, path, body):
+    response = client.post(path, json=body)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_stored_totals_match_recomputed_pricing(client, menu, frozen_now):
+    category_id = menu["category"]["id"]
+    tea, cake = menu["tea"]["id"], menu["cake"]["id"]
+    soup = post(client, "/dishes/", {"name": "Soup", "price": 7.3, "category_id": category_id})["id"]
+    coffee = post(client, "/dishes/", {"name": "Coffee", "price": 3.33, "category_id": category_id})["id"]
+    cheese = post(client, "/dishes/", {"name": "Cheese", "price": 12.45, "category_id": category_id})["id"]
+    prices = {tea: 10.0, cake: 25.5, soup: 7.3, coffee: 3.33, cheese: 12.45}
+
+    def promotion(percent, dish_ids, valid_from="2026-01-01", valid_to="2026-12-31", start_time=None, end_time=None):
+        return post(client, "/promotions/", {
+            "description": f"{percent}%", "discount_percent": percent, "dish_ids": dish_ids,
+            "valid_from": valid_from, "valid_to": valid_to, "start_time": start_time, "end_time": end_time,
+        })
+
+    promotions = [
+        promotion(10, [tea, cake]),                                              # перетинається з двома наступними
+        promotion(15, [tea], valid_from="2026-03-10", start_time="12:00:00"),    # почалася саме зараз
+        promotion(20, [cake], valid_to="2026-03-10", end_time="12:00:00"),       # закінчується саме зараз
+        promotion(50, [soup], end_time="11:59:59.999999"),                       # щойно закінчилася
+        promotion(30, [soup], start_time="12:00:00.000001"),                     # ще не почалася
+        promotion(25, [coffee], valid_to="2026-03-09"),                          # закінчилася вчора
+        promotion(5, [coffee], valid_from="2026-03-11"),                         # почнеться завтра
+        promotion(60, [cheese]),                                                 # разом понад 100%
+        promotion(70, [cheese]),
+    ]
+
+    def line(dish_id, quantity):
+        return {"dish_id": dish_id, "order_id": 0, "quantity": quantity}
+
+    def new_table(number):
+        return post(client, "/tables/", {"number": number})["id"]
+
+    order_ids = [
+        # одна страва кількома рядками в запиті
+        post(client, "/orders/", {"table_id": menu["table"]["id"], "items": [line(tea, 2), line(tea, 3), line(cake, 1)]})["id"],
+        post(client, "/orders/", {"table_id": new_table(2), "items": [line(coffee, 4), line(soup, 1)]})["id"],
+        post(client, "/orders/", {"table_id": new_table(3), "items": [line(cheese, 1)]})["id"],
+        post(client, "/orders/", {"table_id": new_table(4), "items": []})["id"],
+    ]
+    edited = post(client, "/orders/", {"table_id": new_table(5), "items": [line(cake, 2), line(soup, 3), line(coffee, 1)]})
+    order_ids.append(edited["id"])
+    # повторне додавання страви, зміна кількості вгору й униз, видалення позиції
+    post(client, "/order-items/", {"order_id": edited["id"], "dish_id": cake, "quantity": 1})
+    items = {item["dish_id"]: item["id"] for item in edited["items"]}
+    assert client.put(f"/order-items/{items[soup]}", json={"quantity": 5}).status_code == 200
+    assert client.put(f"/order-items/{items[soup]}", json={"quantity": 2}).status_code == 200
+    assert client.delete(f"/order-items/{items[coffee]}").status_code == 200
+
+    with LocalSession() as db:
+        stored = {row.order_id: row for row in OrderRepo(db).get_totals(order_ids)}
+    assert sorted(stored) == sorted(order_ids)
+
+    for order_id in order_ids:
+        order = client.get(f"/orders/{order_id}").json()
+        subtotal, discount, total = expected_totals(order, prices, promotions)
+        row = stored[order_id]
+        assert row.subtotal == pytest.approx(subtotal, abs=1e-9), order_id
+        assert row.discount == pytest.approx(discount, abs=1e-9), order_id
+        assert row.total == pytest.approx(total, abs=1e-9), order_id
+        assert client.get(f"/orders/{order_id}/total").json()["total"] == row.total
+
+    assert stored[order_ids[2]].total == 0  # знижка понад 100%: сума нульова, а не від'ємна
+    assert client.post("/orders/totals/check").json()["mismatches"] == []
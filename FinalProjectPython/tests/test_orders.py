@@ -0,0 +1,127 @@
+from datetime import date, timedelta
+
+import pytest
+
+
+def create_order(client, table_id, items=()):
+    response = client.post("/orders/", json={"table_id": table_id, "items": list(items)})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_second_active_order_on_table_is_rejected(client, menu):
+    table_id = menu["table"]["id"]
+    create_order(client, table_id)
+
+    response = client.post("/orders/", json={"table_id": table_id, "items": []})
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == f"Table {table_id} already has an active order."
+
+
+def test_reopening_order_on_occupied_table_names_the_table(client, menu):
+    table_id = menu["table"]["id"]
+    closed = create_order(client, table_id)
+    assert client.put(f"/orders/{closed['id']}/complete").status_code == 200
+    create_order(client, table_id)
+
+    # table_id у запиті не передається: стіл - той, за яким замовлення вже стоїть
+    response = client.put(f"/orders/{closed['id']}", json={"is_completed": False})
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == f"Table {table_id} already has an active order."
+
+
+def test_reopening_order_onto_free_table(client, menu):
+    closed = create_order(client, menu["table"]["id"])
+    assert client.put(f"/orders/{closed['id']}/complete").status_code == 200
+    create_order(client, menu["table"]["id"])
+    free_table = client.post("/tables/", json={"number": 2}).json()
+
+    response = client.put(f"/orders/{closed['id']}", json={"is_completed": False, "table_id": free_table["id"]})
+
+    assert response.status_code == 200, response.text
+    assert response.json()["table"]["id"] == free_table["id"]
+    assert response.json()["is_completed"] is False
+
+
+def test_update_missing_order_is_404(client, menu):
+    assert client.put("/orders/999", json={"is_completed": False}).status_code == 404
+
+
+def line(dish_id, quantity):
+    return {"dish_id": dish_id, "order_id": 0, "quantity": quantity}
+
+
+def test_bulk_reports_each_order_on_mixed_input(client, menu):
+    occupied = menu["table"]["id"]
+    create_order(client, occupied)
+    free = client.post("/tables/", json={"number": 2}).json()["id"]
+    tea, cake = menu["tea"]["id"], menu["cake"]["id"]
+    orders = [
+        {"table_id": occupied, "items": [line(tea, 1)]},
+        {"table_id": occupied, "items": [line(cake, 1)], "is_completed": True},  # закрите на касі, поки стіл зайнятий
+        {"table_id": free, "items": [line(999, 1)]},
+        {"table_id": free, "items": [line(tea, 2), line(cake, 1), line(tea, 1)]},
+        {"table_id": free, "items": [line(cake, 1)]},  # стіл щойно зайняло попереднє замовлення пачки
+        {"table_id": 999, "items": []},
+    ]
+
+    response = client.post("/orders/bulk", json={"orders": orders})
+
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert (body["created"], body["rejected"]) == (2, 4)
+    results = body["results"]
+    assert [result["index"] for result in results] == list(range(len(orders)))
+    assert [result["status"] for result in results] == [
+        "rejected", "created", "rejected", "created", "rejected", "rejected",
+    ]
+    assert results[0]["detail"] == f"Table {occupied} already has an active order."
+    assert results[2]["detail"] == "Dish id 999 not found"
+    assert results[4]["detail"] == f"Table {free} already has an active order."
+    assert results[5]["detail"] == "Table id 999 not found"
+
+    completed = client.get(f"/orders/{results[1]['order_id']}").json()
+    assert completed["is_completed"] is True
+    assert completed["table"]["id"] == occupied
+    active = client.get(f"/orders/{results[3]['order_id']}").json()
+    assert active["is_completed"] is False
+    assert sorted((item["dish_id"], item["quantity"]) for item in active["items"]) == [(tea, 3), (cake, 1)]
+    # відхилені замовлення не записані: крім створених є лише замовлення, що вже займало стіл
+    assert len(client.get("/orders/").json()["items"]) == 3
+
+
+def test_bulk_created_orders_carry_priced_totals(client, menu):
+    tea, cake = menu["tea"]["id"], menu["cake"]["id"]
+    today = date.today()
+    promotion = client.post("/promotions/", json={
+        "description": "cake", "discount_percent": 10, "dish_ids": [cake],
+        "valid_from": (today - timedelta(days=1)).isoformat(), "valid_to": (today + timedelta(days=1)).isoformat(),
+    })
+    assert promotion.status_code == 200, promotion.text
+    orders = [
+        {"table_id": menu["table"]["id"], "items": [line(tea, 2), line(cake, 2)]},
+        {"table_id": menu["table"]["id"], "items": [line(cake, 1)], "is_completed": True},
+    ]
+
+    results = client.post("/orders/bulk", json={"orders": orders}).json()["results"]
+
+    order_ids = [result["order_id"] for result in results]
+    first, second = (client.get(f"/orders/{order_id}").json() for order_id in order_ids)
+    assert (first["subtotal"], first["discount"]) == (pytest.approx(71), pytest.approx(5.1))
+    assert (second["subtotal"], second["discount"]) == (pytest.approx(25.5), pytest.approx(2.55))
+    assert client.get(f"/orders/{order_ids[0]}/total").json()["total"] == 65.9
+    assert client.get(f"/orders/{order_ids[1]}/total").json()["total"] == 22.95
+    assert client.post("/orders/totals/check").json()["mismatches"] == []
+
+
+@pytest.mark.parametrize("count", [0, 1001])
+def test_bulk_rejects_empty_and_oversized_batches(client, menu, count):
+    orders = [{"table_id": menu["table"]["id"], "items": [], "is_completed": True}] * count
+
+    response = client.post("/orders/bulk", json={"orders": orders})
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Send between 1 and 1000 orders per request"
+    assert client.get("/orders/").json()["items"] == []
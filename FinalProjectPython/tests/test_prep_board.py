@@ -0,0 +1,62 @@
+import time
+from datetime import datetime
+
+from app.core.prep_board import prep_board
+from app.crud.order import OrderRepo
+from app.db import LocalSession
+from tests.test_order_events import wait_for_listener
+from tests.test_orders import create_order
+
+
+def board_from_db() -> list[tuple]:
+    # те саме, що рахує _prep_board_stmt, коли дошки в пам'яті немає
+    with LocalSession() as db:
+        return [tuple(row) for row in OrderRepo(db).get_prep_board()]
+
+
+def board_from_api(client) -> list[tuple]:
+    response = client.get("/orders/prep-board/")
+    assert response.status_code == 200, response.text
+    return [
+        (dish["dish_id"], dish["quantity"], dish["order_count"], datetime.fromisoformat(dish["oldest_item_at"]))
+        for dish in response.json()
+    ]
+
+
+def assert_board_in_line(client):
+    # події доходять до дошки через слухача NOTIFY, тобто трохи після відповіді на запис
+    expected = board_from_db()
+    deadline = time.monotonic() + 5
+    while board_from_api(client) != expected and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert board_from_api(client) == expected
+    # відповідь - з дошки в пам'яті, а не з повторного GROUP BY
+    assert prep_board.get() is not None
+
+
+def test_prep_board_follows_item_changes(client, menu):
+    wait_for_listener()
+    tea, cake = menu["tea"]["id"], menu["cake"]["id"]
+    first = create_order(client, menu["table"]["id"], [
+        {"dish_id": tea, "order_id": 0, "quantity": 2},
+        {"dish_id": cake, "order_id": 0, "quantity": 1},
+    ])
+    second_table = client.post("/tables/", json={"number": 2}).json()["id"]
+    second = create_order(client, second_table, [{"dish_id": tea, "order_id": 0, "quantity": 1}])
+    first_tea = next(item["id"] for item in first["items"] if item["dish_id"] == tea)
+    assert_board_in_line(client)
+
+    assert client.put(f"/order-items/{first_tea}", json={"quantity": 5}).status_code == 200
+    assert_board_in_line(client)
+
+    # найстаріша позиція страви лишається тією ж, але кількість і число замовлень падають
+    assert client.delete(f"/order-items/{second['items'][0]['id']}").status_code == 200
+    assert_board_in_line(client)
+
+    add = {"order_id": second["id"], "dish_id": cake, "quantity": 3}
+    assert client.post("/order-items/", json=add).status_code == 200
+    assert_board_in_line(client)
+
+    assert client.put(f"/orders/{first['id']}/complete").status_code == 200
+    assert_board_in_line(client)
+    assert board_from_api(client)[0][:3] == (cake, 3, 1)
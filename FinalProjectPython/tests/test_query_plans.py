@@ -0,0 +1,131 @@
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event, text
+
+from app.crud.cafe_table import CafeTableRepo
+from app.crud.dish import DishRepo
+from app.crud.order import OrderRepo
+from app.crud.order_item import OrderItemRepo
+from app.crud.promotion import PromotionRepo
+from app.db import LocalSession, engine
+
+ORDERS = 50_000
+ACTIVE_ORDERS = 200  # по одному на стіл
+ITEMS_PER_ORDER = 3
+DISHES = 50
+NEW_DISH = DISHES + 1  # щойно додана страва: ще без позицій, у кількох акціях
+PROMOTIONS = 5_000
+CURRENT_PROMOTIONS = 100  # решта вже закінчилися
+DISHES_PER_PROMOTION = 3
+SEEDED_UNTIL = datetime(2026, 1, 1)
+
+
+@pytest.fixture
+def seeded_db():
+    # досить рядків, щоб планувальник обирав індекс, а не послідовне читання: активних замовлень і замовлень
+    # за один день - частка відсотка, позицій одного замовлення - кілька зі 150 тисяч, чинних акцій - 2%
+    with engine.begin() as conn:
+        conn.execute(text("INSERT INTO dish_categories (name) VALUES ('seed')"))
+        conn.execute(text(f"INSERT INTO dishes (name, price, category_id) SELECT 'dish ' || g, g, 1 FROM generate_series(1, {NEW_DISH}) g"))
+        conn.execute(text(f"INSERT INTO cafe_tables (number) SELECT g FROM generate_series(1, {ACTIVE_ORDERS}) g"))
+        conn.execute(
+            text(f"""
+                INSERT INTO orders (table_id, created_at, is_completed)
+                SELECT g % {ACTIVE_ORDERS} + 1, :until - g * interval '10 minutes', g > {ACTIVE_ORDERS}
+                FROM generate_series(1, {ORDERS}) g
+            """),
+            {"until": SEEDED_UNTIL},
+        )
+        conn.execute(text(f"""
+            INSERT INTO order_items (order_id, dish_id, quantity, price_at_order)
+            SELECT o.id, (o.id + d) % {DISHES} + 1, 1, 10 FROM orders o, generate_series(1, {ITEMS_PER_ORDER}) d
+        """))
+        conn.execute(
+            text(f"""
+                INSERT INTO promotions (description, discount_percent, valid_from, valid_to)
+                SELECT 'promotion ' || g, 10, CAST(:until AS date) - g - 30,
+                       CASE WHEN g <= {CURRENT_PROMOTIONS} THEN CAST(:until AS date) + 30 ELSE CAST(:until AS date) - g END
+                FROM generate_series(1, {PROMOTIONS}) g
+            """),
+            {"until": SEEDED_UNTIL},
+        )
+        conn.execute(text(f"""
+            INSERT INTO promotion_dish_association (promotion_id, dish_id)
+            SELECT p.id, (p.id + d) % {DISHES} + 1 FROM promotions p, generate_series(1, {DISHES_PER_PROMOTION}) d
+            UNION ALL
+            SELECT id, {NEW_DISH} FROM promotions WHERE id <= 5
+        """))
+        conn.execute(text("ANALYZE"))
+
+
+@contextmanager
+def captured_selects():
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+
+def _index_names(plan: dict) -> set[str]:
+    names = {plan["Index Name"]} if "Index Name" in plan else set()
+    for child in plan.get("Plans", ()):
+        names |= _index_names(child)
+    return names
+
+
+def plan_indexes(statement: str, parameters) -> set[str]:
+    with engine.connect() as conn:
+        plan = conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters).scalar_one()
+    return _index_names(plan[0]["Plan"])
+
+
+def query_indexes(run) -> list[set[str]]:
+    # запити, які справді виконує метод репозиторію (разом із selectinload), і індекси в їхніх планах
+    with captured_selects() as statements, LocalSession() as db:
+        run(db)
+    return [plan_indexes(statement, parameters) for statement, parameters in statements]
+
+
+def test_active_orders_use_partial_active_index(seeded_db):
+    orders, items = query_indexes(lambda db: OrderRepo(db).get_active_orders())
+    assert "uq_orders_table_id_active" in orders
+    assert "uq_order_items_order_id_dish_id" in items
+
+
+def test_orders_by_period_use_created_at_index(seeded_db):
+    start = SEEDED_UNTIL - timedelta(days=1)
+    orders, items = query_indexes(lambda db: OrderRepo(db).get_orders_by_period(start, SEEDED_UNTIL))
+    assert "ix_orders_created_at" in orders
+    assert "uq_order_items_order_id_dish_id" in items
+
+
+def test_order_items_by_order_use_order_id_index(seeded_db):
+    (items,) = query_indexes(lambda db: OrderItemRepo(db).get_by_order_id(ORDERS // 2))
+    assert "uq_order_items_order_id_dish_id" in items
+
+
+def test_promotion_schedule_uses_valid_to_index(seeded_db):
+    (promotions,) = query_indexes(lambda db: PromotionRepo(db).get_schedule(SEEDED_UNTIL.date()))
+    assert "ix_promotions_valid_to_valid_from" in promotions
+
+
+def test_dish_delete_checks_use_dish_id_indexes(seeded_db):
+    (items,) = query_indexes(lambda db: DishRepo(db).has_order_items(NEW_DISH))
+    assert "ix_order_items_dish_id" in items
+    # видалення страви читає її акції, щоб прибрати рядки promotion_dish_association
+    plans = query_indexes(lambda db: DishRepo(db).delete(NEW_DISH))
+    assert any("ix_promotion_dish_association_dish_id" in indexes for indexes in plans)
+
+
+def test_table_occupancy_uses_partial_active_index(seeded_db):
+    (orders,) = query_indexes(lambda db: CafeTableRepo(db).is_table_occupied(1))
+    assert "uq_orders_table_id_active" in orders
@@ -0,0 +1,93 @@
+import pytest
+
+from app.core.menu_cache import invalidate_menu
+from app.db.statements import assert_statements
+
+ORDERS = 4
+
+
+@pytest.fixture
+def seeded(client, menu):
+    # кілька замовлень з позиціями й акцій зі стравами: запит на кожен рядок (N+1) одразу змінив би лічильник
+    tea, cake = menu["tea"]["id"], menu["cake"]["id"]
+    promotion = client.post("/promotions/", json={
+        "description": "happy hour", "discount_percent": 10,
+        "valid_from": "2020-01-01", "valid_to": "2099-01-01", "dish_ids": [tea, cake],
+    }).json()
+    client.post("/promotions/", json={
+        "description": "tea day", "discount_percent": 5,
+        "valid_from": "2020-01-01", "valid_to": "2099-01-01", "dish_ids": [tea],
+    })
+    orders = []
+    for number in range(2, 2 + ORDERS):
+        table = client.post("/tables/", json={"number": number}).json()
+        orders.append(client.post("/orders/", json={"table_id": table["id"], "items": [
+            {"dish_id": tea, "order_id": 0, "quantity": 1},
+            {"dish_id": cake, "order_id": 0, "quantity": 2},
+        ]}).json())
+    return {**menu, "promotion": promotion, "order": orders[0]}
+
+
+def request(client, method, path, json=None):
+    # кеші меню й акцій скинуті: рахуються і запити, що їх наповнюють
+    invalidate_menu()
+    response = client.request(method, path, json=json)
+    assert response.status_code == 200, response.text
+
+
+@pytest.mark.parametrize("path, expected", [
+    ("/orders/", 2),  # сторінка замовлень + selectinload позицій
+    ("/order-items/", 1),
+    ("/dishes/", 2),  # версії для ETag + сторінка
+    ("/categories/", 1),
+    ("/promotions/", 2),  # сторінка акцій + selectinload страв
+    ("/tables/", 2),  # версії для ETag + сторінка
+])
+def test_list_endpoints(client, seeded, path, expected):
+    with assert_statements(expected):
+        request(client, "GET", path)
+
+
+@pytest.mark.parametrize("path, expected", [
+    ("/orders/{order}", 2),
+    ("/order-items/{item}", 1),
+    ("/dishes/{tea}", 1),
+    ("/promotions/{promotion}", 2),
+    ("/tables/{table}", 1),
+])
+def test_detail_endpoints(client, seeded, path, expected):
+    ids = {
+        "order": seeded["order"]["id"],
+        "item": seeded["order"]["items"][0]["id"],
+        "tea": seeded["tea"]["id"],
+        "promotion": seeded["promotion"]["id"],
+        "table": seeded["table"]["id"],
+    }
+    with assert_statements(expected):
+        request(client, "GET", path.format(**ids))
+
+
+def test_create_order(client, seeded):
+    items = [{"dish_id": seeded["tea"]["id"], "order_id": 0, "quantity": 1},
+             {"dish_id": seeded["cake"]["id"], "order_id": 0, "quantity": 3}]
+    # ціни страв, індекс акцій, замовлення, позиції одним INSERT, стіл, NOTIFY подій замовлення
+    with assert_statements(6):
+        request(client, "POST", "/orders/", {"table_id": seeded["table"]["id"], "items": items})
+
+
+def test_create_order_item(client, seeded):
+    # страва, замовлення під блокуванням, індекс акцій, upsert позиції, суми замовлення, NOTIFY
+    with assert_statements(6):
+        request(client, "POST", "/order-items/", {"order_id": seeded["order"]["id"], "dish_id": seeded["tea"]["id"], "quantity": 1})
+
+
+@pytest.mark.parametrize("path, body, expected", [
+    # перевірка імені або категорії, INSERT, NOTIFY меню, версія ресурсу для ETag
+    ("/categories/", {"name": "Food"}, 4),
+    ("/dishes/", {"name": "Soup", "price": 7, "category_id": 1}, 5),
+    ("/tables/", {"number": 100}, 3),
+    ("/promotions/", {"description": "r", "discount_percent": 5, "valid_from": "2020-01-01", "valid_to": "2099-01-01", "dish_ids": [1, 2]}, 5),
+])
+def test_create_menu_entities(client, seeded, path, body, expected):
+    with assert_statements(expected):
+        request(client, "POST", path, body)